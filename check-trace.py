@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+import sys
+import argparse
+
+from elevator.checker import Checker, readJSONLines, readTrace
+
+
+def main(args):
+    failed = False
+    for filename in args.trace:
+        checker = Checker(args.floors, maxViolations=args.maxViolations)
+        events = readJSONLines(sys.stdin) if filename == "-" else readTrace(filename)
+        for event in events:
+            checker.check(event)
+        checker.finish()
+
+        for violation in checker.violations:
+            print(f"{filename}: {violation}")
+        counts = ", ".join(
+            f"{name} {count}" for name, count in checker.counts().items() if count
+        )
+        print(
+            f"{filename}: checked {checker.checked} events, "
+            + (f"violations: {counts}." if counts else "no violations.")
+        )
+        failed = failed or checker.violationCount > 0
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Check the events in elevator trace files for violations of safety "
+            "properties (e.g., moving with the doors open or never clearing "
+            "a pressed button). Exit with status 1 if any are found."
+        )
+    )
+
+    parser.add_argument(
+        "trace",
+        nargs="+",
+        help=(
+            "Trace files (binary if their names end with .etrace, else lines of "
+            "JSON). Use - to read lines of JSON from standard input."
+        ),
+    )
+
+    parser.add_argument(
+        "--floors",
+        type=int,
+        help="The number of floors in the building (if given, floors are checked).",
+    )
+
+    parser.add_argument(
+        "--maxViolations",
+        type=int,
+        default=1000,
+        help="The maximum number of violations to keep for each trace.",
+    )
+
+    main(parser.parse_args())
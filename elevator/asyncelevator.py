@@ -0,0 +1,122 @@
+import asyncio
+
+from elevator.constants import (
+    DEFAULT_FLOORS,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+    END,
+)
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import Elevator
+
+
+class AsyncElevator:
+    """
+    Run an Elevator in an asyncio event loop.
+
+    The run coroutine sleeps until the next queued event is due or until a
+    new event is put, so many elevators can share one event loop without
+    polling. Response events (those caused by other events) are passed to
+    every iterator obtained from events.
+    """
+
+    def __init__(self, elevator):
+        self.elevator = elevator
+        self.queue = elevator.queue
+        self.clock = elevator.clock
+        self._wakeup = asyncio.Event()
+        self._subscribers = []
+        self._stopped = False
+        self._finished = False
+
+    @classmethod
+    def create(
+        klass,
+        floors=DEFAULT_FLOORS,
+        openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+        interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+        clock=None,
+        **kwargs,
+    ):
+        """
+        Make an AsyncElevator with a new queue and Elevator. Other keyword
+        arguments are passed to Elevator.
+        """
+        elevator = Elevator(
+            DelayPriorityQueue(clock),
+            floors=floors,
+            openDoorDelay=openDoorDelay,
+            interFloorDelay=interFloorDelay,
+            **kwargs,
+        )
+        return klass(elevator)
+
+    def put(self, event):
+        """
+        Queue an event for the elevator. This may be called from any
+        coroutine or callback running in the elevator's event loop. Putting
+        an END event stops the elevator once all other queued events have
+        been handled.
+        """
+        self.queue.put(event)
+        self._wakeup.set()
+
+    def stop(self):
+        """
+        Stop the elevator immediately, leaving any queued events unhandled.
+        """
+        self._stopped = True
+        self._wakeup.set()
+
+    def _publish(self, event):
+        for subscriber in self._subscribers:
+            subscriber.put_nowait(event)
+
+    async def run(self):
+        """
+        Handle events as they fall due, until stopped or an END event is
+        handled (or the elevator raises an exception).
+        """
+        elevator = self.elevator
+        queue = self.queue
+
+        try:
+            while not self._stopped:
+                while event := elevator.handleEvent():
+                    if event.what == END:
+                        self._stopped = True
+                        break
+                    if event.causedBy is not None:
+                        self._publish(event)
+
+                if self._stopped:
+                    break
+
+                due = queue.nextTime()
+                timeout = None if due is None else max(0.0, due - self.clock.now())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Tell all iterators there will be no more events, however the
+            # elevator stopped.
+            self._finished = True
+            self._publish(None)
+
+    async def events(self):
+        """
+        Iterate (asynchronously) over the response events the elevator
+        produces from now on, until it stops. If it has already stopped,
+        there are none.
+        """
+        if self._finished:
+            return
+        subscriber = asyncio.Queue()
+        self._subscribers.append(subscriber)
+        try:
+            while (event := await subscriber.get()) is not None:
+                yield event
+        finally:
+            self._subscribers.remove(subscriber)
@@ -0,0 +1,213 @@
+import os
+import random
+from traceback import extract_tb
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+
+from elevator.constants import (
+    CALL_PRESSED,
+    DEFAULT_FLOORS,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+    DOWN,
+    STOP_PRESSED,
+    UP,
+)
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.stats import Stats
+
+
+class Job:
+    """
+    The description of one simulation run.
+
+    Either give a list of events or a random seed (in which case a random
+    trace of count button presses is made in the worker process, so it
+    never needs to be sent to the worker).
+    """
+
+    def __init__(
+        self,
+        events=None,
+        seed=None,
+        count=100,
+        floors=DEFAULT_FLOORS,
+        openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+        interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+        label=None,
+    ):
+        assert (events is None) != (seed is None), "Give exactly one of events/seed."
+        self.events = events
+        self.seed = seed
+        self.count = count
+        self.floors = floors
+        self.openDoorDelay = openDoorDelay
+        self.interFloorDelay = interFloorDelay
+        self.label = label
+
+    def params(self):
+        """
+        Get a dictionary describing the job (e.g., for reporting results).
+        """
+        result = {
+            "floors": self.floors,
+            "openDoorDelay": self.openDoorDelay,
+            "interFloorDelay": self.interFloorDelay,
+        }
+        if self.seed is not None:
+            result["seed"] = self.seed
+            result["count"] = self.count
+        if self.label is not None:
+            result["label"] = self.label
+        return result
+
+    def getEvents(self):
+        if self.events is None:
+            return randomTrace(self.floors, self.count, self.seed)
+        else:
+            return self.events
+
+
+def randomTrace(floors, count, seed, meanGap=5.0):
+    """
+    Make a reproducible random list of call and stop button presses, with
+    exponentially distributed gaps between them.
+
+    The presses take no account of where the elevator is, and most random
+    traces of more than a few presses make the handlers fail an assertion
+    (e.g., with 5 floors and 40 presses, only seeds 34 and 176 of the
+    first 200 run to the end), so check the error of each batch result.
+    """
+    rng = random.Random(seed)
+    events = []
+    when = 0.0
+    for _ in range(count):
+        when += rng.expovariate(1.0 / meanGap)
+        floor = rng.randrange(floors)
+        if floors > 1 and rng.random() < 0.5:
+            if floor == 0:
+                direction = UP
+            elif floor == floors - 1:
+                direction = DOWN
+            else:
+                direction = rng.choice((UP, DOWN))
+            events.append(
+                Event(CALL_PRESSED, floor, direction=direction, queuedAt=when)
+            )
+        else:
+            events.append(Event(STOP_PRESSED, floor, queuedAt=when))
+    return events
+
+
+def sweep(
+    seeds,
+    floors=(DEFAULT_FLOORS,),
+    openDoorDelays=(DEFAULT_OPEN_DOOR_DELAY,),
+    interFloorDelays=(DEFAULT_INTER_FLOOR_DELAY,),
+    count=100,
+):
+    """
+    Make jobs for all combinations of the given seeds and parameters.
+    """
+    return [
+        Job(
+            seed=seed,
+            count=count,
+            floors=floorCount,
+            openDoorDelay=openDoorDelay,
+            interFloorDelay=interFloorDelay,
+        )
+        for floorCount, openDoorDelay, interFloorDelay, seed in product(
+            floors, openDoorDelays, interFloorDelays, seeds
+        )
+    ]
+
+
+class Result:
+    """
+    The outcome of running a job. If the run raised an exception, stats and
+    state are None and error describes the exception.
+    """
+
+    def __init__(self, job, stats=None, state=None, error=None):
+        self.job = job
+        self.stats = stats
+        self.state = state
+        self.error = error
+
+
+def runJob(job):
+    """
+    Run one job and return its result. The (possibly large) history is not
+    returned, to keep results cheap to send back from worker processes.
+
+    An exception in one run must not bring down a whole batch, so it is
+    caught and reported in the result.
+    """
+    try:
+        elevator = runElevator(
+            job.getEvents(),
+            floors=job.floors,
+            openDoorDelay=job.openDoorDelay,
+            interFloorDelay=job.interFloorDelay,
+            # Errors are reported in the result, so no test is written.
+            writeTestOnError=False,
+        )
+    except Exception as e:
+        return Result(job, error=describeError(e))
+    else:
+        return Result(job, elevator.stats, elevator.state)
+
+
+def describeError(e):
+    """
+    Describe an exception (its type, where it was raised and its message)
+    in a line of text.
+    """
+    frame = extract_tb(e.__traceback__)[-1]
+    where = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    return f"{e.__class__.__name__} at {where}: {e}"
+
+
+def runBatch(jobs, workers=None, chunksize=None):
+    """
+    Run jobs, sharding them across a pool of worker processes. Yield a
+    Result for each job as results arrive, in the order of the jobs.
+
+    If workers is 1, the jobs are run one after the other in this process.
+    """
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for job in jobs:
+            yield runJob(job)
+        return
+
+    if chunksize is None:
+        # A few chunks per worker amortizes the inter-process overhead while
+        # still balancing the load when some jobs run longer than others.
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(runJob, jobs, chunksize=chunksize)
+
+
+def combineStats(results):
+    """
+    Merge the stats of successful results, separately for each building
+    (number of floors, door open delay and inter-floor delay), so runs of
+    different buildings are not mixed into one distribution. Return a dict
+    of merged Stats, keyed by (floors, openDoorDelay, interFloorDelay).
+    """
+    combined = {}
+    for result in results:
+        if result.error is None:
+            job = result.job
+            key = job.floors, job.openDoorDelay, job.interFloorDelay
+            stats = result.stats
+            if key not in combined:
+                combined[key] = Stats(stats.floors, stats.relativeAccuracy)
+            combined[key].merge(stats)
+    return combined
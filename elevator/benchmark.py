@@ -0,0 +1,242 @@
+import json
+import random
+from copy import copy
+from functools import lru_cache
+from time import perf_counter
+
+from elevator.batch import randomTrace
+from elevator.clock import SimulatedClock
+from elevator.codec import decodeMany, encodeMany
+from elevator.constants import ARRIVE, CALL_PRESSED, DEFAULT_INTER_FLOOR_DELAY
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.handle.utils import pickDirectionBasedOnCallButtons
+from elevator.state import State
+from elevator.stats import Stats
+
+# Speed measurements of the parts of a simulation that are run most. Each
+# benchmark is a function taking a number of floors and a traffic density
+# and returning a function that does some operations (e.g., handles
+# events) and returns how many it did.
+
+# Building sizes, and traffic densities (the mean number of seconds
+# between button presses).
+SIZES = (5, 50, 500)
+DENSITIES = {"light": 30.0, "moderate": 5.0, "heavy": 1.0}
+
+# The number of button presses in the traces benchmarks are run on, and
+# the random seeds they may be made from. The elevator logic does not yet
+# handle every trace (see elevator.batch.randomTrace), so the first trace
+# that runs to the end is used. Timing runs that stop part way through
+# would measure where they stop, not how fast the elevator is.
+PRESSES = 100
+SEEDS = range(1000)
+
+
+def _makeTrace(floors, density, seed):
+    return randomTrace(floors, PRESSES, seed, meanGap=DENSITIES[density])
+
+
+def _run(events, floors):
+    return runElevator(
+        # The events are changed when they are queued, so use copies.
+        [copy(event) for event in events],
+        floors=floors,
+        writeTestOnError=False,
+    )
+
+
+@lru_cache
+def _seed(floors, density):
+    # Find the first seed whose trace runs to the end.
+    for seed in SEEDS:
+        try:
+            _run(_makeTrace(floors, density, seed), floors)
+        except Exception:
+            continue
+        return seed
+    raise RuntimeError(
+        f"No random trace (of seeds {SEEDS.start} to {SEEDS.stop - 1}) runs to "
+        f"the end with {floors} floors and {density} traffic."
+    )
+
+
+def _trace(floors, density):
+    return _makeTrace(floors, density, _seed(floors, density))
+
+
+def _history(floors, density):
+    return list(_run(_trace(floors, density), floors).history)
+
+
+def benchRunElevator(floors, density):
+    """
+    Run an elevator on a trace (with runElevator).
+    """
+    trace = _trace(floors, density)
+
+    def run():
+        return len(_run(trace, floors).history)
+
+    return run
+
+
+def benchQueue(floors, density):
+    """
+    Put events (due at the times of the presses in a trace, and with the
+    delays of arrivals) into a queue and then get them all.
+    """
+    times = [event.queuedAt for event in _trace(floors, density)]
+    rng = random.Random(_seed(floors, density))
+    delays = [rng.choice((0, DEFAULT_INTER_FLOOR_DELAY)) for _ in times]
+
+    def run():
+        queue = DelayPriorityQueue(SimulatedClock())
+        for when, delay in zip(times, delays):
+            queue.put(Event(ARRIVE, 0, delay=delay, queuedAt=when))
+        while queue.get(respectTime=False):
+            pass
+        return len(times)
+
+    return run
+
+
+def benchPickDirection(floors, density):
+    """
+    Pick a direction from the call buttons, on every floor, with the
+    buttons pressed (in a trace) during the time it takes to go from the
+    bottom of the building to the top.
+    """
+    state = State(floors)
+    window = floors * DEFAULT_INTER_FLOOR_DELAY
+    for event in _trace(floors, density):
+        if event.what == CALL_PRESSED and event.queuedAt <= window:
+            state.pressCall(event.floor, event.direction, event.queuedAt)
+    arrivals = [Event(ARRIVE, floor) for floor in range(floors)]
+
+    def run():
+        for event in arrivals:
+            state.floor = event.floor
+            pickDirectionBasedOnCallButtons(event, state)
+        return floors
+
+    return run
+
+
+def benchStats(floors, density):
+    """
+    Count the events of an elevator's history.
+    """
+    events = _history(floors, density)
+
+    def run():
+        stats = Stats(floors)
+        for event in events:
+            stats.handleEvent(event)
+        return len(events)
+
+    return run
+
+
+def benchEventJSON(floors, density):
+    """
+    Convert the events of an elevator's history to JSON and back, one by
+    one.
+    """
+    events = _history(floors, density)
+
+    def run():
+        for event in events:
+            Event.fromJSONString(event.toJSON())
+        return len(events)
+
+    return run
+
+
+def benchCodec(floors, density):
+    """
+    Convert the events of an elevator's history to JSON and back, all at
+    once (see elevator/codec.py).
+    """
+    events = _history(floors, density)
+
+    def run():
+        decodeMany(encodeMany(events).splitlines())
+        return len(events)
+
+    return run
+
+
+BENCHMARKS = {
+    "runElevator": benchRunElevator,
+    "queue": benchQueue,
+    "pickDirection": benchPickDirection,
+    "stats": benchStats,
+    "eventJSON": benchEventJSON,
+    "codec": benchCodec,
+}
+
+
+def measure(run, repeat=5, minTime=0.1):
+    """
+    Time a benchmark function, calling it as often as needed to take at
+    least minTime seconds, repeat times. Return the number of operations
+    per second and microseconds per operation, from the fastest repeat
+    (the others were slowed by something else).
+    """
+    best = None
+    for _ in range(repeat):
+        operations = 0
+        start = perf_counter()
+        while True:
+            operations += run()
+            elapsed = perf_counter() - start
+            if elapsed >= minTime:
+                break
+        if operations and (best is None or elapsed / operations < best):
+            best = elapsed / operations
+    if best is None:
+        return {"perSecond": 0.0, "microseconds": None}
+    return {"perSecond": 1.0 / best, "microseconds": best * 1e6}
+
+
+def runBenchmarks(names=None, sizes=SIZES, densities=None, repeat=5, minTime=0.1):
+    """
+    Run benchmarks for all combinations of building size and traffic
+    density. Yield (key, result) pairs, where key names the benchmark,
+    size and density (e.g., "queue/50/heavy") and result is as returned by
+    measure.
+    """
+    for name in names or BENCHMARKS:
+        for floors in sizes:
+            for density in densities or DENSITIES:
+                run = BENCHMARKS[name](floors, density)
+                yield f"{name}/{floors}/{density}", measure(run, repeat, minTime)
+
+
+def regressions(results, baseline, tolerance=0.2):
+    """
+    Compare results with a baseline (both dicts of results, keyed as by
+    runBenchmarks). Return a dict, with the same keys, giving how many
+    times slower than the baseline each result is that is more than
+    tolerance (as a fraction) slower.
+    """
+    slower = {}
+    for key, result in results.items():
+        old = baseline.get(key, {}).get("microseconds")
+        new = result["microseconds"]
+        if old and new and new > old * (1 + tolerance):
+            slower[key] = new / old
+    return slower
+
+
+def loadBaseline(filename):
+    with open(filename) as fp:
+        return json.load(fp)
+
+
+def saveBaseline(results, filename):
+    with open(filename, "w") as fp:
+        json.dump(results, fp, indent=2, sort_keys=True)
+        fp.write("\n")
@@ -0,0 +1,247 @@
+import mmap
+import struct
+import sys
+from array import array
+from math import isnan
+
+from elevator.constants import END
+from elevator.event import Event
+from elevator.log import JSONLinesTrace
+
+# A binary trace file is a header followed by blocks of events. Each block
+# holds up to blockSize events, stored column by column (all the event
+# types, then all the floors, etc). Every block has the same size (the
+# last one is padded), so any event can be found without reading what
+# comes before it.
+#
+# The header is MAGIC and then the block size (as an unsigned 32-bit int,
+# padded to 8 bytes). Each block starts with the number of events in it
+# (likewise) and is padded to a multiple of 8 bytes. All numbers are
+# little-endian. Missing values are stored as -1 (for integers) or NaN
+# (for floats).
+
+MAGIC = b"ELEVTRC1"
+SUFFIX = ".etrace"
+DEFAULT_BLOCK_SIZE = 4096
+
+# The columns of a block: event attribute names and array type codes.
+COLUMNS = (
+    ("what", "h"),
+    ("floor", "i"),
+    ("direction", "b"),
+    ("delay", "d"),
+    ("queuedAt", "d"),
+    ("handledAt", "d"),
+    ("serial", "q"),
+    ("causedBy", "q"),
+    ("car", "i"),
+)
+
+_COUNT = struct.Struct("<I4x")
+_FLOATS = {"delay", "queuedAt", "handledAt"}
+_SWAP = sys.byteorder == "big"
+
+
+def _layout(blockSize):
+    # Get the byte offset of each column in a block, and the block size in
+    # bytes.
+    offsets = {}
+    offset = _COUNT.size
+    for name, code in COLUMNS:
+        offsets[name] = offset
+        offset += array(code).itemsize * blockSize
+    return offsets, -(-offset // 8) * 8
+
+
+class BinaryTraceWriter:
+    """
+    A trace sink that appends each handled event to a binary trace file.
+    Events are buffered and written a block at a time, so the file must be
+    closed (or the writer used as a context manager), or flushed, to write
+    the last block.
+    """
+
+    def __init__(self, filename, blockSize=DEFAULT_BLOCK_SIZE):
+        assert blockSize > 0
+        self.blockSize = blockSize
+        self.fp = open(filename, "wb")
+        self.fp.write(MAGIC)
+        self.fp.write(_COUNT.pack(blockSize))
+        self._columns = {name: array(code) for name, code in COLUMNS}
+        self._count = 0
+        # Where the block being filled starts in the file.
+        self._blockAt = self.fp.tell()
+        _, blockBytes = _layout(blockSize)
+        eventBytes = sum(array(code).itemsize for _, code in COLUMNS)
+        self._padding = bytes(blockBytes - _COUNT.size - blockSize * eventBytes)
+
+    def write(self, event):
+        columns = self._columns
+        for name, _ in COLUMNS:
+            value = getattr(event, name)
+            if value is None:
+                value = float("nan") if name in _FLOATS else -1
+            columns[name].append(value)
+        self._count += 1
+        if self._count == self.blockSize:
+            self._writeBlock()
+            for column in self._columns.values():
+                del column[:]
+            self._count = 0
+            self._blockAt = self.fp.tell()
+
+    def _writeBlock(self):
+        # Write the block being filled (padded, if it is not full) at its
+        # place in the file.
+        fp = self.fp
+        fp.seek(self._blockAt)
+        fp.write(_COUNT.pack(self._count))
+        padding = self.blockSize - self._count
+        for name, code in COLUMNS:
+            column = array(code, self._columns[name])
+            if padding:
+                column.extend([0] * padding)
+            if _SWAP:
+                column.byteswap()
+            column.tofile(fp)
+        fp.write(self._padding)
+
+    def flush(self):
+        """
+        Write the events not yet written, as a partial last block (which is
+        written again as more events are added), so the file holds all the
+        events written so far (e.g., if the elevator raises an exception).
+        """
+        if self._count:
+            self._writeBlock()
+        self.fp.flush()
+
+    def close(self):
+        self.flush()
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+class BinaryTraceReader:
+    """
+    Read the events of a binary trace file. The file is memory-mapped and
+    events are made only as they are asked for, so a trace can be much
+    larger than memory.
+    """
+
+    def __init__(self, filename):
+        self.fp = open(filename, "rb")
+        try:
+            self.map = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            self.fp.close()
+            raise ValueError(f"{filename!r} is not an elevator binary trace.")
+        header = len(MAGIC) + _COUNT.size
+        if self.map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{filename!r} is not an elevator binary trace.")
+        (self.blockSize,) = _COUNT.unpack_from(self.map, len(MAGIC))
+        self._offsets, self._blockBytes = _layout(self.blockSize)
+        self._header = header
+        self.blocks = (len(self.map) - header) // self._blockBytes
+        if self.blocks:
+            (last,) = _COUNT.unpack_from(self.map, self._blockStart(self.blocks - 1))
+            self._length = (self.blocks - 1) * self.blockSize + last
+        else:
+            self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def _blockStart(self, block):
+        return self._header + block * self._blockBytes
+
+    def _column(self, start, name, code, count):
+        column = array(code)
+        offset = start + self._offsets[name]
+        column.frombytes(self.map[offset : offset + column.itemsize * count])
+        if _SWAP:
+            column.byteswap()
+        return column
+
+    def block(self, block):
+        """
+        Get the events in one block.
+        """
+        start = self._blockStart(block)
+        (count,) = _COUNT.unpack_from(self.map, start)
+        columns = [self._column(start, name, code, count) for name, code in COLUMNS]
+        return [_event(values) for values in zip(*columns)]
+
+    def __iter__(self):
+        for block in range(self.blocks):
+            yield from self.block(block)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        block, offset = divmod(index, self.blockSize)
+        start = self._blockStart(block)
+        values = []
+        for name, code in COLUMNS:
+            size = array(code).itemsize
+            position = start + self._offsets[name] + offset * size
+            column = array(code, self.map[position : position + size])
+            if _SWAP:
+                column.byteswap()
+            values.append(column[0])
+        return _event(values)
+
+    def inputs(self):
+        """
+        Iterate over the events that were not caused by other events (i.e.,
+        the button presses and other events given to the elevator), except
+        END. These are what is needed to replay the trace.
+        """
+        for event in self:
+            if event.causedBy is None and event.what != END:
+                yield event
+
+    def close(self):
+        self.map.close()
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+def _event(values):
+    what, floor, direction, delay, queuedAt, handledAt, serial, causedBy, car = values
+    return Event(
+        what,
+        None if floor == -1 else floor,
+        direction=None if direction == -1 else direction,
+        delay=None if isnan(delay) else delay,
+        queuedAt=None if isnan(queuedAt) else queuedAt,
+        handledAt=None if isnan(handledAt) else handledAt,
+        serial=None if serial == -1 else serial,
+        causedBy=None if causedBy == -1 else causedBy,
+        car=None if car == -1 else car,
+    )
+
+
+def openTrace(filename):
+    """
+    Make a trace sink for a file: binary if its name ends with SUFFIX,
+    else lines of JSON.
+    """
+    if str(filename).endswith(SUFFIX):
+        return BinaryTraceWriter(filename)
+    else:
+        return JSONLinesTrace(filename)
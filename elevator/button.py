@@ -26,3 +26,31 @@ class Button:
     def clear(self):
         self.state = False
         self.pressedAt = None
+
+
+class ButtonView(Button):
+    """
+    A Button whose state is kept in a State (see elevator/state.py), as a
+    bit in a mask of pressed buttons and an entry in a list of press times.
+
+    index is UP or DOWN for a call button, or STOPS for a stop button.
+    """
+
+    def __init__(self, owner, index, floor):
+        self._owner = owner
+        self._index = index
+        self._floor = floor
+
+    @property
+    def state(self):
+        return bool(self._owner.masks[self._index] >> self._floor & 1)
+
+    @property
+    def pressedAt(self):
+        return self._owner.pressedAts[self._index][self._floor]
+
+    def press(self, when):
+        self._owner.press(self._index, self._floor, when)
+
+    def clear(self):
+        self._owner.clear(self._index, self._floor)
@@ -0,0 +1,250 @@
+from elevator.bintrace import SUFFIX, BinaryTraceReader
+from elevator.codec import decodeMany
+from elevator.constants import (
+    ARRIVE,
+    CALL_PRESSED,
+    CLEAR_CALL,
+    CLEAR_STOP,
+    CLOSE,
+    END,
+    OPEN,
+    RESET,
+    STOP_PRESSED,
+    UP,
+)
+
+# Safety properties of the events an elevator handles. A Checker checks
+# them as the events go by, independently of the (assert-based) checks in
+# the handlers, so a run made with python -O can still be checked, either
+# as it runs (a Checker is a trace sink) or later from a trace file.
+#
+# The state kept is the same size however long the run: the floor, whether
+# the doors are open, and bitmasks (one bit per floor) of pressed buttons.
+
+# The doors must be closed when the elevator moves (arrives at a floor).
+DOORS_OPEN_WHILE_MOVING = "doorsOpenWhileMoving"
+# The elevator must arrive only at a floor next to the one it was on.
+SKIPPED_FLOOR = "skippedFloor"
+# The doors must open only at the floor the elevator is on, and only when
+# they are closed.
+OPEN_AWAY_FROM_FLOOR = "openAwayFromFloor"
+DOORS_ALREADY_OPEN = "doorsAlreadyOpen"
+# Floors must be in the building.
+FLOOR_OUT_OF_RANGE = "floorOutOfRange"
+# Every pressed call or stop button must eventually be cleared.
+UNCLEARED_CALL = "unclearedCall"
+UNCLEARED_STOP = "unclearedStop"
+
+PROPERTIES = (
+    DOORS_OPEN_WHILE_MOVING,
+    SKIPPED_FLOOR,
+    OPEN_AWAY_FROM_FLOOR,
+    DOORS_ALREADY_OPEN,
+    FLOOR_OUT_OF_RANGE,
+    UNCLEARED_CALL,
+    UNCLEARED_STOP,
+)
+
+
+class Violation:
+    """
+    A property that did not hold, the event at which that was found (None
+    if it was found at the end of the run) and a description.
+    """
+
+    def __init__(self, property, event, message):
+        self.property = property
+        self.event = event
+        self.message = message
+
+    def __str__(self):
+        where = "" if self.event is None else f" at {self.event}"
+        return f"{self.property}: {self.message}{where}"
+
+
+def _floors(mask):
+    # The floors whose bits are set in a mask.
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+    return result
+
+
+class Checker:
+    """
+    Check the events an elevator handles, in the order it handles them,
+    collecting Violations (only the first maxViolations are kept, but all
+    are counted). If floors is None, floor numbers are not checked. Call
+    finish at the end of the run (this is done on END, and
+    by close) to check that all buttons were cleared.
+    """
+
+    def __init__(self, floors=None, maxViolations=1000):
+        self.floors = floors
+        self.maxViolations = maxViolations
+        self.violations = []
+        # The number of violations of each property (including those not
+        # kept in self.violations).
+        self._counts = dict.fromkeys(PROPERTIES, 0)
+        self.violationCount = 0
+        self.checked = 0
+        self.reset()
+
+    def reset(self):
+        self.floor = 0
+        self.open = False
+        # Pressed buttons, as in State.masks: up calls, down calls, stops.
+        self.calls = [0, 0]
+        self.stops = 0
+        self.finished = False
+
+    def _violation(self, property, event, message):
+        self._counts[property] += 1
+        self.violationCount += 1
+        if len(self.violations) < self.maxViolations:
+            self.violations.append(Violation(property, event, message))
+
+    def check(self, event):
+        """
+        Check the next event. Return True if no violations were found.
+        """
+        before = self.violationCount
+        self.checked += 1
+        what = event.what
+        floor = event.floor
+
+        if (
+            floor is not None
+            and self.floors is not None
+            and not 0 <= floor < self.floors
+        ):
+            self._violation(
+                FLOOR_OUT_OF_RANGE, event, f"Floor {floor} is not in the building."
+            )
+
+        if what == ARRIVE:
+            if self.open:
+                self._violation(
+                    DOORS_OPEN_WHILE_MOVING,
+                    event,
+                    f"Moved from floor {self.floor} with the doors open.",
+                )
+            if abs(floor - self.floor) != 1:
+                self._violation(
+                    SKIPPED_FLOOR,
+                    event,
+                    f"Arrived at floor {floor} from floor {self.floor}.",
+                )
+            self.floor = floor
+        elif what == OPEN:
+            if floor != self.floor:
+                self._violation(
+                    OPEN_AWAY_FROM_FLOOR,
+                    event,
+                    f"Opened the doors on floor {floor} while on floor {self.floor}.",
+                )
+            if self.open:
+                self._violation(
+                    DOORS_ALREADY_OPEN, event, "Opened doors that were already open."
+                )
+            self.open = True
+        elif what == CLOSE:
+            self.open = False
+        elif what == CALL_PRESSED:
+            self.calls[event.direction] |= 1 << floor
+        elif what == CLEAR_CALL:
+            self.calls[event.direction] &= ~(1 << floor)
+        elif what == STOP_PRESSED:
+            self.stops |= 1 << floor
+        elif what == CLEAR_STOP:
+            self.stops &= ~(1 << floor)
+        elif what == RESET:
+            self.reset()
+        elif what == END:
+            self.finish()
+
+        return self.violationCount == before
+
+    def finish(self):
+        """
+        Check (once) that no buttons are left pressed.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        for direction, mask in enumerate(self.calls):
+            for floor in _floors(mask):
+                self._violation(
+                    UNCLEARED_CALL,
+                    None,
+                    f"The {'UP' if direction == UP else 'DOWN'} call button on "
+                    f"floor {floor} was never cleared.",
+                )
+        for floor in _floors(self.stops):
+            self._violation(
+                UNCLEARED_STOP,
+                None,
+                f"The stop button for floor {floor} was never cleared.",
+            )
+
+    def counts(self):
+        """
+        Get the number of violations of each property.
+        """
+        return dict(self._counts)
+
+    # A Checker can be given to an Elevator as its trace sink.
+
+    def write(self, event):
+        self.check(event)
+
+    def close(self):
+        self.finish()
+
+
+def checkEvents(events, floors=None):
+    """
+    Check some events (in the order they were handled). Return the Checker.
+    """
+    checker = Checker(floors)
+    for event in events:
+        checker.check(event)
+    checker.finish()
+    return checker
+
+
+def readJSONLines(fp, linesPerBatch=10000):
+    """
+    Iterate over the events in a file of lines of JSON, decoding them a
+    batch at a time.
+    """
+    lines = []
+    for line in fp:
+        lines.append(line)
+        if len(lines) == linesPerBatch:
+            yield from decodeMany(lines)
+            lines = []
+    yield from decodeMany(lines)
+
+
+def readTrace(filename):
+    """
+    Iterate over the events in a trace file (binary if its name ends with
+    the binary trace suffix, else lines of JSON), without reading it all
+    into memory.
+    """
+    if str(filename).endswith(SUFFIX):
+        with BinaryTraceReader(filename) as reader:
+            yield from reader
+    else:
+        with open(filename) as fp:
+            yield from readJSONLines(fp)
+
+
+def checkTrace(filename, floors=None):
+    """
+    Check the events in a trace file. Return the Checker.
+    """
+    return checkEvents(readTrace(filename), floors)
@@ -0,0 +1,44 @@
+from time import time
+
+
+class WallClock:
+    """
+    A clock that reads the real (wall clock) time. Events become due only
+    when the real time reaches their due time.
+    """
+
+    def now(self):
+        return time()
+
+    def reached(self, when):
+        return time() >= when
+
+    def advanceTo(self, when):
+        # Real time moves on by itself.
+        pass
+
+
+class SimulatedClock:
+    """
+    A virtual clock for discrete-event simulation. Time only moves when the
+    queue hands out an event, at which point the clock jumps straight to
+    that event's due time. Runs therefore do not depend on the speed of the
+    host and give identical results on every run.
+    """
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def reached(self, when):
+        # There is never anything to wait for: the next event is always due
+        # because we can jump to it.
+        return True
+
+    def advanceTo(self, when):
+        # Never go backwards (e.g., an END event is handed out last, no
+        # matter what its due time is).
+        if when > self.time:
+            self.time = when
@@ -0,0 +1,140 @@
+import json
+import struct
+
+from elevator.bintrace import COLUMNS
+from elevator.event import Event
+
+# Fast conversion of many events to and from lines of JSON (as made by
+# Event.toJSON and read by Event.fromJSONString) and to and from a compact
+# binary form.
+#
+# Decoded events are made without calling the Event constructor, so they
+# are not checked as it checks them. Float attributes must be finite.
+
+
+def _json(value):
+    return "null" if value is None else value
+
+
+def encode(event):
+    """
+    Get an event as a line of JSON (without a newline), exactly as
+    Event.toJSON makes it.
+    """
+    return (
+        f'{{"what": {event.what}, "floor": {_json(event.floor)}, '
+        f'"direction": {_json(event.direction)}, '
+        f'"delay": {_json(event.delay)}, '
+        f'"queuedAt": {_json(event.queuedAt)}, '
+        f'"handledAt": {_json(event.handledAt)}, '
+        f'"serial": {_json(event.serial)}, '
+        f'"causedBy": {_json(event.causedBy)}, '
+        f'"car": {_json(event.car)}}}'
+    )
+
+
+def encodeMany(events):
+    """
+    Get events as lines of JSON (each ending with a newline) in one string.
+    """
+    return "".join([encode(event) + "\n" for event in events])
+
+
+def _event(what, floor, direction, delay, queuedAt, handledAt, serial, causedBy, car):
+    event = Event.__new__(Event)
+    event.what = what
+    event.floor = floor
+    event.direction = direction
+    event.delay = delay
+    event.queuedAt = queuedAt
+    event.handledAt = handledAt
+    event.serial = serial
+    event.causedBy = causedBy
+    event.car = car
+    return event
+
+
+def decodeMany(lines):
+    """
+    Make events from lines of JSON (blank lines are skipped), parsing them
+    all in one go. Raise ValueError (giving the first line that cannot be
+    parsed) if the JSON is invalid.
+    """
+    lines = [line for line in lines if line.strip()]
+    try:
+        objects = json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        # Find the bad line, to say which it is.
+        for count, line in enumerate(lines, start=1):
+            try:
+                json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Could not parse line {count} {line!r}: {e}")
+        raise
+
+    return [
+        _event(
+            j["what"],
+            j["floor"],
+            j.get("direction"),
+            j.get("delay", 0),
+            j.get("queuedAt"),
+            j.get("handledAt"),
+            j.get("serial"),
+            j.get("causedBy"),
+            j.get("car"),
+        )
+        for j in objects
+    ]
+
+
+# The binary form is a frame: the number of events (as an unsigned 32-bit
+# int) followed by a record per event. A record holds a bitmask of the
+# attributes that are None and then the attributes, packed with the types
+# used by binary trace files (see elevator/bintrace.py). All numbers are
+# little-endian.
+_FRAME = struct.Struct("<I")
+_RECORD = struct.Struct("<H" + "".join(code for _, code in COLUMNS))
+_NAMES = tuple(name for name, _ in COLUMNS)
+_NONES = tuple(1 << i for i in range(len(_NAMES)))
+
+
+def packMany(events):
+    """
+    Pack events into a binary frame.
+    """
+    pack = _RECORD.pack
+    records = []
+    for event in events:
+        values = [getattr(event, name) for name in _NAMES]
+        nones = 0
+        for i, value in enumerate(values):
+            if value is None:
+                nones |= _NONES[i]
+                values[i] = 0
+        records.append(pack(nones, *values))
+    return _FRAME.pack(len(records)) + b"".join(records)
+
+
+def unpackMany(data, offset=0):
+    """
+    Unpack the events in the binary frame starting at an offset in some
+    data. Return the events and the offset of the end of the frame, or
+    (None, offset) if the data does not (yet) hold all the frame.
+    """
+    if len(data) - offset < _FRAME.size:
+        return None, offset
+    (count,) = _FRAME.unpack_from(data, offset)
+    start = offset + _FRAME.size
+    end = start + count * _RECORD.size
+    if len(data) < end:
+        return None, offset
+
+    events = []
+    for nones, *values in _RECORD.iter_unpack(memoryview(data)[start:end]):
+        if nones:
+            for i, none in enumerate(_NONES):
+                if nones & none:
+                    values[i] = None
+        events.append(_event(*values))
+    return events, end
@@ -42,6 +42,45 @@ _names = {
     None: "None",
 }
 
+# The event types added with addEventType.
+_added = set()
+
 
 def describe(what):
     return _names[what]
+
+
+def eventTypes():
+    """
+    Get (value, name) pairs for all event types, including any added with
+    addEventType.
+    """
+    return [
+        (what, name) for what, name in _names.items() if what not in {UP, DOWN, None}
+    ]
+
+
+def addEventType(name):
+    """
+    Add a new event type, returning its (integer) value. Handlers for the new
+    type can be added with elevator.logic.registerHandler (and, if the type
+    should be counted, Stats.registerHandler).
+    """
+    if name in _names.values():
+        raise ValueError(f"Event type {name!r} already exists.")
+    what = max(what for what in _names if what is not None) + 1
+    _names[what] = name
+    _added.add(what)
+    return what
+
+
+def removeEventType(what):
+    """
+    Remove an event type added with addEventType (e.g., at the end of a
+    test). Any handlers registered for it should be removed first (by
+    registering None).
+    """
+    if what not in _added:
+        raise ValueError(f"Event type {what!r} was not added with addEventType.")
+    _added.remove(what)
+    del _names[what]
@@ -0,0 +1,100 @@
+from elevator.constants import DOWN, UP
+from elevator.state import STOPS
+
+# Dispatch policies decide which car of a group should answer a hall call.
+# A policy has a choose method that is passed the Group and the
+# CALL_PRESSED event and returns the index of a car. The policies here
+# look at each car once, in constant time (using the pressed-button masks
+# of the car's state), so dispatching costs time linear in the number of
+# cars and independent of the number of floors.
+
+
+def _between(mask, low, high):
+    # Count the bits set in mask strictly between floors low and high.
+    if high - low < 2:
+        return 0
+    return (mask >> (low + 1) & ((1 << (high - low - 1)) - 1)).bit_count()
+
+
+def estimateArrival(car, floor):
+    """
+    Estimate the time a car will take to get to a floor, given the buttons
+    already pressed in the car and the calls it has been assigned.
+    """
+    state = car.state
+    current = state.floor
+    direction = state.direction
+    requests = state.masks[STOPS] | state.masks[UP] | state.masks[DOWN]
+    doorTime = 0 if state.closed else car.openDoorDelay
+
+    if direction is None:
+        return abs(floor - current) * car.interFloorDelay + doorTime
+
+    if (direction == UP and floor >= current) or (
+        direction == DOWN and floor <= current
+    ):
+        # The floor is ahead of us. Count the stops we will make on the way.
+        distance = abs(floor - current)
+        stops = _between(requests, min(current, floor), max(current, floor))
+    else:
+        # The floor is behind us. We must first go to the furthest request
+        # in our current direction, and then come back.
+        if direction == UP:
+            turn = max(current, requests.bit_length() - 1)
+        elif requests:
+            turn = min(current, (requests & -requests).bit_length() - 1)
+        else:
+            turn = current
+        distance = abs(turn - current) + abs(turn - floor)
+        stops = requests.bit_count()
+
+    return distance * car.interFloorDelay + stops * car.openDoorDelay + doorTime
+
+
+class NearestCar:
+    """
+    Send the car that is physically nearest to the calling floor.
+    """
+
+    def choose(self, group, event):
+        return min(
+            range(len(group.cars)),
+            key=lambda index: abs(group.cars[index].state.floor - event.floor),
+        )
+
+
+class EstimatedTimeOfArrival:
+    """
+    Send the car with the shortest estimated time to reach the calling floor.
+    """
+
+    def choose(self, group, event):
+        return min(
+            range(len(group.cars)),
+            key=lambda index: estimateArrival(group.cars[index], event.floor),
+        )
+
+
+class Zoning:
+    """
+    Give each car a zone (a range of floors) and send the car whose zone
+    the calling floor is in. By default the floors are split into equal
+    zones, one per car.
+
+    zones, if given, is a list of (lowest, highest) floor pairs (inclusive),
+    one per car. Floors in no zone are dispatched by fallback (by default,
+    an EstimatedTimeOfArrival policy).
+    """
+
+    def __init__(self, zones=None, fallback=None):
+        self.zones = zones
+        self.fallback = EstimatedTimeOfArrival() if fallback is None else fallback
+
+    def choose(self, group, event):
+        floor = event.floor
+        if self.zones is None:
+            return floor * len(group.cars) // group.floors
+        for index, (lowest, highest) in enumerate(self.zones):
+            if lowest <= floor <= highest:
+                return index
+        return self.fallback.choose(group, event)
@@ -1,15 +1,18 @@
-import sys
 import heapq
-from time import time
 
+from elevator.clock import WallClock
 from elevator.constants import ARRIVE, END
+from elevator.log import DEBUG, logger
 
 
 class Element:
+    __slots__ = ("time", "inc", "event", "cancelled")
+
     def __init__(self, time, inc, event):
         self.time = time
         self.inc = inc
         self.event = event
+        self.cancelled = False
 
     def __lt__(self, other):
         if other.event.what is END:
@@ -21,43 +24,172 @@ class Element:
 
 
 class DelayPriorityQueue:
-    def __init__(self):
+    """
+    A priority queue of events, ordered by the time they are due.
+
+    Putting an event returns its queue element, which can be used as a
+    handle to cancel or reschedule the event. Cancelled elements are left
+    in the heap (and skipped when they reach the top) so cancelling does
+    not need to search the heap. Pending elements are also indexed by
+    event type and floor so they can be found without a scan.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = WallClock() if clock is None else clock
         self.queue = []
         self.inc = 0
+        self.cancelled = 0
+        # Pending elements, indexed by event type and then floor. The
+        # innermost dicts are used as insertion-ordered sets of elements.
+        self.index = {}
 
     def __len__(self):
-        return len(self.queue)
+        return len(self.queue) - self.cancelled
+
+    def _index(self, element):
+        event = element.event
+        self.index.setdefault(event.what, {}).setdefault(event.floor, {})[
+            element
+        ] = None
+
+    def _unindex(self, element):
+        event = element.event
+        floors = self.index[event.what]
+        elements = floors[event.floor]
+        del elements[element]
+        if not elements:
+            del floors[event.floor]
+            if not floors:
+                del self.index[event.what]
+
+    def _prune(self):
+        # Drop cancelled elements from the top of the heap.
+        queue = self.queue
+        while queue and queue[0].cancelled:
+            heapq.heappop(queue)
+            self.cancelled -= 1
+
+    def _push(self, time, event, order=None):
+        element = Element(time, self.inc if order is None else order, event)
+        heapq.heappush(self.queue, element)
+        self._index(element)
+        self.inc += 1
+        return element
 
     def peek(self):
+        self._prune()
         return self.queue[0].event if self.queue else None
 
-    def put(self, event):
+    def nextTime(self):
+        """
+        Get the time the next event is due, or None if the queue is empty.
+        """
+        self._prune()
+        return self.queue[0].time if self.queue else None
+
+    def put(self, event, order=None):
         # The event may already have an queue entry time as a result of
         # being created by a GUI.
+        #
+        # Events due at the same time come out in the order they were put,
+        # unless an order (a number, to be compared with those the queue
+        # gives the other events, which count up from zero) is given.
+        #
+        # The event is always given a new serial number, even if it has one
+        # (e.g., if it is replayed from a trace or scenario), as that may be
+        # the serial number of another event in this queue.
         if event.queuedAt is None:
-            now = time()
+            now = self.clock.now()
             event.enqueued(now, self.inc)
         else:
             now = event.queuedAt
-        heapq.heappush(self.queue, Element(now + event.delay, self.inc, event))
-        # print("---> QUEUE", event, file=sys.stderr)
-        self.inc += 1
+            event.serial = self.inc
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("---> QUEUE %s", event)
+        return self._push(now + event.delay, event, order)
+
+    def requeue(self, event, order):
+        """
+        Put an event taken from another queue (e.g., in a snapshot) back in
+        a queue, keeping its serial number and order. The serial counter
+        (inc) must then be set to that of the other queue.
+        """
+        return self._push(event.queuedAt + event.delay, event, order)
 
     def get(self, respectTime=True):
         # Get the next event. If respectTime is True, get the most-recently
         # passed event, if any. Return None if the queue is empty or if the
-        # next event is still in the future.
+        # next event is still in the future (which never happens with a
+        # simulated clock, since it can jump ahead to the event's time).
+        self._prune()
         if self.queue:
-            now = time()
-            if respectTime and self.queue[0].time > now:
+            due = self.queue[0].time
+            if respectTime and not self.clock.reached(due):
                 return
             element = heapq.heappop(self.queue)
+            self._unindex(element)
+            self.clock.advanceTo(due)
             event = element.event
-            event.handled(now)
-            print("QUEUE --->", event, file=sys.stderr)
+            event.handled(self.clock.now())
+            if logger.isEnabledFor(DEBUG):
+                logger.debug("QUEUE ---> %s", event)
             return event
 
+    def pending(self, element):
+        """
+        Is an element still waiting in the queue?
+        """
+        event = element.event
+        return element in self.index.get(event.what, {}).get(event.floor, ())
+
+    def cancel(self, element):
+        """
+        Cancel a pending element. Return True if the element was cancelled,
+        or False if it had already been cancelled or taken from the queue.
+        """
+        if not self.pending(element):
+            return False
+        self._unindex(element)
+        element.cancelled = True
+        self.cancelled += 1
+        return True
+
+    def reschedule(self, element, delay):
+        """
+        Change the delay (relative to the time the event was queued) of a
+        pending element. Return the new queue element for the event, or
+        None if the element was no longer pending.
+        """
+        if not self.cancel(element):
+            return
+        event = element.event
+        event.delay = delay
+        return self._push(event.queuedAt + delay, event)
+
+    def elements(self):
+        """
+        Get the pending elements, in the order they will be taken from the
+        queue.
+        """
+        return sorted(element for element in self.queue if not element.cancelled)
+
+    def find(self, what, floor=None):
+        """
+        Get the pending queue elements for events of a given type, either
+        for a given floor or (if floor is None) for all floors, in the
+        order they were queued for each floor.
+        """
+        floors = self.index.get(what)
+        if not floors:
+            return []
+        if floor is None:
+            return [element for elements in floors.values() for element in elements]
+        else:
+            return list(floors.get(floor, ()))
+
     def hasArriveEvent(self):
-        for element in self.queue:
-            if element.event.what == ARRIVE:
-                return element.event
+        floors = self.index.get(ARRIVE)
+        if floors:
+            for elements in floors.values():
+                for element in elements:
+                    return element.event
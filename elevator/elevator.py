@@ -1,10 +1,9 @@
 #!/usr/bin/env python
 
-import sys
-from time import time
 from tempfile import mkdtemp
 from pathlib import Path
 
+from elevator.clock import SimulatedClock
 from elevator.constants import (
     DEFAULT_FLOORS,
     END,
@@ -14,7 +13,9 @@ from elevator.constants import (
 from elevator.dpq import DelayPriorityQueue
 from elevator.event import Event
 from elevator.handle.utils import writeTest
+from elevator.log import logger
 from elevator.logic import Logic
+from elevator.policy import EarliestPress
 from elevator.state import State
 from elevator.stats import Stats
 
@@ -27,65 +28,103 @@ class Elevator:
         openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
         interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
         testDir=None,
+        clock=None,
+        trace=None,
+        car=None,
+        policy=None,
+        statsClass=Stats,
+        makeHistory=list,
+        writeTestOnError=True,
     ):
         self.queue = queue
+        # Unless told otherwise, read the time from the clock the queue uses,
+        # so that event times and elevator times always agree.
+        self.clock = queue.clock if clock is None else clock
         self.floors = floors
         self.openDoorDelay = openDoorDelay
         self.interFloorDelay = interFloorDelay
         self.testDir = testDir
+        # An optional trace sink (e.g., elevator.log.JSONLinesTrace), given
+        # each handled event.
+        self.trace = trace
+        # The number of this car, if it is one of a group of elevators
+        # sharing a queue. Response events are marked with it.
+        self.car = car
+        # The scheduling policy (see elevator/policy.py) that decides where
+        # to go next.
+        self.policy = EarliestPress() if policy is None else policy
+        # The class used to collect statistics (e.g., stats.LatencyStats).
+        self.statsClass = statsClass
+        # A function returning an empty history (e.g., a list, or see
+        # elevator/history.py for ways to limit its memory use).
+        self.makeHistory = makeHistory
+        # Whether to write a test (see handle/utils.py writeTest) from the
+        # history if handling an event raises an exception.
+        self.writeTestOnError = writeTestOnError
         self.logic = Logic(self)
         self.reset()
 
     def reset(self):
         self.state = State(self.floors)
-        self.stats = Stats(self.floors)
-        self.history = []
+        self.stats = self.statsClass(self.floors)
+        history = getattr(self, "history", None)
+        if hasattr(history, "close"):
+            history.close()
+        self.history = self.makeHistory()
 
     def handleEvent(self, respectTime=True):
         event = self.queue.get(respectTime)
         if event:
-            self.history.append(event)
-            self.stats.handleEvent(event)
-            try:
-                responseEvents = self.logic.handleEvent(event)
-            except Exception:
+            self.processEvent(event)
+            return event
+
+    def processEvent(self, event):
+        """
+        Process an event that has been taken from the queue, putting any
+        response events into the queue.
+        """
+        self.history.append(event)
+        if self.trace is not None:
+            self.trace.write(event)
+        self.stats.handleEvent(event)
+        try:
+            responseEvents = self.logic.handleEvent(event)
+        except Exception:
+            # Make sure the events handled so far (including this one) are
+            # in the trace file, in case it is not closed.
+            if hasattr(self.trace, "flush"):
+                self.trace.flush()
+            if self.writeTestOnError:
                 # In Python 3.11 we could use add_note to make this message
                 # appear after the traceback.
                 filename = writeTest(self, Path(mkdtemp()))
-                print(
-                    f"Elevator history saved to test file {str(filename)!r}",
-                    file=sys.stderr,
-                )
-                raise
-            else:
+                logger.error("Elevator history saved to test file %r", str(filename))
+            raise
+        else:
+            if self.car is not None:
                 for responseEvent in responseEvents:
-                    self.queue.put(responseEvent)
-
-            return event
-
-
-def runElevator(
-    events,
-    floors=DEFAULT_FLOORS,
-    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
-    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
-):
-    """Make an elevator and pass it some pre-determined events."""
+                    responseEvent.car = self.car
+            for responseEvent in responseEvents:
+                self.queue.put(responseEvent)
 
-    # Put all events into a queue.
 
+def queueEvents(events, clock):
+    """
+    Make a queue (using the given clock) holding some pre-determined events,
+    followed by an END event.
+    """
     firstEventQueuedAt = None
-    now = time()
+    now = clock.now()
 
-    queue = DelayPriorityQueue()
+    queue = DelayPriorityQueue(clock)
     for event in events:
         if firstEventQueuedAt is None:
             firstEventQueuedAt = event.queuedAt
 
         # If the event has a queued at time, we are replaying events from
         # some earlier source (likely the GUI). Adjust the old times to be
-        # relative to the current time to make sure they come out of the
-        # queue exactly as they should.
+        # relative to the start time of our clock to make sure they come
+        # out of the queue exactly as they should.
         if event.queuedAt is not None:
             event.queuedAt = now + event.queuedAt - firstEventQueuedAt
 
@@ -93,14 +132,119 @@ def runElevator(
 
     queue.put(Event(END, None))
 
+    return queue
+
+
+class EventFeeder:
+    """
+    Put pre-determined events (in the order they were queued) into a queue
+    only as they fall due, followed by an END event. A long (e.g., lazily
+    read) sequence of events never needs to be held in memory at once.
+
+    The events come out of the queue in the same order as if they had all
+    been put into it up front by queueEvents.
+    """
+
+    # Added to the order of events put by a feeder so they come out before
+    # any other events due at the same time (as they would if they had
+    # been put into the queue before the elevator started).
+    ORDER_OFFSET = -(2**62)
+
+    def __init__(self, events, queue):
+        self.events = iter(events)
+        self.queue = queue
+        self.start = queue.clock.now()
+        self.firstEventQueuedAt = None
+        self.count = 0
+        self.finished = False
+        self.pending = self._next()
+
+    def _next(self):
+        event = next(self.events, None)
+        if event is not None and event.queuedAt is not None:
+            # Adjust the old times, as queueEvents does.
+            if self.firstEventQueuedAt is None:
+                self.firstEventQueuedAt = event.queuedAt
+            event.queuedAt = self.start + event.queuedAt - self.firstEventQueuedAt
+        return event
+
+    def feed(self):
+        """
+        Put the events that are due no later than the next queued event.
+        """
+        queue = self.queue
+        while self.pending is not None:
+            event = self.pending
+            due = queue.nextTime()
+            if (
+                due is not None
+                and event.queuedAt is not None
+                and event.queuedAt + event.delay > due
+            ):
+                return
+            queue.put(event, order=self.ORDER_OFFSET + self.count)
+            self.count += 1
+            self.pending = self._next()
+
+        if not self.finished:
+            queue.put(Event(END, None))
+            self.finished = True
+
+
+def runElevator(
+    events,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+    clock=None,
+    trace=None,
+    policy=None,
+    statsClass=Stats,
+    stream=False,
+    makeHistory=list,
+    profiler=None,
+    writeTestOnError=True,
+):
+    """
+    Make an elevator and pass it some pre-determined events.
+
+    Unless a clock is given, the events are run on a simulated clock that
+    jumps straight from one event to the next, so the run takes no longer
+    than the computation needs and always produces the same result.
+
+    If stream is True, events (which must be in the order they were
+    queued) are read only as they are needed (see EventFeeder), instead
+    of all being queued up front.
+
+    If a profiler (see elevator/profiler.py) is given, it is attached to
+    the elevator.
+    """
+    clock = SimulatedClock() if clock is None else clock
+    if stream:
+        queue = DelayPriorityQueue(clock)
+        feeder = EventFeeder(events, queue)
+    else:
+        queue = queueEvents(events, clock)
+        feeder = None
+
     elevator = Elevator(
         queue=queue,
         floors=floors,
         openDoorDelay=openDoorDelay,
         interFloorDelay=interFloorDelay,
+        clock=clock,
+        trace=trace,
+        policy=policy,
+        statsClass=statsClass,
+        makeHistory=makeHistory,
+        writeTestOnError=writeTestOnError,
     )
+    if profiler is not None:
+        profiler.attach(elevator)
 
     while True:
+        if feeder is not None:
+            feeder.feed()
         event = elevator.handleEvent(respectTime=False)
         if event:
             if event.what == END:
@@ -134,5 +278,41 @@ def addStandardOptions(parser):
 
     parser.add_argument(
         "--testDir",
-        help="The directory to write automated tests to.",
+        help="The directory to write test scenarios (see elevator/scenario.py) to.",
+    )
+
+    parser.add_argument(
+        "--logLevel",
+        default="INFO",
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        help="The level of logging. Use DEBUG to see every event.",
+    )
+
+    parser.add_argument(
+        "--traceFile",
+        help=(
+            "A file to write all handled events to, in binary (see "
+            "elevator/bintrace.py) if its name ends with .etrace, else as "
+            "lines of JSON."
+        ),
+    )
+
+    parser.add_argument(
+        "--history",
+        default="all",
+        metavar="SPEC",
+        help=(
+            "Which handled events to keep (for writing a test if there is an "
+            "error): all, ring:N (the last N) or spill:N[:MAX[:DIRECTORY]] "
+            "(write them to disk, N at a time, keeping at most MAX files)."
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Time the handling of events (by type), stats and the queue, and "
+            "print the results on exit."
+        ),
     )
@@ -1,4 +1,3 @@
-import sys
 import json
 
 from elevator.constants import (
@@ -9,9 +8,24 @@ from elevator.constants import (
     SET_DIRECTION,
     describe,
 )
+from elevator.log import logger
 
 
 class Event:
+    # Long replays keep very many events alive (e.g., in an elevator's
+    # history), so avoid a per-instance dict.
+    __slots__ = (
+        "what",
+        "floor",
+        "direction",
+        "delay",
+        "queuedAt",
+        "handledAt",
+        "serial",
+        "causedBy",
+        "car",
+    )
+
     def __init__(
         self,
         what,
@@ -22,6 +36,7 @@ class Event:
         handledAt=None,
         serial=None,
         causedBy=None,
+        car=None,
     ):
         if what in {CALL_PRESSED, CLEAR_CALL, SET_DIRECTION}:
             assert direction is not None, f"None direction in {describe(what)} event."
@@ -35,7 +50,12 @@ class Event:
         self.queuedAt = queuedAt  # Time when the event is enqueued.
         self.handledAt = handledAt  # Time when the event is taken from the queue.
         self.serial = serial  # Event serial number. Added when enqueued.
-        self.causedBy = causedBy  # The event causing this event.
+        # The serial number of the event causing this event. An event may
+        # be passed, but only its serial number is kept so that events do
+        # not keep chains of earlier events alive.
+        self.causedBy = causedBy.serial if isinstance(causedBy, Event) else causedBy
+        # The car (in a group of elevators) the event is for, if any.
+        self.car = car
 
     def __str__(self):
         direction = (
@@ -48,16 +68,15 @@ class Event:
             f" serial={self.serial:2d}" if self.serial is not None else "          "
         )
         cause = (
-            f" cause={self.causedBy.serial:2d}"
-            if (self.causedBy is not None and self.causedBy.serial is not None)
-            else "         "
+            f" cause={self.causedBy:2d}" if self.causedBy is not None else "         "
         )
         queued = f" queued={self.queuedAt:.2f}" if self.queuedAt is not None else ""
         floor = f"{self.floor:4d}" if self.floor is not None else "None"
         handled = f" handled={self.handledAt:.2f}" if self.handledAt is not None else ""
+        car = f" car={self.car}" if self.car is not None else ""
         return (
             f"<Event {describe(self.what):15} floor={floor}"
-            f"{direction}{delay}{serial}{cause}{queued}{handled}>"
+            f"{direction}{delay}{serial}{cause}{queued}{handled}{car}>"
         )
 
     def enqueued(self, when, serial):
@@ -72,7 +91,7 @@ class Event:
         try:
             j = json.loads(jsonStr)
         except json.decoder.JSONDecodeError as e:
-            print(f"Could not convert string {jsonStr!r} to JSON: {e}", file=sys.stderr)
+            logger.error("Could not convert string %r to JSON: %s", jsonStr, e)
             raise
         else:
             return klass(
@@ -83,6 +102,8 @@ class Event:
                 queuedAt=j.get("queuedAt"),
                 handledAt=j.get("handledAt"),
                 serial=j.get("serial"),
+                causedBy=j.get("causedBy"),
+                car=j.get("car"),
             )
 
     def toJSON(self):
@@ -95,5 +116,7 @@ class Event:
                 "queuedAt": self.queuedAt,
                 "handledAt": self.handledAt,
                 "serial": self.serial,
+                "causedBy": self.causedBy,
+                "car": self.car,
             }
         )
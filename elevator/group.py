@@ -0,0 +1,136 @@
+from elevator.clock import SimulatedClock
+from elevator.constants import (
+    CALL_PRESSED,
+    CLEAR_CALL,
+    DEFAULT_FLOORS,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+    END,
+    RESET,
+    describe,
+)
+from elevator.dispatch import EstimatedTimeOfArrival
+from elevator.elevator import Elevator, queueEvents
+from elevator.log import logger
+
+
+class Group:
+    """
+    A bank of elevator cars serving the same floors, sharing one event
+    queue.
+
+    The group owns the hall call buttons. When a hall call is pressed (a
+    CALL_PRESSED event with no car), the dispatch policy picks a car and
+    the call is passed to that car alone. All other events must say which
+    car they are for (response events are marked by the car that caused
+    them).
+    """
+
+    def __init__(
+        self,
+        queue,
+        cars=2,
+        floors=DEFAULT_FLOORS,
+        openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+        interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+        policy=None,
+        testDir=None,
+    ):
+        assert cars > 0
+        self.queue = queue
+        self.clock = queue.clock
+        self.floors = floors
+        self.policy = EstimatedTimeOfArrival() if policy is None else policy
+        self.cars = [
+            Elevator(
+                queue,
+                floors=floors,
+                openDoorDelay=openDoorDelay,
+                interFloorDelay=interFloorDelay,
+                testDir=testDir,
+                car=car,
+            )
+            for car in range(cars)
+        ]
+        self.reset()
+
+    def reset(self):
+        # The hall call buttons, as a bitmask of floors for each direction,
+        # and the car each pressed call was given to.
+        self.callMasks = [0, 0]
+        self.assigned = {}
+        self.history = []
+        for car in self.cars:
+            car.reset()
+
+    def callPressed(self, floor, direction):
+        """
+        Is the hall call button for a direction on a floor pressed?
+        """
+        return bool(self.callMasks[direction] >> floor & 1)
+
+    def handleEvent(self, respectTime=True):
+        event = self.queue.get(respectTime)
+        if event:
+            self.history.append(event)
+            what = event.what
+
+            if what == CALL_PRESSED and event.car is None:
+                # A hall call. If it is already pressed, a car is on its way.
+                if not self.callPressed(event.floor, event.direction):
+                    car = self.policy.choose(self, event)
+                    self.callMasks[event.direction] |= 1 << event.floor
+                    self.assigned[event.floor, event.direction] = car
+                    event.car = car
+                    self.cars[car].processEvent(event)
+            elif event.car is not None:
+                if what == CLEAR_CALL:
+                    key = event.floor, event.direction
+                    if self.assigned.get(key) == event.car:
+                        del self.assigned[key]
+                        self.callMasks[event.direction] &= ~(1 << event.floor)
+                self.cars[event.car].processEvent(event)
+            elif what == RESET:
+                self.reset()
+            elif what != END:
+                logger.warning(
+                    "Ignoring %s event with no car: %s", describe(what), event
+                )
+
+            return event
+
+
+def runGroup(
+    events,
+    cars=2,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+    policy=None,
+    clock=None,
+):
+    """
+    Make a group of elevators and pass it some pre-determined events, on a
+    simulated clock unless a clock is given. Events other than hall calls
+    must give the car they are for.
+    """
+    clock = SimulatedClock() if clock is None else clock
+
+    queue = queueEvents(events, clock)
+
+    group = Group(
+        queue,
+        cars=cars,
+        floors=floors,
+        openDoorDelay=openDoorDelay,
+        interFloorDelay=interFloorDelay,
+        policy=policy,
+    )
+
+    while True:
+        event = group.handleEvent(respectTime=False)
+        if event and event.what == END:
+            assert len(queue) == 0
+            break
+
+    return group
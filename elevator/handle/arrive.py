@@ -9,10 +9,7 @@ from elevator.constants import (
     CLEAR_DIRECTION,
 )
 from elevator.event import Event
-from elevator.handle.utils import (
-    pickDirectionBasedOnStopButtons,
-    pickDirectionBasedOnCallButtons,
-)
+from elevator.log import DEBUG, logger
 
 
 def handle_ARRIVE(arriveEvent, elevator):
@@ -21,13 +18,14 @@ def handle_ARRIVE(arriveEvent, elevator):
     responseEvents = []
     delay = 0
 
-    # print("ARRIVE:", arriveEvent, state, file=sys.stderr)
+    if logger.isEnabledFor(DEBUG):
+        logger.debug("ARRIVE: %s %s", arriveEvent, state)
 
     assert state.closed
     assert state.floor == arriveEvent.floor
     assert state.direction is not None
 
-    if state.stopButtons[state.floor]:
+    if state.stopPressed(state.floor):
         # The stop button for this floor was pressed. Clear the button,
         # open the doors, and schedule a door close.
         responseEvents.append(
@@ -50,7 +48,7 @@ def handle_ARRIVE(arriveEvent, elevator):
 
             # Clear the call button for this direction on this floor,
             # if pressed.
-            if state.callButtons[arriveEvent.floor][state.direction]:
+            if state.callPressed(arriveEvent.floor, state.direction):
                 responseEvents.append(
                     Event(
                         CLEAR_CALL,
@@ -83,12 +81,9 @@ def handle_ARRIVE(arriveEvent, elevator):
             #     I.e., the decision about where to go next is based only on
             #     call buttons (their floors and directions). We need a function
             #     that can pick a next direction based on our current floor and
-            #     the call button state.
-            buttonFloor, direction = pickDirectionBasedOnCallButtons(arriveEvent, state)
-            if direction is None:
-                buttonFloor, direction = pickDirectionBasedOnStopButtons(
-                    arriveEvent, state
-                )
+            #     the call button state. That decision is made by the
+            #     elevator's scheduling policy.
+            buttonFloor, direction = elevator.policy.afterArrive(arriveEvent, elevator)
             if direction is None:
                 # Nothing pressed. Stay here.
 
@@ -105,7 +100,7 @@ def handle_ARRIVE(arriveEvent, elevator):
             else:
                 # Clear the call button (if it has been pressed) for
                 # this direction on this floor.
-                if state.callButtons[arriveEvent.floor][direction]:
+                if state.callPressed(arriveEvent.floor, direction):
                     responseEvents.append(
                         Event(
                             CLEAR_CALL,
@@ -179,7 +174,7 @@ def handle_ARRIVE(arriveEvent, elevator):
                 # We are heading somewhere else. Open the doors if the call
                 # button has been pressed in the direction we're heading.
 
-                if state.callButtons[arriveEvent.floor][state.direction]:
+                if state.callPressed(arriveEvent.floor, state.direction):
                     responseEvents.append(
                         Event(
                             CLEAR_CALL,
@@ -14,7 +14,7 @@ def handle_CALL_PRESSED(callEvent, elevator):
     state = elevator.state
     delay = 0
 
-    if state.callButtons[callEvent.floor][callEvent.direction]:
+    if state.callPressed(callEvent.floor, callEvent.direction):
         # This call button is already pressed and has been reacted to.
         return []
 
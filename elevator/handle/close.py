@@ -8,10 +8,6 @@ from elevator.constants import (
     CLEAR_DIRECTION,
 )
 from elevator.event import Event
-from elevator.handle.utils import (
-    pickDirectionBasedOnStopButtons,
-    pickDirectionBasedOnCallButtons,
-)
 
 
 def handle_CLOSE(closeEvent, elevator):
@@ -35,19 +31,15 @@ def handle_CLOSE(closeEvent, elevator):
 
         # We can't be closing on a floor where a stop button is still
         # outstanding.
-        assert not state.stopButtons[closeEvent.floor]
-
-        buttonFloor, direction = pickDirectionBasedOnStopButtons(closeEvent, state)
+        assert not state.stopPressed(closeEvent.floor)
 
-        if direction is None:
-            # We cannot consider re-opening on our current floor. This is
-            # because we may be closing after opening for the exact same
-            # call. I.e., opening twice on the floor. It is not possible to
-            # clear the call button on arrival because we do not _always_
-            # know in which direction we will go next.
-            buttonFloor, direction = pickDirectionBasedOnCallButtons(
-                closeEvent, state, considerCurrentFloor=False
-            )
+        # The elevator's scheduling policy decides. It cannot consider
+        # re-opening on our current floor. This is because we may be
+        # closing after opening for the exact same call. I.e., opening
+        # twice on the floor. It is not possible to clear the call button
+        # on arrival because we do not _always_ know in which direction we
+        # will go next.
+        buttonFloor, direction = elevator.policy.afterClose(closeEvent, elevator)
 
         if direction is None:
             # Nothing pressed. Stay here.
@@ -67,7 +59,7 @@ def handle_CLOSE(closeEvent, elevator):
 
             # Turn off (if it is on) the direction light on this floor for
             # the direction we're going in.
-            if state.callButtons[state.floor][direction]:
+            if state.callPressed(state.floor, direction):
                 responseEvents.append(
                     Event(
                         CLEAR_CALL,
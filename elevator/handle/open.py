@@ -13,7 +13,7 @@ def handle_OPEN(openEvent, elevator):
     # Clear the call button (if it has been pressed) for this direction
     # on this floor.
     if state.direction is not None:
-        if state.callButtons[openEvent.floor][state.direction]:
+        if state.callPressed(openEvent.floor, state.direction):
             responseEvents.append(
                 Event(
                     CLEAR_CALL,
@@ -25,7 +25,7 @@ def handle_OPEN(openEvent, elevator):
             )
 
     # Clear the stop button (if it has been pressed) for this floor.
-    if state.stopButtons[openEvent.floor]:
+    if state.stopPressed(openEvent.floor):
         responseEvents.append(
             Event(
                 CLEAR_STOP,
@@ -8,13 +8,15 @@ from elevator.constants import (
 )
 
 from elevator.event import Event
+from elevator.log import DEBUG, logger
 
 
 def handle_STOP_PRESSED(stopEvent, elevator):
     state = elevator.state
     delay = 0
 
-    # print("Stop pressed:", stopEvent, state, file=sys.stderr)
+    if logger.isEnabledFor(DEBUG):
+        logger.debug("Stop pressed: %s %s", stopEvent, state)
 
     state.pressStop(stopEvent.floor, stopEvent.handledAt)
 
@@ -1,15 +1,12 @@
-import sys
 from pathlib import Path
 
 from elevator.handle.utils import writeTest
+from elevator.log import logger
 
 
 def handle_WRITE_TEST(event, elevator):
     if elevator.testDir is None:
-        print(
-            "Received WRITE_TEST event but the elevator testDir is None",
-            file=sys.stderr,
-        )
+        logger.warning("Received WRITE_TEST event but the elevator testDir is None")
         return []
 
     testDir = Path(elevator.testDir)
@@ -17,6 +14,6 @@ def handle_WRITE_TEST(event, elevator):
         testDir.mkdir()
 
     testFile = writeTest(elevator, testDir)
-    print(f"Wrote test to {str(testFile)!r}.", file=sys.stderr)
+    logger.info("Wrote test to %r.", str(testFile))
 
     return []
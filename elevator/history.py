@@ -0,0 +1,152 @@
+import os
+import re
+import weakref
+from collections import deque
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from elevator.bintrace import (
+    DEFAULT_BLOCK_SIZE,
+    SUFFIX,
+    BinaryTraceReader,
+    BinaryTraceWriter,
+)
+
+# An elevator keeps a history of the events it has handled, so that a test
+# can be written if something goes wrong (see handle/utils.py writeTest).
+# A history needs only append, len and iteration (oldest first). The
+# classes here limit how much of it is kept in memory. A plain list (the
+# default) keeps everything.
+#
+# A history that has not kept all events has a dropped attribute giving
+# the number of (oldest) events it no longer has.
+
+
+class RingHistory(deque):
+    """
+    Keep only the most recent size events.
+    """
+
+    def __init__(self, size):
+        assert size > 0
+        super().__init__(maxlen=size)
+        self.appended = 0
+
+    def append(self, event):
+        super().append(event)
+        self.appended += 1
+
+    @property
+    def dropped(self):
+        return self.appended - len(self)
+
+
+class SpillHistory:
+    """
+    Keep the most recent events in memory, writing older ones to binary
+    trace files (see elevator/bintrace.py) in a directory, segmentSize
+    events to a file. If maxSegments is given, only that many files are
+    kept (the oldest are removed).
+
+    If no directory is given, a temporary one is made. It is removed by
+    close, or when the history is garbage collected or Python exits. The
+    files in a directory that is given are kept (new ones are numbered
+    after those already there).
+    """
+
+    def __init__(self, segmentSize=10000, directory=None, maxSegments=None):
+        assert segmentSize > 0
+        assert maxSegments is None or maxSegments > 0
+        self.segmentSize = segmentSize
+        self.maxSegments = maxSegments
+        if directory is None:
+            self.directory = Path(mkdtemp(prefix="elevator-history-"))
+            self._removeDirectory = weakref.finalize(
+                self, rmtree, self.directory, ignore_errors=True
+            )
+            self._count = 0
+        else:
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._removeDirectory = None
+            self._count = _nextSegment(self.directory)
+        self.segments = []
+        self.recent = []
+        self.spilled = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.spilled - self.dropped + len(self.recent)
+
+    def append(self, event):
+        self.recent.append(event)
+        if len(self.recent) == self.segmentSize:
+            self._spill()
+
+    def _spill(self):
+        filename = self.directory / f"segment-{self._count:06d}{SUFFIX}"
+        self._count += 1
+        blockSize = min(self.segmentSize, DEFAULT_BLOCK_SIZE)
+        with BinaryTraceWriter(filename, blockSize=blockSize) as writer:
+            for event in self.recent:
+                writer.write(event)
+        self.segments.append(filename)
+        self.spilled += len(self.recent)
+        self.recent = []
+        if self.maxSegments is not None and len(self.segments) > self.maxSegments:
+            os.unlink(self.segments.pop(0))
+            self.dropped += self.segmentSize
+
+    def __iter__(self):
+        for filename in self.segments:
+            with BinaryTraceReader(filename) as reader:
+                yield from reader
+        yield from self.recent
+
+    def close(self):
+        """
+        Remove the directory (and the spilled files) if it is temporary.
+        """
+        if self._removeDirectory is not None:
+            self._removeDirectory()
+            self.segments = []
+
+
+def _nextSegment(directory):
+    # Get the number of the next segment file in a directory.
+    pattern = re.compile(rf"segment-(\d+){re.escape(SUFFIX)}")
+    return 1 + max(
+        (
+            int(match.group(1))
+            for match in map(pattern.fullmatch, os.listdir(directory))
+            if match
+        ),
+        default=-1,
+    )
+
+
+def historyMaker(spec):
+    """
+    Get a function that makes an empty history, given a specification:
+    "all" (keep everything), "ring:N" (keep the last N events) or
+    "spill:N[:MAX[:DIRECTORY]]" (write events to disk, N at a time, keeping
+    at most MAX files, if MAX is given and not empty).
+    """
+    kind, _, rest = spec.partition(":")
+    if kind == "all" and not rest:
+        return list
+    elif kind == "ring" and rest:
+        size = int(rest)
+        return lambda: RingHistory(size)
+    elif kind == "spill" and rest:
+        size, _, rest = rest.partition(":")
+        maxSegments, _, directory = rest.partition(":")
+        size = int(size)
+        maxSegments = int(maxSegments) if maxSegments else None
+        return lambda: SpillHistory(size, directory or None, maxSegments)
+    else:
+        raise ValueError(
+            f"Unknown history specification {spec!r}. Use 'all', 'ring:N' "
+            f"or 'spill:N[:MAX[:DIRECTORY]]'."
+        )
@@ -0,0 +1,49 @@
+import sys
+import logging
+
+# All elevator logging goes through this logger. Until setupLogging is
+# called, only warnings and errors are shown (by the logging module's
+# last-resort handler), so simulations are quiet by default.
+logger = logging.getLogger("elevator")
+
+DEBUG = logging.DEBUG
+
+
+def setupLogging(level="INFO", stream=sys.stderr):
+    """
+    Send elevator log messages at or above a level (a name like "DEBUG" or
+    "WARNING", or a logging module level) to a stream. Use the DEBUG level
+    to see every event taken from the queue.
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+
+class JSONLinesTrace:
+    """
+    A trace sink that writes each handled event to a file as a line of JSON.
+    """
+
+    def __init__(self, filename):
+        self.fp = open(filename, "w")
+
+    def write(self, event):
+        self.fp.write(event.toJSON())
+        self.fp.write("\n")
+
+    def flush(self):
+        self.fp.flush()
+
+    def close(self):
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
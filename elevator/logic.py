@@ -1,21 +1,62 @@
-import sys
+from elevator.constants import (
+    ARRIVE,
+    CALL_PRESSED,
+    CLEAR_CALL,
+    CLEAR_DIRECTION,
+    CLEAR_STOP,
+    CLOSE,
+    END,
+    OPEN,
+    RESET,
+    SET_DIRECTION,
+    STOP_PRESSED,
+    WRITE_TEST,
+    describe,
+)
+from elevator.log import logger
 
-from elevator.constants import describe
+from elevator.handle.arrive import handle_ARRIVE
+from elevator.handle.call_pressed import handle_CALL_PRESSED
+from elevator.handle.clear_call import handle_CLEAR_CALL
+from elevator.handle.clear_direction import handle_CLEAR_DIRECTION
+from elevator.handle.clear_stop import handle_CLEAR_STOP
+from elevator.handle.end import handle_END
+from elevator.handle.close import handle_CLOSE
+from elevator.handle.open import handle_OPEN
+from elevator.handle.reset import handle_RESET
+from elevator.handle.set_direction import handle_SET_DIRECTION
+from elevator.handle.stop_pressed import handle_STOP_PRESSED
+from elevator.handle.write_test import handle_WRITE_TEST
 
-from elevator.handle.arrive import handle_ARRIVE  # noqa
-from elevator.handle.call_pressed import handle_CALL_PRESSED  # noqa
-from elevator.handle.clear_call import handle_CLEAR_CALL  # noqa
-from elevator.handle.clear_direction import handle_CLEAR_DIRECTION  # noqa
-from elevator.handle.clear_stop import handle_CLEAR_STOP  # noqa
-from elevator.handle.end import handle_END  # noqa
-from elevator.handle.close import handle_CLOSE  # noqa
-from elevator.handle.open import handle_OPEN  # noqa
-from elevator.handle.reset import handle_RESET  # noqa
-from elevator.handle.set_direction import handle_SET_DIRECTION  # noqa
-from elevator.handle.stop_pressed import handle_STOP_PRESSED  # noqa
-from elevator.handle.write_test import handle_WRITE_TEST  # noqa
+# Event handlers, indexed by event type (None where there is no handler).
+_HANDLERS = []
 
-_GLOBALS = globals()
+
+def registerHandler(what, handler):
+    """
+    Set the handler for events of type what. A handler is called with the
+    event and the elevator and must return a list of response events.
+    """
+    if what >= len(_HANDLERS):
+        _HANDLERS.extend([None] * (what + 1 - len(_HANDLERS)))
+    _HANDLERS[what] = handler
+
+
+for _what, _handler in (
+    (ARRIVE, handle_ARRIVE),
+    (CALL_PRESSED, handle_CALL_PRESSED),
+    (CLEAR_CALL, handle_CLEAR_CALL),
+    (CLEAR_DIRECTION, handle_CLEAR_DIRECTION),
+    (CLEAR_STOP, handle_CLEAR_STOP),
+    (CLOSE, handle_CLOSE),
+    (END, handle_END),
+    (OPEN, handle_OPEN),
+    (RESET, handle_RESET),
+    (SET_DIRECTION, handle_SET_DIRECTION),
+    (STOP_PRESSED, handle_STOP_PRESSED),
+    (WRITE_TEST, handle_WRITE_TEST),
+):
+    registerHandler(_what, _handler)
 
 
 class Logic:
@@ -24,11 +65,14 @@ class Logic:
 
     def handleEvent(self, event):
         try:
-            handler = _GLOBALS[f"handle_{describe(event.what)}"]
-        except KeyError:
-            print(
-                f"No handler found for {describe(event.what)} event {event}",
-                file=sys.stderr,
+            handler = _HANDLERS[event.what]
+        except IndexError:
+            handler = None
+
+        if handler is None:
+            logger.warning(
+                "No handler found for %s event %s", describe(event.what), event
             )
+            return []
         else:
             return handler(event, self.elevator)
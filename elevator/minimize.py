@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from traceback import extract_tb
+
+from elevator.constants import (
+    DEFAULT_FLOORS,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+)
+from elevator.elevator import runElevator
+
+# Shrink a list of events that makes an elevator raise an exception to a
+# minimal list that still makes it raise the same exception (i.e., of the
+# same type, raised at the same place), using delta debugging (ddmin, see
+# Zeller & Hildebrandt, "Simplifying and Isolating Failure-Inducing Input",
+# 2002). The removed events are those not needed to cause the failure, so
+# what is left is a short regression test.
+
+
+def failure(
+    events,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+):
+    """
+    Run an elevator on some events. Return None if it runs without error,
+    else the type name of the exception raised and the file and line where
+    it was raised.
+    """
+    try:
+        runElevator(
+            # The events are changed when they are queued, so use copies.
+            [copy(event) for event in events],
+            floors=floors,
+            openDoorDelay=openDoorDelay,
+            interFloorDelay=interFloorDelay,
+            writeTestOnError=False,
+        )
+    except Exception as e:
+        frame = extract_tb(e.__traceback__)[-1]
+        return e.__class__.__name__, frame.filename, frame.lineno
+    else:
+        return None
+
+
+def describeFailure(failure):
+    name, filename, lineno = failure
+    return f"{name} at {os.path.basename(filename)}:{lineno}"
+
+
+class Replayer:
+    """
+    Tell whether some of a list of events (given by their indices) make an
+    elevator fail in the same way as wanted (as returned by failure).
+    """
+
+    def __init__(self, events, wanted, floors, openDoorDelay, interFloorDelay):
+        self.events = events
+        self.wanted = wanted
+        self.floors = floors
+        self.openDoorDelay = openDoorDelay
+        self.interFloorDelay = interFloorDelay
+
+    def __call__(self, indices):
+        return (
+            failure(
+                [self.events[index] for index in indices],
+                self.floors,
+                self.openDoorDelay,
+                self.interFloorDelay,
+            )
+            == self.wanted
+        )
+
+
+def ddmin(count, test):
+    """
+    Find a subsequence of the indices range(count) that fails and is
+    1-minimal (i.e., removing any one more index from it makes it pass),
+    starting from all of range(count), which must fail.
+
+    test is called with a list of candidate subsequences and must return
+    an iterable of whether each fails, in order. Candidates are only
+    looked at until the first failing one, so they can be tested
+    (lazily) one by one, or all at once in parallel.
+    """
+    current = list(range(count))
+    n = 2
+    while len(current) >= 2:
+        size = len(current)
+        bounds = [size * i // n for i in range(n + 1)]
+        subsets = [current[bounds[i] : bounds[i + 1]] for i in range(n)]
+        # With two subsets, each is the complement of the other.
+        complements = (
+            [current[: bounds[i]] + current[bounds[i + 1] :] for i in range(n)]
+            if n > 2
+            else []
+        )
+        candidates = subsets + complements
+        found = next(
+            (index for index, failed in enumerate(test(candidates)) if failed),
+            None,
+        )
+
+        if found is None:
+            if n >= size:
+                break
+            n = min(2 * n, size)
+        elif found < n:
+            current = subsets[found]
+            n = 2
+        else:
+            current = complements[found - n]
+            n = max(n - 1, 2)
+
+    return current
+
+
+# The replayer used in a worker process (see _startWorker).
+_replayer = None
+
+
+def _startWorker(replayer):
+    # As in whatif.py, each worker is given the events (in the replayer)
+    # once, when it starts, and after that only lists of indices.
+    global _replayer
+    _replayer = replayer
+
+
+def _replay(indices):
+    return _replayer(indices)
+
+
+def minimize(
+    events,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+    workers=None,
+):
+    """
+    Find a minimal list of the events (see ddmin) that makes an elevator
+    fail as all of them do. Return the list and the failure (as returned
+    by failure). Raise ValueError if the events do not make it fail.
+
+    The candidate lists are replayed in a pool of worker processes, unless
+    workers is 1, in which case they are replayed one by one in this
+    process.
+    """
+    events = list(events)
+    wanted = failure(events, floors, openDoorDelay, interFloorDelay)
+    if wanted is None:
+        raise ValueError("The events do not make the elevator raise an exception.")
+
+    replayer = Replayer(events, wanted, floors, openDoorDelay, interFloorDelay)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        indices = ddmin(
+            len(events), lambda candidates: (replayer(c) for c in candidates)
+        )
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_startWorker, initargs=(replayer,)
+        ) as executor:
+            # When the first failing candidate is found, the map's iterator
+            # is dropped, cancelling the replays that have not started.
+            indices = ddmin(
+                len(events), lambda candidates: executor.map(_replay, candidates)
+            )
+
+    return [events[index] for index in indices], wanted
@@ -0,0 +1,163 @@
+import numpy as np
+
+from elevator.constants import (
+    ARRIVE,
+    CALL_PRESSED,
+    CLEAR_CALL,
+    CLEAR_STOP,
+    CLOSE,
+    DEFAULT_FLOORS,
+    OPEN,
+    STOP_PRESSED,
+)
+
+# This module needs NumPy, which the rest of the package does not.
+
+# The per-floor counts (shaped (floors,)) and per-floor-and-direction
+# counts (shaped (floors, 2)), with the event types they count.
+FLOOR_COUNTS = (
+    ("stopButtonCounts", STOP_PRESSED),
+    ("stopButtonClearCounts", CLEAR_STOP),
+    ("arriveCounts", ARRIVE),
+    ("openCounts", OPEN),
+    ("closeCounts", CLOSE),
+)
+CALL_COUNTS = (
+    ("callButtonCounts", CALL_PRESSED),
+    ("callButtonClearCounts", CLEAR_CALL),
+)
+NAMES = tuple(name for name, _ in FLOOR_COUNTS + CALL_COUNTS)
+_FLOOR_NAMES = {what: name for name, what in FLOOR_COUNTS}
+_CALL_NAMES = {what: name for name, what in CALL_COUNTS}
+DTYPE = np.int64
+
+
+def eventArrays(events):
+    """
+    Convert events to three integer arrays: their types, floors and
+    directions (with -1 for a floor or direction of None).
+    """
+    count = len(events)
+    what = np.fromiter((event.what for event in events), dtype=np.int16, count=count)
+    floor = np.fromiter(
+        (-1 if event.floor is None else event.floor for event in events),
+        dtype=np.int32,
+        count=count,
+    )
+    direction = np.fromiter(
+        (-1 if event.direction is None else event.direction for event in events),
+        dtype=np.int8,
+        count=count,
+    )
+    return what, floor, direction
+
+
+class ArrayStats:
+    """
+    The counts of Stats (not its histograms), held in NumPy arrays.
+
+    An ArrayStats can be given to Elevator as its statsClass, but is much
+    faster at counting many events at once with handleEvents. Counts from
+    many runs can be totalled with aggregate, or exported as one
+    structured array (see toStructured) or .npz file (see save).
+    """
+
+    def __init__(self, floors=DEFAULT_FLOORS):
+        assert floors > 0
+        self.floors = floors
+        for name, _ in FLOOR_COUNTS:
+            setattr(self, name, np.zeros(floors, dtype=DTYPE))
+        for name, _ in CALL_COUNTS:
+            setattr(self, name, np.zeros((floors, 2), dtype=DTYPE))
+
+    def handleEvent(self, event):
+        name = _FLOOR_NAMES.get(event.what)
+        if name is not None:
+            getattr(self, name)[event.floor] += 1
+        else:
+            name = _CALL_NAMES.get(event.what)
+            if name is not None:
+                getattr(self, name)[event.floor, event.direction] += 1
+
+    def handleEvents(self, events):
+        """
+        Count events, given either as a list of Events or as a (what,
+        floor, direction) triple of arrays (see eventArrays).
+        """
+        if isinstance(events, tuple):
+            what, floor, direction = events
+        else:
+            what, floor, direction = eventArrays(events)
+        for name, eventType in FLOOR_COUNTS:
+            wanted = what == eventType
+            np.add.at(getattr(self, name), floor[wanted], 1)
+        for name, eventType in CALL_COUNTS:
+            wanted = what == eventType
+            np.add.at(getattr(self, name), (floor[wanted], direction[wanted]), 1)
+
+    def merge(self, other):
+        """
+        Add the counts of another ArrayStats (or Stats) to this one. Return
+        this ArrayStats.
+        """
+        assert other.floors == self.floors
+        for name in NAMES:
+            counts = getattr(self, name)
+            counts += np.asarray(getattr(other, name), dtype=DTYPE)
+        return self
+
+    @classmethod
+    def fromStats(klass, stats):
+        """
+        Make an ArrayStats with the counts of a Stats.
+        """
+        return klass(stats.floors).merge(stats)
+
+    @classmethod
+    def aggregate(klass, runs):
+        """
+        Get an ArrayStats with the total counts of many runs (all with the
+        same number of floors), summing each count over all runs at once.
+        """
+        runs = list(runs)
+        assert runs
+        floors = runs[0].floors
+        result = klass(floors)
+        for name in NAMES:
+            stacked = np.stack([np.asarray(getattr(run, name)) for run in runs])
+            setattr(result, name, stacked.sum(axis=0, dtype=DTYPE))
+        return result
+
+    def toStructured(self):
+        """
+        Get all the counts as a structured array with one record per floor.
+        The per-direction counts are fields of shape (2,).
+        """
+        dtype = [(name, DTYPE) for name, _ in FLOOR_COUNTS] + [
+            (name, DTYPE, (2,)) for name, _ in CALL_COUNTS
+        ]
+        result = np.zeros(self.floors, dtype=dtype)
+        for name in NAMES:
+            result[name] = getattr(self, name)
+        return result
+
+    @classmethod
+    def fromStructured(klass, array):
+        result = klass(len(array))
+        for name in NAMES:
+            setattr(result, name, np.array(array[name], dtype=DTYPE))
+        return result
+
+    def save(self, file):
+        """
+        Save the counts (as separate arrays) to a .npz file.
+        """
+        np.savez(file, **{name: getattr(self, name) for name in NAMES})
+
+    @classmethod
+    def load(klass, file):
+        with np.load(file) as data:
+            result = klass(len(data[NAMES[0]]))
+            for name in NAMES:
+                setattr(result, name, data[name].astype(DTYPE))
+        return result
@@ -0,0 +1,163 @@
+from functools import lru_cache
+
+from elevator.constants import DOWN, UP
+from elevator.handle.utils import (
+    pickDirectionBasedOnCallButtons,
+    pickDirectionBasedOnStopButtons,
+)
+from elevator.state import STOPS
+
+# Scheduling policies decide where an elevator should head next when it is
+# not obliged to carry on in its current direction. The ARRIVE and CLOSE
+# handlers ask the elevator's policy by calling its afterArrive or
+# afterClose method, passing the event and the elevator. Both return a
+# (floor, direction) pair giving the floor of the button that decided the
+# matter and the direction to go in, or (None, None) to stay put.
+#
+# afterArrive may return the current floor (if a call button is pressed
+# there), but afterClose must not.
+
+
+class EarliestPress:
+    """
+    Serve buttons in the order they were pressed.
+
+    After an arrival, call buttons are considered before stop buttons and
+    a call on the current floor beats everything. After the doors close,
+    stop buttons are considered before call buttons.
+    """
+
+    def afterArrive(self, event, elevator):
+        state = elevator.state
+        floor, direction = pickDirectionBasedOnCallButtons(event, state)
+        if direction is None:
+            floor, direction = pickDirectionBasedOnStopButtons(event, state)
+        return floor, direction
+
+    def afterClose(self, event, elevator):
+        state = elevator.state
+        floor, direction = pickDirectionBasedOnStopButtons(event, state)
+        if direction is None:
+            floor, direction = pickDirectionBasedOnCallButtons(
+                event, state, considerCurrentFloor=False
+            )
+        return floor, direction
+
+
+@lru_cache(maxsize=4096)
+def sweepCost(floor, direction, stops, ups, downs, interFloorDelay, openDoorDelay):
+    """
+    Get the total time that outstanding requests would wait if an elevator
+    on a floor set off in a direction and then swept back and forth,
+    turning at the furthest request each way.
+
+    The requests are given as bitmasks of floors: stops (stop buttons),
+    ups and downs (call buttons). A stop button is served by any stop on
+    its floor. A call button is served when the elevator stops on its
+    floor heading in its direction, or turns there. Each stop holds the
+    doors open for openDoorDelay.
+
+    The result depends only on its arguments, so it is cached.
+    """
+    calls = [ups, downs]
+    position = floor
+    time = cost = 0
+
+    while stops | calls[UP] | calls[DOWN]:
+        requests = stops | calls[UP] | calls[DOWN]
+        if direction == UP:
+            if not requests >> position:
+                direction = DOWN
+                continue
+            last = requests.bit_length() - 1
+            floors = range(position, last + 1)
+        else:
+            below = requests & ((1 << (position + 1)) - 1)
+            if not below:
+                direction = UP
+                continue
+            last = (below & -below).bit_length() - 1
+            floors = range(position, last - 1, -1)
+
+        for current in floors:
+            bit = 1 << current
+            count = bool(stops & bit) + bool(calls[direction] & bit)
+            if current == last:
+                count += bool(calls[1 - direction] & bit)
+                calls[1 - direction] &= ~bit
+            if count:
+                arrival = time + abs(current - position) * interFloorDelay
+                cost += count * arrival
+                stops &= ~bit
+                calls[direction] &= ~bit
+                time = arrival + openDoorDelay
+                position = current
+
+    return cost
+
+
+class LeastWait:
+    """
+    Head in whichever direction minimizes the total time outstanding
+    requests will wait (the wait for a call button is the passenger's wait
+    to be picked up, that for a stop button is the rest of their ride).
+
+    Each direction is costed with sweepCost, which is memoized on the
+    button state, so repeated decisions in the same state are free. When
+    both directions cost the same, the decision of the fallback policy (by
+    default EarliestPress) is used.
+    """
+
+    def __init__(self, fallback=None):
+        self.fallback = EarliestPress() if fallback is None else fallback
+
+    def _cost(self, elevator, direction):
+        state = elevator.state
+        masks = state.masks
+        return sweepCost(
+            state.floor,
+            direction,
+            masks[STOPS],
+            masks[UP],
+            masks[DOWN],
+            elevator.interFloorDelay,
+            elevator.openDoorDelay,
+        )
+
+    def _choose(self, elevator, default, considerCurrentFloor):
+        floor, direction = default
+        if direction is None:
+            return default
+
+        other = DOWN if direction == UP else UP
+        state = elevator.state
+        here = 1 << state.floor
+
+        if considerCurrentFloor and state.masks[other] & here:
+            alternative = state.floor, other
+        else:
+            masks = state.masks
+            requests = (masks[STOPS] | masks[UP] | masks[DOWN]) & ~here
+            if other == UP:
+                requests >>= state.floor
+                if not requests:
+                    return default
+                alternative = requests.bit_length() - 1 + state.floor, UP
+            else:
+                requests &= here - 1
+                if not requests:
+                    return default
+                alternative = (requests & -requests).bit_length() - 1, DOWN
+
+        if self._cost(elevator, other) < self._cost(elevator, direction):
+            return alternative
+        else:
+            return default
+
+    def afterArrive(self, event, elevator):
+        default = self.fallback.afterArrive(event, elevator)
+        return self._choose(elevator, default, True)
+
+    def afterClose(self, event, elevator):
+        default = self.fallback.afterClose(event, elevator)
+        return self._choose(elevator, default, False)
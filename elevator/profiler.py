@@ -0,0 +1,246 @@
+import atexit
+import sys
+from time import perf_counter
+
+from elevator.constants import describe
+from elevator.sketch import Histogram
+
+# A profiler is attached to an elevator by replacing some of the methods of
+# the elevator (and of its logic, stats and queue) with timed versions,
+# set on the instances. Detaching it deletes them, so an elevator that is
+# not being profiled runs exactly the code it always does.
+
+
+class HandlerTimes:
+    """
+    The number of calls of the handler for one event type, the total and
+    maximum time they took, and the number of response events they made.
+    """
+
+    __slots__ = ("calls", "total", "maximum", "responses")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.responses = 0
+
+    def add(self, elapsed, responses=0):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+        self.responses += responses
+
+    def toJSON(self):
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls if self.calls else None,
+            "maximum": self.maximum,
+            "responses": self.responses,
+        }
+
+
+class Profiler:
+    """
+    Collect the time an elevator spends handling events, broken down into
+    the logic handler for each event type, stats and the queue, along with
+    the depth of the queue as events are handled. Every sampleEvery events
+    the (simulated or real) time and queue depth are also kept.
+    """
+
+    def __init__(self, sampleEvery=100):
+        assert sampleEvery > 0
+        self.sampleEvery = sampleEvery
+        self.elevator = None
+        self.clear()
+
+    def clear(self):
+        # Logic handler times, keyed by event type.
+        self.handlers = {}
+        self.events = HandlerTimes()
+        self.stats = HandlerTimes()
+        self.gets = HandlerTimes()
+        self.puts = HandlerTimes()
+        self.depths = Histogram()
+        self.maxDepth = 0
+        # (time, depth) pairs.
+        self.depthSamples = []
+
+    def attach(self, elevator):
+        """
+        Start profiling an elevator. Return this profiler.
+        """
+        assert self.elevator is None, "Profiler is already attached."
+        self.elevator = elevator
+        self._wrapElevator(elevator)
+        self._wrapLogic(elevator.logic)
+        self._wrapStats(elevator.stats)
+        self._wrapQueue(elevator.queue)
+        return self
+
+    def detach(self):
+        """
+        Stop profiling (keeping the results so far).
+        """
+        elevator = self.elevator
+        if elevator is not None:
+            for owner, names in (
+                (elevator, ("handleEvent", "reset")),
+                (elevator.logic, ("handleEvent",)),
+                (elevator.stats, ("handleEvent",)),
+                (elevator.queue, ("get", "put")),
+            ):
+                for name in names:
+                    owner.__dict__.pop(name, None)
+            self.elevator = None
+
+    def _wrapElevator(self, elevator):
+        handleEvent = elevator.handleEvent
+        reset = elevator.reset
+        queue = elevator.queue
+        events = self.events
+        depths = self.depths
+        samples = self.depthSamples
+        sampleEvery = self.sampleEvery
+
+        def timedHandleEvent(*args, **kwargs):
+            start = perf_counter()
+            event = handleEvent(*args, **kwargs)
+            if event is not None:
+                events.add(perf_counter() - start)
+                depth = len(queue)
+                depths.add(depth)
+                if depth > self.maxDepth:
+                    self.maxDepth = depth
+                if events.calls % sampleEvery == 0:
+                    samples.append((event.handledAt, depth))
+            return event
+
+        def profiledReset():
+            # A reset makes a new Stats, which must also be timed.
+            reset()
+            self._wrapStats(elevator.stats)
+
+        elevator.handleEvent = timedHandleEvent
+        elevator.reset = profiledReset
+
+    def _wrapLogic(self, logic):
+        handleEvent = logic.handleEvent
+        handlers = self.handlers
+
+        def timedHandleEvent(event):
+            start = perf_counter()
+            responses = handleEvent(event)
+            elapsed = perf_counter() - start
+            times = handlers.get(event.what)
+            if times is None:
+                times = handlers[event.what] = HandlerTimes()
+            times.add(elapsed, len(responses))
+            return responses
+
+        logic.handleEvent = timedHandleEvent
+
+    def _wrapStats(self, stats):
+        handleEvent = stats.handleEvent
+        times = self.stats
+
+        def timedHandleEvent(event):
+            start = perf_counter()
+            result = handleEvent(event)
+            times.add(perf_counter() - start)
+            return result
+
+        stats.handleEvent = timedHandleEvent
+
+    def _wrapQueue(self, queue):
+        get = queue.get
+        put = queue.put
+        gets = self.gets
+        puts = self.puts
+
+        def timedGet(*args, **kwargs):
+            start = perf_counter()
+            event = get(*args, **kwargs)
+            gets.add(perf_counter() - start)
+            return event
+
+        def timedPut(*args, **kwargs):
+            start = perf_counter()
+            element = put(*args, **kwargs)
+            puts.add(perf_counter() - start)
+            return element
+
+        queue.get = timedGet
+        queue.put = timedPut
+
+    def report(self):
+        """
+        Get the results as a dict that can be dumped as JSON. Times are in
+        seconds.
+        """
+        return {
+            "events": self.events.toJSON(),
+            "handlers": {
+                describe(what): times.toJSON()
+                for what, times in sorted(self.handlers.items())
+            },
+            "stats": self.stats.toJSON(),
+            "queueGet": self.gets.toJSON(),
+            "queuePut": self.puts.toJSON(),
+            "queueDepth": dict(
+                self.depths.summary(), maximum=self.maxDepth if self.depths else None
+            ),
+            "queueDepthSamples": self.depthSamples,
+        }
+
+    def format(self):
+        """
+        Get the results as a table (as a string). Times are in microseconds.
+        """
+        rows = [("(µs)", "calls", "total", "mean", "max", "responses")]
+
+        def addRow(name, times, responses=True):
+            rows.append(
+                (
+                    name,
+                    str(times.calls),
+                    f"{times.total * 1e6:.0f}",
+                    f"{times.total * 1e6 / times.calls:.2f}" if times.calls else "-",
+                    f"{times.maximum * 1e6:.2f}",
+                    str(times.responses) if responses else "",
+                )
+            )
+
+        addRow("all events", self.events, False)
+        for what, times in sorted(self.handlers.items()):
+            addRow(describe(what), times)
+        addRow("stats", self.stats, False)
+        addRow("queue get", self.gets, False)
+        addRow("queue put", self.puts, False)
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                value.ljust(width) if i == 0 else value.rjust(width)
+                for i, (value, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        ]
+        depth = self.depths.summary()
+        if self.depths:
+            lines.append(
+                f"Queue depth: mean {depth['mean']:.2f}, p95 {depth['p95']:.0f}, "
+                f"max {self.maxDepth}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, stream=sys.stderr):
+        print(self.format(), file=stream)
+
+    def dumpAtExit(self, stream=sys.stderr):
+        """
+        Print the results when the program exits.
+        """
+        atexit.register(self.dump, stream)
@@ -0,0 +1,71 @@
+import os
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor
+
+from elevator.batch import describeError
+from elevator.elevator import runElevator
+from elevator.scenario import observe
+
+# Fewer scenarios than this are checked in this process, as starting worker
+# processes would take longer than checking them.
+MIN_PARALLEL = 200
+
+
+def runScenario(scenario):
+    """
+    Run an elevator on the events of a scenario and return the elevator.
+    """
+    return runElevator(
+        # The events are changed when they are queued, so use copies.
+        [copy(event) for event in scenario.events],
+        floors=scenario.floors,
+        openDoorDelay=scenario.openDoorDelay,
+        interFloorDelay=scenario.interFloorDelay,
+        # A failing scenario is reported by checkScenario, so it needs no
+        # new test written for it.
+        writeTestOnError=False,
+    )
+
+
+def checkScenario(scenario):
+    """
+    Run a scenario and return a list of strings describing how what was
+    observed differs from what was expected (empty if nothing differs).
+
+    A run that raises an exception is reported, not raised, so one bad
+    scenario does not stop others being checked.
+    """
+    try:
+        got = observe(runScenario(scenario))
+    except Exception as e:
+        return [f"Raised {describeError(e)}"]
+
+    return [
+        f"{key}: expected {expected!r}, got {got.get(key)!r}"
+        for key, expected in scenario.expected.items()
+        if got.get(key) != expected
+    ]
+
+
+def checkScenarios(scenarios, workers=None, chunksize=None):
+    """
+    Check scenarios, sharding them across a pool of worker processes.
+    Return a dict, keyed by scenario name, of what checkScenario returns.
+
+    If workers is 1 (the default for fewer than MIN_PARALLEL scenarios),
+    the scenarios are checked one after the other in this process.
+    """
+    scenarios = list(scenarios)
+    if workers is None:
+        workers = 1 if len(scenarios) < MIN_PARALLEL else os.cpu_count() or 1
+
+    if workers == 1:
+        problems = map(checkScenario, scenarios)
+    else:
+        if chunksize is None:
+            # As in batch.runBatch, a few chunks per worker.
+            chunksize = max(1, len(scenarios) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            problems = list(executor.map(checkScenario, scenarios, chunksize=chunksize))
+
+    return {scenario.name: problem for scenario, problem in zip(scenarios, problems)}
@@ -0,0 +1,211 @@
+import json
+from pathlib import Path
+
+from elevator.constants import CALL_PRESSED, DOWN, STOP_PRESSED, UP
+from elevator.event import Event
+
+# Regression test scenarios: the button presses given to an elevator and
+# what its state and stats should be once it has handled them, stored as
+# data (JSON) instead of as generated Python. See elevator/replay.py for
+# running them.
+#
+# A scenario is a JSON object, e.g.:
+#
+#   {"floors": 5, "openDoorDelay": 0.5, "interFloorDelay": 0.5,
+#    "events": [[13, 2, null, 0, 1681600876.43, 0], ...],
+#    "expected": {"floor": 0, "closed": true, ..., "arriveCounts": [1, 2, ...]}}
+#
+# where each event is [what, floor, direction, delay, queuedAt, serial]. A
+# file whose name ends in .json holds one scenario, and one whose name ends
+# in .jsonl holds one per line.
+
+SUFFIX = ".json"
+LINES_SUFFIX = ".jsonl"
+
+# The events (those coming from outside the elevator) that are kept.
+INPUT_EVENTS = {CALL_PRESSED, STOP_PRESSED}
+
+# The per-floor counts in Stats that are checked.
+COUNTS = (
+    "stopButtonCounts",
+    "stopButtonClearCounts",
+    "arriveCounts",
+    "openCounts",
+    "closeCounts",
+    "callButtonCounts",
+    "callButtonClearCounts",
+)
+
+
+def observe(elevator):
+    """
+    Get what a scenario checks about an elevator (its state and the counts
+    in its stats) as a dict.
+    """
+    state = elevator.state
+    floors = range(elevator.floors)
+    result = {
+        "floor": state.floor,
+        "closed": state.closed,
+        "direction": state.direction,
+        "destination": state.destination,
+        "stopButtons": [state.stopPressed(floor) for floor in floors],
+        "callButtons": [
+            [state.callPressed(floor, UP), state.callPressed(floor, DOWN)]
+            for floor in floors
+        ],
+    }
+    for name in COUNTS:
+        result[name] = _counts(getattr(elevator.stats, name))
+    return result
+
+
+def _counts(counts):
+    # Copy per-floor counts (of a Stats or an ArrayStats, so lists or NumPy
+    # arrays, with an int or a pair of ints per floor) as lists of ints.
+    return [
+        list(map(int, count)) if hasattr(count, "__len__") else int(count)
+        for count in counts
+    ]
+
+
+class Scenario:
+    """
+    Some (input) events, the elevator settings to run them with, and what
+    should be observed (see observe) after running them. If dropped is not
+    zero, that many events were not in the history the scenario was made
+    from, so it may not reproduce what happened. If error is not None, it
+    describes the exception the events made the elevator raise when the
+    scenario was made (e.g., by elevator/minimize.py), and nothing may be
+    expected but that they no longer do.
+    """
+
+    def __init__(
+        self,
+        events,
+        expected,
+        floors,
+        openDoorDelay,
+        interFloorDelay,
+        name=None,
+        dropped=0,
+        error=None,
+    ):
+        self.events = events
+        self.expected = expected
+        self.floors = floors
+        self.openDoorDelay = openDoorDelay
+        self.interFloorDelay = interFloorDelay
+        self.name = name
+        self.dropped = dropped
+        self.error = error
+
+    @classmethod
+    def fromElevator(klass, elevator, name=None):
+        """
+        Make a Scenario from the input events in an elevator's history and
+        its current state and stats.
+        """
+        return klass(
+            [
+                Event(
+                    event.what,
+                    event.floor,
+                    direction=event.direction,
+                    delay=event.delay,
+                    queuedAt=event.queuedAt,
+                    serial=event.serial,
+                )
+                for event in elevator.history
+                if event.what in INPUT_EVENTS
+            ],
+            observe(elevator),
+            elevator.floors,
+            elevator.openDoorDelay,
+            elevator.interFloorDelay,
+            name=name,
+            # A bounded history (see elevator/history.py) may not have the
+            # earliest events.
+            dropped=getattr(elevator.history, "dropped", 0),
+        )
+
+    def toJSON(self):
+        result = {
+            "floors": self.floors,
+            "openDoorDelay": self.openDoorDelay,
+            "interFloorDelay": self.interFloorDelay,
+            "events": [
+                [
+                    event.what,
+                    event.floor,
+                    event.direction,
+                    event.delay,
+                    event.queuedAt,
+                    event.serial,
+                ]
+                for event in self.events
+            ],
+            "expected": self.expected,
+        }
+        if self.dropped:
+            result["dropped"] = self.dropped
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+    @classmethod
+    def fromJSON(klass, data, name=None):
+        return klass(
+            [
+                Event(
+                    what,
+                    floor,
+                    direction=direction,
+                    delay=delay,
+                    queuedAt=queuedAt,
+                    serial=serial,
+                )
+                for what, floor, direction, delay, queuedAt, serial in data["events"]
+            ],
+            data["expected"],
+            data["floors"],
+            data["openDoorDelay"],
+            data["interFloorDelay"],
+            name=name,
+            dropped=data.get("dropped", 0),
+            error=data.get("error"),
+        )
+
+    def save(self, filename):
+        with open(filename, "w") as fp:
+            json.dump(self.toJSON(), fp)
+            fp.write("\n")
+
+
+def loadScenarios(path):
+    """
+    Load the scenarios in a file or (recursively) in a directory, in order
+    of file name. Each is named after its file (relative to path, if path
+    is a directory), plus its line number for a file of many scenarios.
+    """
+    path = Path(path)
+    if path.is_dir():
+        filenames = sorted(
+            filename
+            for filename in path.rglob("*")
+            if filename.suffix in {SUFFIX, LINES_SUFFIX}
+        )
+    else:
+        filenames = [path]
+
+    for filename in filenames:
+        base = str(filename.relative_to(path) if path.is_dir() else filename)
+        with open(filename) as fp:
+            if filename.suffix == LINES_SUFFIX:
+                for lineNumber, line in enumerate(fp, start=1):
+                    if line.strip():
+                        yield Scenario.fromJSON(
+                            json.loads(line), name=f"{base}:{lineNumber}"
+                        )
+            else:
+                yield Scenario.fromJSON(json.load(fp), name=base)
@@ -0,0 +1,133 @@
+from math import ceil, log
+
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """
+    A streaming histogram of non-negative values (e.g., durations) with
+    logarithmically sized buckets, so that any percentile it reports is
+    within relativeAccuracy of a true value.
+
+    Memory use depends only on the range of the values added (about 350
+    buckets per factor of 1000 at the default 1% accuracy), not on how
+    many there are. Histograms with the same accuracy can be merged, e.g.,
+    to combine the results of parallel runs.
+    """
+
+    def __init__(self, relativeAccuracy=0.01):
+        assert 0 < relativeAccuracy < 1
+        self.relativeAccuracy = relativeAccuracy
+        self.gamma = (1 + relativeAccuracy) / (1 - relativeAccuracy)
+        self._logGamma = log(self.gamma)
+        # Counts, keyed by bucket index. Bucket i holds the values in
+        # (gamma ** (i - 1), gamma ** i]. Zeros are counted separately.
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value, count=1):
+        """
+        Add a value (count times).
+        """
+        assert value >= 0
+        if value == 0:
+            self.zeros += count
+        else:
+            index = ceil(log(value) / self._logGamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """
+        Add all the values of another histogram to this one. Return this
+        histogram.
+        """
+        if other.relativeAccuracy != self.relativeAccuracy:
+            raise ValueError(
+                f"Cannot merge histograms with different accuracies "
+                f"({self.relativeAccuracy} and {other.relativeAccuracy})."
+            )
+        buckets = self.buckets
+        for index, count in other.buckets.items():
+            buckets[index] = buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            if self.minimum is None or other.minimum < self.minimum:
+                self.minimum = other.minimum
+            if self.maximum is None or other.maximum > self.maximum:
+                self.maximum = other.maximum
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p):
+        """
+        Estimate the p-th percentile (0 <= p <= 100) of the values added,
+        or return None if there are none.
+        """
+        if not self.count:
+            return None
+        rank = (self.count - 1) * p / 100
+        # The extremes are known exactly.
+        if rank <= 0:
+            return self.minimum
+        if rank >= self.count - 1:
+            return self.maximum
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                value = 2 * self.gamma**index / (self.gamma + 1)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        Summarize the values as a dict with their count, mean and the given
+        percentiles (as p50, p95, etc).
+        """
+        result = {"count": self.count}
+        if self.count:
+            result["mean"] = self.mean()
+            for p in percentiles:
+                result[f"p{p}"] = self.percentile(p)
+        return result
+
+    def toJSON(self):
+        return {
+            "relativeAccuracy": self.relativeAccuracy,
+            "buckets": sorted(self.buckets.items()),
+            "zeros": self.zeros,
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+    @classmethod
+    def fromJSON(klass, data):
+        histogram = klass(data["relativeAccuracy"])
+        histogram.buckets = {index: count for index, count in data["buckets"]}
+        histogram.zeros = data["zeros"]
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.minimum = data["minimum"]
+        histogram.maximum = data["maximum"]
+        return histogram
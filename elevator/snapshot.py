@@ -0,0 +1,219 @@
+import json
+import zlib
+from copy import copy, deepcopy
+
+from elevator.clock import SimulatedClock
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import Elevator
+from elevator.event import Event
+from elevator.state import State
+from elevator.stats import LatencyStats, Stats
+
+# Snapshots are saved as JSON if their file name ends with this, else in
+# the (more compact) binary form of Snapshot.toBytes.
+JSON_SUFFIX = ".json"
+
+# The start of the binary form of a snapshot, which is followed by its
+# JSON, compressed. (Pickle is not used, as loading a pickle can run any
+# code and would tie saved snapshots to the layout of the classes.)
+_MAGIC = b"ELEVATOR-SNAPSHOT-1\n"
+
+# The Stats classes whose snapshots can be converted to JSON.
+_STATS_CLASSES = {klass.__name__: klass for klass in (Stats, LatencyStats)}
+
+
+class Snapshot:
+    """
+    A copy of everything needed to carry on running an elevator from some
+    point: its parameters, State and Stats, the events waiting in its
+    queue (and the queue's serial counter) and the time.
+
+    Any number of independent elevators can be made from a snapshot (see
+    elevator), e.g., to resume a long simulation from a checkpoint or to
+    try several what-ifs from a common starting point. The elevator's
+    history is not part of a snapshot, nor are events that have not yet
+    been put into its queue (e.g., by an EventFeeder).
+    """
+
+    def __init__(
+        self,
+        floors,
+        openDoorDelay,
+        interFloorDelay,
+        car,
+        time,
+        inc,
+        state,
+        stats,
+        pending,
+    ):
+        self.floors = floors
+        self.openDoorDelay = openDoorDelay
+        self.interFloorDelay = interFloorDelay
+        self.car = car
+        self.time = time
+        # The queue's serial counter (see DelayPriorityQueue.inc).
+        self.inc = inc
+        self.state = state
+        self.stats = stats
+        # The pending events, as (order, event) pairs in the order they
+        # will be taken from the queue.
+        self.pending = pending
+
+    @classmethod
+    def fromElevator(klass, elevator):
+        """
+        Take a snapshot of an elevator (between events).
+        """
+        queue = elevator.queue
+        return klass(
+            elevator.floors,
+            elevator.openDoorDelay,
+            elevator.interFloorDelay,
+            elevator.car,
+            elevator.clock.now(),
+            queue.inc,
+            deepcopy(elevator.state),
+            deepcopy(elevator.stats),
+            [(element.inc, copy(element.event)) for element in queue.elements()],
+        )
+
+    def elevator(
+        self,
+        clock=None,
+        policy=None,
+        openDoorDelay=None,
+        interFloorDelay=None,
+        trace=None,
+        testDir=None,
+        makeHistory=list,
+        writeTestOnError=True,
+    ):
+        """
+        Make an elevator (with its own queue) that carries on from the
+        snapshot, on a simulated clock set to the snapshot time unless a
+        clock is given. The door and inter-floor delays can be changed,
+        but events already in the queue keep the delays they were given.
+        """
+        clock = SimulatedClock(self.time) if clock is None else clock
+        queue = DelayPriorityQueue(clock)
+        for order, event in self.pending:
+            queue.requeue(copy(event), order)
+        queue.inc = self.inc
+
+        elevator = Elevator(
+            queue,
+            floors=self.floors,
+            openDoorDelay=(
+                self.openDoorDelay if openDoorDelay is None else openDoorDelay
+            ),
+            interFloorDelay=(
+                self.interFloorDelay if interFloorDelay is None else interFloorDelay
+            ),
+            testDir=testDir,
+            clock=clock,
+            trace=trace,
+            car=self.car,
+            policy=policy,
+            statsClass=type(self.stats),
+            makeHistory=makeHistory,
+            writeTestOnError=writeTestOnError,
+        )
+        elevator.state = deepcopy(self.state)
+        elevator.stats = deepcopy(self.stats)
+        return elevator
+
+    def toBytes(self):
+        """
+        Get the snapshot in binary form (its compressed JSON, so only
+        snapshots that can be converted to JSON can be).
+        """
+        return _MAGIC + zlib.compress(json.dumps(self.toJSON()).encode("utf-8"))
+
+    @classmethod
+    def fromBytes(klass, data):
+        if not data.startswith(_MAGIC):
+            raise ValueError("Data does not hold an elevator snapshot.")
+        try:
+            data = json.loads(zlib.decompress(data[len(_MAGIC) :]))
+        except (zlib.error, ValueError):
+            raise ValueError("Data does not hold an elevator snapshot.")
+        return klass.fromJSON(data)
+
+    def toJSON(self):
+        """
+        Get the snapshot as a dict that can be dumped as JSON. Only
+        snapshots of elevators using Stats or LatencyStats can be.
+        """
+        stats = self.stats
+        name = type(stats).__name__
+        if _STATS_CLASSES.get(name) is not type(stats):
+            raise ValueError(f"Cannot convert {name} to JSON.")
+        return {
+            "floors": self.floors,
+            "openDoorDelay": self.openDoorDelay,
+            "interFloorDelay": self.interFloorDelay,
+            "car": self.car,
+            "time": self.time,
+            "inc": self.inc,
+            "state": json.loads(self.state.toJSON()),
+            "statsClass": name,
+            "stats": stats.toJSON(),
+            "timers": {
+                "stopPressedAt": sorted(stats.stopPressedAt.items()),
+                "callPressedAt": [
+                    [floor, direction, when]
+                    for (floor, direction), when in sorted(stats.callPressedAt.items())
+                ],
+                "openedAt": stats.openedAt,
+                "lastCallAt": stats.lastCallAt,
+            },
+            "pending": [
+                [order, {slot: getattr(event, slot) for slot in Event.__slots__}]
+                for order, event in self.pending
+            ],
+        }
+
+    @classmethod
+    def fromJSON(klass, data):
+        stats = _STATS_CLASSES[data["statsClass"]].fromJSON(data["stats"])
+        timers = data["timers"]
+        stats.stopPressedAt = {floor: when for floor, when in timers["stopPressedAt"]}
+        stats.callPressedAt = {
+            (floor, direction): when
+            for floor, direction, when in timers["callPressedAt"]
+        }
+        stats.openedAt = timers["openedAt"]
+        stats.lastCallAt = timers["lastCallAt"]
+        return klass(
+            data["floors"],
+            data["openDoorDelay"],
+            data["interFloorDelay"],
+            data["car"],
+            data["time"],
+            data["inc"],
+            State.fromJSON(data["state"]),
+            stats,
+            [(order, Event(**event)) for order, event in data["pending"]],
+        )
+
+    def save(self, filename):
+        """
+        Save the snapshot to a file, as JSON if its name ends with
+        JSON_SUFFIX.
+        """
+        if str(filename).endswith(JSON_SUFFIX):
+            with open(filename, "w") as fp:
+                json.dump(self.toJSON(), fp)
+        else:
+            with open(filename, "wb") as fp:
+                fp.write(self.toBytes())
+
+    @classmethod
+    def load(klass, filename):
+        if str(filename).endswith(JSON_SUFFIX):
+            with open(filename) as fp:
+                return klass.fromJSON(json.load(fp))
+        else:
+            with open(filename, "rb") as fp:
+                return klass.fromBytes(fp.read())
@@ -1,6 +1,7 @@
 import json
+import heapq
 
-from elevator.button import Button
+from elevator.button import ButtonView
 from elevator.constants import (
     DEFAULT_FLOORS,
     DOWN,
@@ -8,13 +9,76 @@ from elevator.constants import (
     describe,
 )
 
+# The index of the stop buttons in State.masks and State.pressedAts. The
+# call buttons use UP and DOWN.
+STOPS = 2
+
+
+def _lowestFloor(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+class StopButtons:
+    """
+    A read-only sequence of Button views of the stop buttons of a State.
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    def __len__(self):
+        return self.state.floors
+
+    def __getitem__(self, floor):
+        state = self.state
+        return ButtonView(state, STOPS, range(state.floors)[floor])
+
+    def __iter__(self):
+        for floor in range(self.state.floors):
+            yield self[floor]
+
+
+class CallButtons:
+    """
+    A read-only sequence of (UP, DOWN) pairs of Button views of the call
+    buttons of a State.
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    def __len__(self):
+        return self.state.floors
+
+    def __getitem__(self, floor):
+        state = self.state
+        floor = range(state.floors)[floor]
+        return (
+            ButtonView(state, UP, floor),
+            ButtonView(state, DOWN, floor),
+        )
+
+    def __iter__(self):
+        for floor in range(self.state.floors):
+            yield self[floor]
+
 
 class State:
     def __init__(self, floors=DEFAULT_FLOORS):
         assert floors > 0
         self.floors = floors
-        self.stopButtons = [Button() for _ in range(floors)]
-        self.callButtons = list((Button(), Button()) for _ in range(floors))
+        # Pressed buttons are kept as bits (one per floor) in an integer
+        # for each of the up call, down call, and stop buttons, indexed by
+        # UP, DOWN and STOPS. The times of the presses are in parallel
+        # lists, indexed the same way.
+        self.masks = [0, 0, 0]
+        self.pressedAts = [[None] * floors for _ in range(3)]
+        # Heaps of presses, for finding the earliest press quickly. One
+        # holds the stop button presses, the other the call button presses.
+        # Entries are not removed when a button is cleared, they are
+        # dropped when found to be stale (see _earliest).
+        self.stopPresses = []
+        self.callPresses = []
         self.floor = 0
         self.direction = None
         self.destination = None
@@ -35,11 +99,38 @@ class State:
             f"stops=[{stops}] calls=[{calls}] "
         )
 
+    @property
+    def stopButtons(self):
+        return StopButtons(self)
+
+    @property
+    def callButtons(self):
+        return CallButtons(self)
+
+    def stopPressed(self, floor):
+        """
+        Is the stop button for a floor pressed?
+        """
+        return bool(self.masks[STOPS] >> floor & 1)
+
+    def callPressed(self, floor, direction):
+        """
+        Is the call button for a direction on a floor pressed?
+        """
+        return bool(self.masks[direction] >> floor & 1)
+
     @classmethod
     def fromJSON(klass, j):
+        """
+        Make a State from the JSON (either a string or a dict decoded from
+        one) made by toJSON.
+        """
+        if isinstance(j, str):
+            j = json.loads(j)
         state = klass(j["floors"])
-        state.stopButtons = j["stopButtons"]
-        state.callButtons = j["callButtons"]
+        state.masks = list(j["masks"])
+        state.pressedAts = [list(pressedAt) for pressedAt in j["pressedAts"]]
+        state._rebuildPresses()
         state.floor = j["floor"]
         state.direction = j["direction"]
         state.destination = j["destination"]
@@ -50,8 +141,8 @@ class State:
         return json.dumps(
             {
                 "floors": self.floors,
-                "stopButtons": self.stopButtons,
-                "callButtons": self.callButtons,
+                "masks": self.masks,
+                "pressedAts": self.pressedAts,
                 "floor": self.floor,
                 "direction": self.direction,
                 "destination": self.destination,
@@ -74,6 +165,88 @@ class State:
 
         return None, None
 
+    def press(self, index, floor, when):
+        """
+        Press the UP or DOWN call button or (if index is STOPS) the stop
+        button for a floor.
+        """
+        self.masks[index] |= 1 << floor
+        self.pressedAts[index][floor] = when
+        presses = self.stopPresses if index == STOPS else self.callPresses
+        # Presses are ordered as Buttons are: earliest first, with unknown
+        # press times last. Ties go to the lowest floor, then to UP.
+        heapq.heappush(presses, (when is None, when or 0, floor, index))
+        if len(presses) > 4 * self.floors:
+            self._rebuildPresses()
+
+    def clear(self, index, floor):
+        """
+        Clear the UP or DOWN call button or (if index is STOPS) the stop
+        button for a floor.
+        """
+        self.masks[index] &= ~(1 << floor)
+        self.pressedAts[index][floor] = None
+
+    def _rebuildPresses(self):
+        # Make the press heaps afresh from the pressed buttons, dropping
+        # stale entries.
+        self.stopPresses = []
+        self.callPresses = []
+        for index in UP, DOWN, STOPS:
+            presses = self.stopPresses if index == STOPS else self.callPresses
+            pressedAt = self.pressedAts[index]
+            for floor in self.pressedFloors(index):
+                when = pressedAt[floor]
+                presses.append((when is None, when or 0, floor, index))
+        heapq.heapify(self.stopPresses)
+        heapq.heapify(self.callPresses)
+
+    def _earliest(self, presses, excludeFloor):
+        # Find the earliest current press in a heap, ignoring presses on
+        # excludeFloor. Stale entries (for buttons that have since been
+        # cleared or pressed again) found on the way are dropped.
+        masks = self.masks
+        pressedAts = self.pressedAts
+        excluded = []
+        result = None
+        while presses:
+            entry = presses[0]
+            unknown, when, floor, index = entry
+            pressedAt = pressedAts[index][floor]
+            if not (
+                masks[index] >> floor & 1
+                and (pressedAt is None) == unknown
+                and (pressedAt or 0) == when
+            ):
+                heapq.heappop(presses)
+            elif floor == excludeFloor:
+                excluded.append(heapq.heappop(presses))
+            else:
+                result = entry
+                break
+        for entry in excluded:
+            heapq.heappush(presses, entry)
+        return result
+
+    def earliestStop(self, excludeFloor=None):
+        """
+        Get the floor of the earliest pressed stop button, ignoring the stop
+        button for excludeFloor. Return None if there is no such button.
+        """
+        entry = self._earliest(self.stopPresses, excludeFloor)
+        if entry is not None:
+            return entry[2]
+
+    def earliestCall(self, excludeFloor=None):
+        """
+        Get the (floor, direction) of the earliest pressed call button,
+        ignoring the call buttons on excludeFloor. Return None if there is
+        no such button.
+        """
+        entry = self._earliest(self.callPresses, excludeFloor)
+        if entry is not None:
+            return entry[2], entry[3]
+
     def pressCall(self, floor, direction, when):
         """
         The call button on floor was pressed for a certain direction.
@@ -84,7 +257,7 @@ class State:
         if floor == 0 and direction == DOWN:
             raise ValueError("DOWN call button pressed on bottom floor!")
 
-        self.callButtons[floor][direction].press(when)
+        self.press(direction, floor, when)
 
     def clearCall(self, floor, direction, event):
         """
@@ -100,19 +273,19 @@ class State:
                 f"Cannot clear DOWN call button on bottom floor! Event: {event}"
             )
 
-        self.callButtons[floor][direction].clear()
+        self.clear(direction, floor)
 
     def pressStop(self, floor, when):
         """
         The stop button for a floor was pressed.
         """
-        self.stopButtons[floor].press(when)
+        self.press(STOPS, floor, when)
 
     def clearStop(self, floor):
         """
         Clear the stop button for a floor.
         """
-        self.stopButtons[floor].clear()
+        self.clear(STOPS, floor)
 
     def getRemainingFloors(self, direction):
         """
@@ -128,18 +301,38 @@ class State:
             else:
                 return tuple(reversed(range(self.floor)))
 
+    def _outstanding(self, mask, direction):
+        # Find the nearest floor with a bit set in mask, in the given
+        # direction.
+        assert direction in {UP, DOWN}
+        if direction == UP:
+            mask >>= self.floor + 1
+            if mask:
+                return self.floor + 1 + _lowestFloor(mask)
+        else:
+            mask &= (1 << self.floor) - 1
+            if mask:
+                return mask.bit_length() - 1
+
     def outstandingCall(self, direction):
         """
         Is there an outstanding pressed call button in the given direction?
         """
-        for floor in self.getRemainingFloors(direction):
-            if self.callButtons[floor][direction]:
-                return floor
+        return self._outstanding(self.masks[direction], direction)
 
     def outstandingStop(self, direction):
         """
         Is there an outstanding pressed stop button in the given direction?
         """
-        for floor in self.getRemainingFloors(direction):
-            if self.stopButtons[floor]:
-                return floor
+        return self._outstanding(self.masks[STOPS], direction)
+
+    def pressedFloors(self, index):
+        """
+        Get the floors (in increasing order) whose UP call, DOWN call, or
+        (if index is STOPS) stop button is pressed.
+        """
+        mask = self.masks[index]
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
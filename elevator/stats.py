@@ -1,5 +1,3 @@
-import sys
-
 from elevator.constants import (
     END,
     CLEAR_STOP,
@@ -9,15 +7,72 @@ from elevator.constants import (
     CLEAR_DIRECTION,
     SET_DIRECTION,
     describe,
+    eventTypes,
 )
+from elevator.log import logger
+from elevator.sketch import PERCENTILES, Histogram
+
+
+def _ignore(stats, event):
+    pass
 
 
 class Stats:
     IGNORED = {END, CLEAR_STOP, WRITE_TEST, RESET, CLEAR_DIRECTION, SET_DIRECTION}
 
-    def __init__(self, floors=DEFAULT_FLOORS):
+    def __init_subclass__(klass, **kwargs):
+        super().__init_subclass__(**kwargs)
+        klass._makeHandlerTable()
+
+    @classmethod
+    def _makeHandlerTable(klass):
+        # Make a table of handler functions, indexed by event type. The
+        # handler for a type is the first found, going through the MRO, of
+        # one registered on a class (see registerHandler) or a class's
+        # handle_ method. Event types that are ignored get a do-nothing
+        # handler, those with no handler at all get None (so a warning can
+        # be printed).
+        types = eventTypes()
+        klass._handlers = [None] * (max(what for what, _ in types) + 1)
+        for what, name in types:
+            handler = None
+            for cls in klass.__mro__:
+                registered = vars(cls).get("_registered", {})
+                if what in registered:
+                    handler = registered[what]
+                    break
+                if f"handle_{name}" in vars(cls):
+                    handler = vars(cls)[f"handle_{name}"]
+                    break
+            if handler is None and what in klass.IGNORED:
+                handler = _ignore
+            klass._handlers[what] = handler
+
+    @classmethod
+    def registerHandler(klass, what, handler):
+        """
+        Set the handler for events of type what, for this class and the
+        classes that inherit from it (unless they have their own handler).
+        The handler will be called with the Stats instance and the event.
+        Register None to remove a handler registered earlier.
+        """
+        if "_registered" not in vars(klass):
+            klass._registered = {}
+        if handler is None:
+            klass._registered.pop(what, None)
+        else:
+            klass._registered[what] = handler
+
+        classes = [klass]
+        while classes:
+            cls = classes.pop()
+            cls._makeHandlerTable()
+            classes.extend(cls.__subclasses__())
+
+    def __init__(self, floors=DEFAULT_FLOORS, relativeAccuracy=0.01):
         assert floors > 0
         self.floors = floors
+        self.relativeAccuracy = relativeAccuracy
         self.stopButtonCounts = [0] * floors
         self.stopButtonClearCounts = [0] * floors
         self.callButtonCounts = [[0, 0] for _ in range(floors)]
@@ -25,37 +80,252 @@ class Stats:
         self.arriveCounts = [0] * floors
         self.openCounts = [0] * floors
         self.closeCounts = [0] * floors
+        # Streaming histograms (see elevator/sketch.py) of the times from
+        # call presses to clears (per floor and direction) and from stop
+        # presses to clears (per floor), of how long the doors stay open,
+        # and of the gaps between call presses.
+        self.callWaits = [
+            [Histogram(relativeAccuracy), Histogram(relativeAccuracy)]
+            for _ in range(floors)
+        ]
+        self.stopJourneys = [Histogram(relativeAccuracy) for _ in range(floors)]
+        self.doorOpenDurations = Histogram(relativeAccuracy)
+        self.callGaps = Histogram(relativeAccuracy)
+        self.resetTimers()
+
+    def resetTimers(self):
+        # When each pressed button was first pressed (pressing it again
+        # does not restart its timer), keyed by floor for stop buttons and
+        # by (floor, direction) for call buttons. And when the doors last
+        # opened and a call button was last pressed.
+        self.stopPressedAt = {}
+        self.callPressedAt = {}
+        self.openedAt = None
+        self.lastCallAt = None
 
     def handleEvent(self, event):
         try:
-            handler = getattr(self, f"handle_{describe(event.what)}")
-        except AttributeError:
+            handler = self._handlers[event.what]
+        except IndexError:
+            handler = None
+
+        if handler is None:
             if event.what not in self.IGNORED:
-                print(
-                    f"No stats handler found for {describe(event.what)} event {event}. "
-                    f"Ignoring.",
-                    file=sys.stderr,
+                logger.warning(
+                    "No stats handler found for %s event %s. Ignoring.",
+                    describe(event.what),
+                    event,
                 )
         else:
-            return handler(event)
+            return handler(self, event)
 
     def handle_STOP_PRESSED(self, event):
         self.stopButtonCounts[event.floor] += 1
+        self.stopPressedAt.setdefault(event.floor, event.handledAt)
 
     def handle_CLEAR_STOP(self, event):
         self.stopButtonClearCounts[event.floor] += 1
+        pressedAt = self.stopPressedAt.pop(event.floor, None)
+        if pressedAt is not None:
+            self.recordJourney(event.floor, event.handledAt - pressedAt)
 
     def handle_CALL_PRESSED(self, event):
         self.callButtonCounts[event.floor][event.direction] += 1
+        now = event.handledAt
+        self.callPressedAt.setdefault((event.floor, event.direction), now)
+        if self.lastCallAt is not None:
+            self.callGaps.add(now - self.lastCallAt)
+        self.lastCallAt = now
 
     def handle_CLEAR_CALL(self, event):
         self.callButtonClearCounts[event.floor][event.direction] += 1
+        pressedAt = self.callPressedAt.pop((event.floor, event.direction), None)
+        if pressedAt is not None:
+            self.recordWait(event.floor, event.direction, event.handledAt - pressedAt)
 
     def handle_ARRIVE(self, event):
         self.arriveCounts[event.floor] += 1
 
     def handle_CLOSE(self, event):
         self.closeCounts[event.floor] += 1
+        if self.openedAt is not None:
+            self.doorOpenDurations.add(event.handledAt - self.openedAt)
+            self.openedAt = None
 
     def handle_OPEN(self, event):
         self.openCounts[event.floor] += 1
+        self.openedAt = event.handledAt
+
+    def handle_RESET(self, event):
+        self.resetTimers()
+
+    def recordWait(self, floor, direction, duration):
+        self.callWaits[floor][direction].add(duration)
+
+    def recordJourney(self, floor, duration):
+        self.stopJourneys[floor].add(duration)
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        Get the waiting and journey time distributions (over all floors),
+        and those of door open durations and gaps between call presses.
+        """
+        waits = Histogram(self.relativeAccuracy)
+        for histograms in self.callWaits:
+            for histogram in histograms:
+                waits.merge(histogram)
+        journeys = Histogram(self.relativeAccuracy)
+        for histogram in self.stopJourneys:
+            journeys.merge(histogram)
+        return {
+            "wait": waits.summary(percentiles),
+            "journey": journeys.summary(percentiles),
+            "doorOpen": self.doorOpenDurations.summary(percentiles),
+            "callGap": self.callGaps.summary(percentiles),
+        }
+
+    def merge(self, other):
+        """
+        Add the counts and histograms of another Stats (e.g., from another
+        run of the same building) to this one. Return this Stats.
+        """
+        assert other.floors == self.floors
+        calls = other.callButtonCounts
+        clears = other.callButtonClearCounts
+        waits = other.callWaits
+        for floor in range(self.floors):
+            self.stopButtonCounts[floor] += other.stopButtonCounts[floor]
+            self.stopButtonClearCounts[floor] += other.stopButtonClearCounts[floor]
+            self.arriveCounts[floor] += other.arriveCounts[floor]
+            self.openCounts[floor] += other.openCounts[floor]
+            self.closeCounts[floor] += other.closeCounts[floor]
+            self.stopJourneys[floor].merge(other.stopJourneys[floor])
+            for direction in range(2):
+                self.callButtonCounts[floor][direction] += calls[floor][direction]
+                self.callButtonClearCounts[floor][direction] += clears[floor][direction]
+                self.callWaits[floor][direction].merge(waits[floor][direction])
+        self.doorOpenDurations.merge(other.doorOpenDurations)
+        self.callGaps.merge(other.callGaps)
+        return self
+
+    def toJSON(self):
+        """
+        Get the counts and histograms as a dict that can be dumped as JSON.
+        """
+        return {
+            "floors": self.floors,
+            "stopButtonCounts": self.stopButtonCounts,
+            "stopButtonClearCounts": self.stopButtonClearCounts,
+            "callButtonCounts": self.callButtonCounts,
+            "callButtonClearCounts": self.callButtonClearCounts,
+            "arriveCounts": self.arriveCounts,
+            "openCounts": self.openCounts,
+            "closeCounts": self.closeCounts,
+            "callWaits": [
+                [histogram.toJSON() for histogram in histograms]
+                for histograms in self.callWaits
+            ],
+            "stopJourneys": [histogram.toJSON() for histogram in self.stopJourneys],
+            "doorOpenDurations": self.doorOpenDurations.toJSON(),
+            "callGaps": self.callGaps.toJSON(),
+        }
+
+    @classmethod
+    def fromJSON(klass, data):
+        """
+        Make a Stats from the dict made by toJSON. The timers of buttons that
+        are pressed (etc.) are not part of it, so they start empty.
+        """
+        stats = klass(
+            data["floors"],
+            relativeAccuracy=data["doorOpenDurations"]["relativeAccuracy"],
+        )
+        for name in (
+            "stopButtonCounts",
+            "stopButtonClearCounts",
+            "arriveCounts",
+            "openCounts",
+            "closeCounts",
+        ):
+            setattr(stats, name, list(data[name]))
+        for name in "callButtonCounts", "callButtonClearCounts":
+            setattr(stats, name, [list(counts) for counts in data[name]])
+        stats.callWaits = [
+            [Histogram.fromJSON(histogram) for histogram in histograms]
+            for histograms in data["callWaits"]
+        ]
+        stats.stopJourneys = [
+            Histogram.fromJSON(histogram) for histogram in data["stopJourneys"]
+        ]
+        stats.doorOpenDurations = Histogram.fromJSON(data["doorOpenDurations"])
+        stats.callGaps = Histogram.fromJSON(data["callGaps"])
+        return stats
+
+
+Stats._makeHandlerTable()
+
+
+def percentile(values, p):
+    """
+    Get the p-th percentile (0 <= p <= 100) of a sorted list of values,
+    interpolating linearly between the closest ranks.
+    """
+    assert values
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize(values, percentiles=PERCENTILES):
+    """
+    Summarize a list of durations as a dict with their count, mean and the
+    given percentiles (as p50, p95, etc).
+    """
+    result = {"count": len(values)}
+    if values:
+        values = sorted(values)
+        result["mean"] = sum(values) / len(values)
+        for p in percentiles:
+            result[f"p{p}"] = percentile(values, p)
+    return result
+
+
+class LatencyStats(Stats):
+    """
+    Stats that also keep every call wait and stop journey time (see
+    Stats.recordWait and Stats.recordJourney), so their percentiles are
+    exact. This uses memory in proportion to the length of the run.
+    """
+
+    def __init__(self, floors=DEFAULT_FLOORS, relativeAccuracy=0.01):
+        super().__init__(floors, relativeAccuracy)
+        self.waits = []
+        self.journeys = []
+
+    def recordWait(self, floor, direction, duration):
+        super().recordWait(floor, direction, duration)
+        self.waits.append(duration)
+
+    def recordJourney(self, floor, duration):
+        super().recordJourney(floor, duration)
+        self.journeys.append(duration)
+
+    def summary(self, percentiles=PERCENTILES):
+        result = super().summary(percentiles)
+        result["wait"] = summarize(self.waits, percentiles)
+        result["journey"] = summarize(self.journeys, percentiles)
+        return result
+
+    def toJSON(self):
+        result = super().toJSON()
+        result["waits"] = self.waits
+        result["journeys"] = self.journeys
+        return result
+
+    @classmethod
+    def fromJSON(klass, data):
+        stats = super().fromJSON(data)
+        stats.waits = list(data["waits"])
+        stats.journeys = list(data["journeys"])
+        return stats
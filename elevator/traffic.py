@@ -0,0 +1,251 @@
+import random
+
+from elevator.clock import SimulatedClock
+from elevator.constants import (
+    CALL_PRESSED,
+    CLEAR_CALL,
+    DEFAULT_FLOORS,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+    DOWN,
+    END,
+    OPEN,
+    STOP_PRESSED,
+    UP,
+)
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import Elevator
+from elevator.event import Event
+from elevator.state import STOPS
+from elevator.stats import PERCENTILES, LatencyStats, summarize
+
+# Traffic profiles, giving the probabilities that a passenger's trip
+# starts at the lobby and that it ends there. Other trips are between two
+# floors chosen at random.
+PROFILES = {
+    "uniform": (0.0, 0.0),
+    "upPeak": (0.85, 0.05),
+    "downPeak": (0.05, 0.85),
+    "lunch": (0.45, 0.45),
+}
+
+
+class Passenger:
+    """
+    Someone who arrives at a floor at a given time, wanting to go to
+    another floor. A traffic run fills in when they boarded and alighted.
+    """
+
+    def __init__(self, origin, destination, arrival):
+        assert origin != destination
+        self.origin = origin
+        self.destination = destination
+        self.arrival = arrival
+        self.boardedAt = None
+        self.alightedAt = None
+
+    @property
+    def direction(self):
+        return UP if self.destination > self.origin else DOWN
+
+    def __str__(self):
+        return (
+            f"<Passenger {self.origin}->{self.destination} "
+            f"arrival={self.arrival} boardedAt={self.boardedAt} "
+            f"alightedAt={self.alightedAt}>"
+        )
+
+
+def _trip(rng, floors, profile, lobby):
+    fromLobby, toLobby = PROFILES[profile]
+    draw = rng.random()
+    if draw < fromLobby:
+        origin = lobby
+        destination = rng.choice([f for f in range(floors) if f != lobby])
+    elif draw < fromLobby + toLobby:
+        origin = rng.choice([f for f in range(floors) if f != lobby])
+        destination = lobby
+    else:
+        origin, destination = rng.sample(range(floors), 2)
+    return origin, destination
+
+
+def _ahead(state, floor, direction):
+    # Is any button pressed for a floor beyond floor in a direction?
+    masks = state.masks
+    requests = masks[STOPS] | masks[UP] | masks[DOWN]
+    if direction == UP:
+        return bool(requests >> (floor + 1))
+    else:
+        return bool(requests & ((1 << floor) - 1))
+
+
+def _board(boarding, waiting, riding, capacity, now, queue):
+    # Move passengers from waiting to riding as long as there is room,
+    # pressing their stop buttons. Return True if any were left behind.
+    for passenger in boarding:
+        if capacity is not None and len(riding) >= capacity:
+            return True
+        waiting.remove(passenger)
+        passenger.boardedAt = now
+        riding.append(passenger)
+        queue.put(Event(STOP_PRESSED, passenger.destination))
+    return False
+
+
+def passengers(floors, rate, duration, seed=None, profile="uniform", lobby=0):
+    """
+    Make a reproducible list of passengers arriving as a Poisson process
+    (at an average of rate passengers per second) for duration seconds,
+    with trips drawn according to a traffic profile (a key of PROFILES).
+    """
+    assert floors > 1
+    rng = random.Random(seed)
+    result = []
+    when = rng.expovariate(rate)
+    while when < duration:
+        origin, destination = _trip(rng, floors, profile, lobby)
+        result.append(Passenger(origin, destination, when))
+        when += rng.expovariate(rate)
+    return result
+
+
+def callEvents(passengers):
+    """
+    Get the call button presses made by passengers as they arrive (with
+    no stop button presses, since those depend on when people board).
+    """
+    return [
+        Event(CALL_PRESSED, p.origin, direction=p.direction, queuedAt=p.arrival)
+        for p in passengers
+    ]
+
+
+def runTraffic(
+    passengers,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+    policy=None,
+    capacity=None,
+    clock=None,
+):
+    """
+    Run an elevator (with LatencyStats) serving some passengers, on a
+    simulated clock unless a clock is given. Return the elevator.
+
+    Passengers press the call button for their direction when they arrive.
+    When the doors open, passengers for that floor get off and those going
+    the elevator's way (or anyone, if nothing is pressed further on in its
+    direction) get on, as long as there is room, and press the stop button
+    for their floor. When a call button is cleared, those waiting to go
+    in its direction get on and anyone left behind presses it again.
+
+    The passengers are updated with the times they boarded and alighted.
+    Raise RuntimeError if the elevator stalls, i.e., if at the end some
+    passengers are still waiting or riding or buttons are still pressed
+    (the passengers are still updated, so how far they got can be seen).
+    """
+    clock = SimulatedClock() if clock is None else clock
+    queue = DelayPriorityQueue(clock)
+    elevator = Elevator(
+        queue,
+        floors=floors,
+        openDoorDelay=openDoorDelay,
+        interFloorDelay=interFloorDelay,
+        clock=clock,
+        policy=policy,
+        statsClass=LatencyStats,
+    )
+    state = elevator.state
+
+    # Passengers, keyed by the serial number of their call event.
+    arriving = {}
+    for passenger in sorted(passengers, key=lambda p: p.arrival):
+        element = queue.put(
+            Event(
+                CALL_PRESSED,
+                passenger.origin,
+                direction=passenger.direction,
+                queuedAt=clock.now() + passenger.arrival,
+            )
+        )
+        arriving[element.event.serial] = passenger
+    queue.put(Event(END, None))
+
+    waiting = [[] for _ in range(floors)]
+    riding = []
+
+    while True:
+        event = elevator.handleEvent(respectTime=False)
+        if event is None:
+            continue
+        what = event.what
+        if what == END:
+            break
+        elif what == CALL_PRESSED:
+            passenger = arriving.pop(event.serial, None)
+            if passenger is not None:
+                waiting[passenger.origin].append(passenger)
+        elif what == OPEN:
+            floor = event.floor
+            now = event.handledAt
+            staying = []
+            for passenger in riding:
+                if passenger.destination == floor:
+                    passenger.alightedAt = now
+                else:
+                    staying.append(passenger)
+            riding = staying
+
+            # Those going the elevator's way get on. So does everyone else,
+            # if it has nowhere further to go in its direction.
+            direction = state.direction
+            if direction is not None and _ahead(state, floor, direction):
+                boarding = [p for p in waiting[floor] if p.direction == direction]
+            else:
+                boarding = list(waiting[floor])
+            _board(boarding, waiting[floor], riding, capacity, now, queue)
+        elif what == CLEAR_CALL:
+            # The elevator is leaving (or about to leave) in the direction
+            # of the call, so those waiting to go that way get on. If some
+            # are left behind, they press the button again.
+            floor = event.floor
+            boarding = [p for p in waiting[floor] if p.direction == event.direction]
+            if _board(
+                boarding, waiting[floor], riding, capacity, event.handledAt, queue
+            ):
+                queue.put(Event(CALL_PRESSED, floor, direction=event.direction))
+
+    waitingCount = sum(map(len, waiting))
+    if waitingCount or riding or any(state.masks):
+        raise RuntimeError(
+            f"The elevator stalled with {waitingCount} passenger"
+            f"{'' if waitingCount == 1 else 's'} waiting and {len(riding)} "
+            f"riding. State: {state}"
+        )
+
+    return elevator
+
+
+def passengerSummary(passengers, percentiles=PERCENTILES):
+    """
+    Get the distributions of how long passengers waited (from arrival to
+    boarding) and travelled (from boarding to alighting), and how many were
+    never picked up or delivered.
+    """
+    return {
+        "wait": summarize(
+            [p.boardedAt - p.arrival for p in passengers if p.boardedAt is not None],
+            percentiles,
+        ),
+        "journey": summarize(
+            [
+                p.alightedAt - p.boardedAt
+                for p in passengers
+                if p.alightedAt is not None
+            ],
+            percentiles,
+        ),
+        "unserved": sum(p.alightedAt is None for p in passengers),
+    }
@@ -0,0 +1,216 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from elevator.batch import describeError
+from elevator.clock import SimulatedClock
+from elevator.constants import (
+    DEFAULT_FLOORS,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+    END,
+)
+from elevator.elevator import Elevator, queueEvents
+from elevator.snapshot import Snapshot
+from elevator.stats import Stats
+
+
+class Branch:
+    """
+    One way of carrying on from a snapshot: with another policy and/or
+    other door and inter-floor delays (None leaves a setting as it was).
+    """
+
+    def __init__(
+        self, label=None, policy=None, openDoorDelay=None, interFloorDelay=None
+    ):
+        self.label = label
+        self.policy = policy
+        self.openDoorDelay = openDoorDelay
+        self.interFloorDelay = interFloorDelay
+
+    def params(self):
+        """
+        Get a dictionary describing the branch (e.g., for reporting results).
+        """
+        result = {}
+        if self.label is not None:
+            result["label"] = self.label
+        if self.policy is not None:
+            result["policy"] = type(self.policy).__name__
+        if self.openDoorDelay is not None:
+            result["openDoorDelay"] = self.openDoorDelay
+        if self.interFloorDelay is not None:
+            result["interFloorDelay"] = self.interFloorDelay
+        return result
+
+    def describe(self):
+        if self.label is not None:
+            return self.label
+        return (
+            " ".join(f"{key}={value}" for key, value in self.params().items())
+            or "unchanged"
+        )
+
+
+class BranchResult:
+    """
+    The outcome of running a branch. If the run raised an exception, stats
+    and state are None and error describes the exception.
+    """
+
+    def __init__(self, branch, stats=None, state=None, error=None):
+        self.branch = branch
+        self.stats = stats
+        self.state = state
+        self.error = error
+
+
+def runUntil(
+    events,
+    until,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+    policy=None,
+    statsClass=Stats,
+):
+    """
+    Run an elevator (on a simulated clock) on some pre-determined events
+    until the next event is due later than until seconds after the first
+    one (or only END is left), and return a Snapshot of it.
+
+    All the events are queued up front, so those not yet handled are part
+    of the snapshot.
+    """
+    clock = SimulatedClock()
+    queue = queueEvents(events, clock)
+    elevator = Elevator(
+        queue,
+        floors=floors,
+        openDoorDelay=openDoorDelay,
+        interFloorDelay=interFloorDelay,
+        clock=clock,
+        policy=policy,
+        statsClass=statsClass,
+    )
+    while queue.peek().what != END and queue.nextTime() <= until:
+        elevator.handleEvent(respectTime=False)
+    return Snapshot.fromElevator(elevator)
+
+
+def runBranch(snapshot, branch, policy=None):
+    """
+    Carry on from a snapshot as a branch says (using policy if the branch
+    does not give one) until END, and return a BranchResult.
+    """
+    try:
+        elevator = snapshot.elevator(
+            policy=policy if branch.policy is None else branch.policy,
+            openDoorDelay=branch.openDoorDelay,
+            interFloorDelay=branch.interFloorDelay,
+            # Errors are reported in the result, so no test is written.
+            writeTestOnError=False,
+        )
+        while len(elevator.queue):
+            event = elevator.handleEvent(respectTime=False)
+            if event and event.what == END:
+                break
+    except Exception as e:
+        return BranchResult(branch, error=describeError(e))
+    else:
+        return BranchResult(branch, elevator.stats, elevator.state)
+
+
+# The snapshot and default policy that the branches run in a worker
+# process start from (see _startWorker).
+_shared = None
+
+
+def _startWorker(snapshot, policy):
+    # Each worker is given the snapshot once, when it starts, instead of
+    # with every branch. When processes are forked, it is not even copied
+    # (until a worker writes to the memory it is in).
+    global _shared
+    _shared = snapshot, policy
+
+
+def _runBranch(branch):
+    snapshot, policy = _shared
+    return runBranch(snapshot, branch, policy)
+
+
+def explore(
+    events,
+    until,
+    branches,
+    floors=DEFAULT_FLOORS,
+    openDoorDelay=DEFAULT_OPEN_DOOR_DELAY,
+    interFloorDelay=DEFAULT_INTER_FLOOR_DELAY,
+    policy=None,
+    statsClass=Stats,
+    workers=None,
+):
+    """
+    Run an elevator on some events until a time (see runUntil), then carry
+    on from there once for each branch, so the common prefix is only run
+    once. Return a list of BranchResults, in the order of the branches.
+
+    The branches are run in a pool of worker processes, unless workers
+    is 1, in which case they are run one after the other in this process.
+    """
+    branches = list(branches)
+    snapshot = runUntil(
+        events,
+        until,
+        floors=floors,
+        openDoorDelay=openDoorDelay,
+        interFloorDelay=interFloorDelay,
+        policy=policy,
+        statsClass=statsClass,
+    )
+    workers = min(workers or os.cpu_count() or 1, len(branches) or 1)
+
+    if workers == 1:
+        return [runBranch(snapshot, branch, policy) for branch in branches]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_startWorker, initargs=(snapshot, policy)
+    ) as executor:
+        return list(executor.map(_runBranch, branches))
+
+
+def compare(results, percentile=95):
+    """
+    Get a table (as a string) of the results of branches side by side: the
+    mean and a percentile of the wait, journey and door open times of each,
+    and how many times it arrived at a floor.
+    """
+    names = ("wait", "journey", "doorOpen")
+    header = ["branch", "arrivals"]
+    for name in names:
+        header.extend((f"{name} mean", f"{name} p{percentile}"))
+    rows = [header]
+
+    for result in results:
+        row = [result.branch.describe()]
+        if result.error is None:
+            summary = result.stats.summary((percentile,))
+            row.append(str(sum(result.stats.arriveCounts)))
+            for name in names:
+                for key in "mean", f"p{percentile}":
+                    value = summary[name].get(key)
+                    row.append("-" if value is None else f"{value:.2f}")
+        else:
+            row.append(f"error: {result.error}")
+        rows.append(row)
+
+    # Error messages are not lined up (they would make the columns wide).
+    widths = [len(name) for name in header]
+    widths[0] = max(len(row[0]) for row in rows)
+    for row in rows:
+        if len(row) == len(header):
+            widths = [max(width, len(value)) for width, value in zip(widths, row)]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
@@ -1,28 +1,52 @@
 #!/usr/bin/env python
 
-import sys
 import os
+import sys
 import argparse
-from time import sleep
+import selectors
 
 from elevator.constants import END
 from elevator.elevator import Elevator, addStandardOptions
 from elevator.event import Event
 from elevator.dpq import DelayPriorityQueue
+from elevator.bintrace import openTrace
+from elevator.codec import decodeMany, encodeMany
+from elevator.history import historyMaker
+from elevator.log import logger, setupLogging
+from elevator.profiler import Profiler
 
 
 def makeEvent(line):
     try:
         event = Event.fromJSONString(line)
     except ValueError as e:
-        print(f"Could not convert {line!r} to JSON: {e}", sys.stderr)
+        logger.error("Could not convert %r to JSON: %s", line, e)
     else:
         # print("Received event from stdin", file=sys.stderr)
         # print(event, file=sys.stderr)
         return event
 
 
+def readAvailable(fd):
+    """
+    Read everything that can be read from a non-blocking file descriptor
+    without waiting. Return the data and a flag that is True if the end of
+    the input was reached.
+    """
+    chunks = []
+    while True:
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            return b"".join(chunks), False
+        if data:
+            chunks.append(data)
+        else:
+            return b"".join(chunks), True
+
+
 def main(args):
+    setupLogging(args.logLevel)
     queue = DelayPriorityQueue()
     elevator = Elevator(
         queue=queue,
@@ -30,24 +54,65 @@ def main(args):
         openDoorDelay=args.openDoorDelay,
         interFloorDelay=args.interFloorDelay,
         testDir=args.testDir,
+        trace=openTrace(args.traceFile) if args.traceFile else None,
+        makeHistory=historyMaker(args.history),
     )
+    if args.profile:
+        Profiler().attach(elevator).dumpAtExit()
 
-    os.set_blocking(sys.stdin.fileno(), False)
+    stdin = sys.stdin.fileno()
+    os.set_blocking(stdin, False)
+    selector = selectors.DefaultSelector()
+    selector.register(stdin, selectors.EVENT_READ)
+    pending = b""
+    running = True
 
-    while True:
-        if line := sys.stdin.readline():
-            event = makeEvent(line.rstrip())
-            if event.what == END:
-                print("Received END event.", file=sys.stderr)
-                break
-            queue.put(event)
-
-        nextEvent = elevator.handleEvent()
-        if nextEvent and nextEvent.causedBy is not None:
-            # print(f"Sending {nextEvent}", file=sys.stderr)
-            print(nextEvent.toJSON(), flush=True)
-
-        sleep(0.1)
+    try:
+        while running:
+            # Sleep until there is input or until the next queued event is due
+            # (or indefinitely, if nothing is queued).
+            due = queue.nextTime()
+            timeout = None if due is None else max(0.0, due - queue.clock.now())
+
+            if selector.select(timeout):
+                data, eof = readAvailable(stdin)
+                if eof:
+                    logger.info("End of input.")
+                    running = False
+                *lines, pending = (pending + data).split(b"\n")
+                lines = [line.decode("utf-8").rstrip() for line in lines]
+                try:
+                    events = decodeMany(lines)
+                except ValueError:
+                    # Make the events one by one, so only bad lines are lost.
+                    events = [makeEvent(line) for line in lines if line.strip()]
+                for event in events:
+                    if event is None:
+                        continue
+                    if event.what == END:
+                        logger.info("Received END event.")
+                        running = False
+                        break
+                    queue.put(event)
+
+            # Handle all the events that are now due, sending those generated
+            # by the elevator to the GUI.
+            output = []
+            while nextEvent := elevator.handleEvent():
+                if nextEvent.causedBy is not None:
+                    # print(f"Sending {nextEvent}", file=sys.stderr)
+                    output.append(nextEvent)
+            if output:
+                sys.stdout.write(encodeMany(output))
+                sys.stdout.flush()
+    finally:
+        # Close the trace and history even if the elevator raised, so the
+        # trace holds every event it handled.
+        selector.close()
+        if elevator.trace is not None:
+            elevator.trace.close()
+        if hasattr(elevator.history, "close"):
+            elevator.history.close()
 
 
 if __name__ == "__main__":
@@ -34,6 +34,7 @@ from elevator.constants import (
     WRITE_TEST,
     describe,
 )
+from elevator.codec import decodeMany, encode
 from elevator.elevator import addStandardOptions
 from elevator.event import Event
 
@@ -58,7 +59,14 @@ class ElevatorGUI(QWidget):
         ]
         if args.testDir:
             arguments.extend(("--testDir", args.testDir))
-
+        if args.traceFile:
+            arguments.extend(("--traceFile", args.traceFile))
+        arguments.extend(("--logLevel", args.logLevel))
+        arguments.extend(("--history", args.history))
+        if args.profile:
+            arguments.append("--profile")
+
+        self.pendingOutput = ""
         self.process = QProcess()
         self.process.setProgram("gui-process.py")
         self.process.setArguments(arguments)
@@ -206,8 +214,7 @@ class ElevatorGUI(QWidget):
         self.send(Event(WRITE_TEST, None))
 
     def send(self, event):
-        utf8 = event.toJSON().encode("utf-8") + b"\n"
-        self.process.write(utf8)
+        self.process.write(encode(event).encode("utf-8") + b"\n")
 
     def handleEvent(self, event):
         if event.what == OPEN:
@@ -228,16 +235,17 @@ class ElevatorGUI(QWidget):
             print(f"Don't know how to handle {event}.", file=sys.stderr)
 
     def handleProcessOutput(self):
-        data = self.process.readAllStandardOutput().data().decode("utf-8").rstrip()
-        for line in data.split("\n"):
-            event = Event.fromJSONString(line)
-            if event:
+        data = self.process.readAllStandardOutput().data().decode("utf-8")
+        # A read may end part way through a line. Keep the rest for later.
+        *lines, self.pendingOutput = (self.pendingOutput + data).split("\n")
+        try:
+            events = decodeMany(lines)
+        except ValueError as e:
+            print(f"GUI could not parse process output: {e}", file=sys.stderr)
+            # sys.exit(1)
+        else:
+            for event in events:
                 self.handleEvent(event)
-            else:
-                print(
-                    f"GUI could not parse process output line {line!r}", file=sys.stderr
-                )
-                # sys.exit(1)
 
     def handleProcessStderr(self):
         data = self.process.readAllStandardError().data().decode("utf-8")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+import sys
+import argparse
+from pathlib import Path
+
+from elevator.minimize import describeFailure, minimize
+from elevator.scenario import SUFFIX, Scenario, loadScenarios
+
+
+def main(args):
+    (scenario,) = loadScenarios(args.scenario)
+    try:
+        events, failure = minimize(
+            scenario.events,
+            floors=scenario.floors,
+            openDoorDelay=scenario.openDoorDelay,
+            interFloorDelay=scenario.interFloorDelay,
+            workers=args.workers,
+        )
+    except ValueError as e:
+        print(f"{args.scenario}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Only the minimal events are written. Nothing is known about what the
+    # elevator should do with them, except that it should not fail.
+    minimal = Scenario(
+        events,
+        {},
+        scenario.floors,
+        scenario.openDoorDelay,
+        scenario.interFloorDelay,
+        error=describeFailure(failure),
+    )
+    path = Path(args.scenario)
+    out = args.out or path.with_name(f"{path.stem}-minimal{SUFFIX}")
+    minimal.save(out)
+
+    print(
+        f"Reduced {len(scenario.events)} events to {len(events)}, still raising "
+        f"{describeFailure(failure)}. Wrote {str(out)!r}."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Shrink the events of a test scenario (as written when an elevator "
+            "raises an exception) to a minimal list that still makes it raise "
+            "the same exception, and write that as a new scenario."
+        )
+    )
+
+    parser.add_argument("scenario", help="The scenario file to shrink.")
+
+    parser.add_argument(
+        "--out",
+        help=(
+            "The file to write the minimal scenario to (default: the name of the "
+            "scenario file, with -minimal added)."
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of processes to replay events in (default: one per CPU).",
+    )
+
+    main(parser.parse_args())
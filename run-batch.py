@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+import sys
+import json
+import argparse
+
+from elevator.batch import Job, combineStats, runBatch, sweep
+from elevator.codec import decodeMany
+
+
+def readTrace(filename):
+    with open(filename) as fp:
+        return decodeMany(fp)
+
+
+def makeJobs(args):
+    jobs = []
+
+    if args.seeds:
+        start, _, end = args.seeds.partition("-")
+        seeds = range(int(start), int(end or start) + 1)
+        jobs.extend(
+            sweep(
+                seeds,
+                floors=args.floors,
+                openDoorDelays=args.openDoorDelay,
+                interFloorDelays=args.interFloorDelay,
+                count=args.count,
+            )
+        )
+
+    for filename in args.trace or ():
+        events = readTrace(filename)
+        for floors in args.floors:
+            for openDoorDelay in args.openDoorDelay:
+                for interFloorDelay in args.interFloorDelay:
+                    jobs.append(
+                        Job(
+                            events=events,
+                            floors=floors,
+                            openDoorDelay=openDoorDelay,
+                            interFloorDelay=interFloorDelay,
+                            label=filename,
+                        )
+                    )
+
+    return jobs
+
+
+def main(args):
+    jobs = makeJobs(args)
+    if not jobs:
+        print("No jobs to run. Use --seeds and/or --trace.", file=sys.stderr)
+        sys.exit(1)
+
+    results = []
+    errors = 0
+    for result in runBatch(jobs, workers=args.workers):
+        output = result.job.params()
+        if result.error is None:
+            output["floor"] = result.state.floor
+            output["stats"] = result.stats.toJSON()
+        else:
+            output["error"] = result.error
+            errors += 1
+        print(json.dumps(output))
+        if args.summary:
+            results.append(result)
+
+    if errors:
+        # Random traces (see elevator.batch.randomTrace) often do this.
+        print(
+            f"{errors} of {len(jobs)} runs raised an exception (see their "
+            f'"error").',
+            file=sys.stderr,
+        )
+
+    if args.summary:
+        for key, stats in sorted(combineStats(results).items()):
+            floors, openDoorDelay, interFloorDelay = key
+            print(
+                json.dumps(
+                    {
+                        "floors": floors,
+                        "openDoorDelay": openDoorDelay,
+                        "interFloorDelay": interFloorDelay,
+                        "summary": stats.summary(),
+                    }
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run many elevator simulations in parallel, printing the final "
+            "statistics of each as a line of JSON."
+        )
+    )
+
+    parser.add_argument(
+        "--floors",
+        type=int,
+        nargs="+",
+        default=[5],
+        help="The numbers of floors to simulate.",
+    )
+
+    parser.add_argument(
+        "--interFloorDelay",
+        type=float,
+        nargs="+",
+        default=[2.0],
+        help="The numbers of seconds between floors to simulate.",
+    )
+
+    parser.add_argument(
+        "--openDoorDelay",
+        type=float,
+        nargs="+",
+        default=[5.0],
+        help="The numbers of seconds the doors stay open to simulate.",
+    )
+
+    parser.add_argument(
+        "--seeds",
+        help=(
+            "A random seed or an inclusive range of seeds (e.g., 0-999) to "
+            "make random traces from. Note that most random traces of more "
+            "than a few presses make the elevator raise an exception."
+        ),
+    )
+
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=100,
+        help="The number of button presses in each random trace.",
+    )
+
+    parser.add_argument(
+        "--trace",
+        nargs="+",
+        help="Files of JSON events (one per line) to replay.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of worker processes (default: the number of CPUs).",
+    )
+
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help=(
+            "Finally print the wait, journey, door open and call gap "
+            "distributions of all successful runs (for each number of floors)."
+        ),
+    )
+
+    main(parser.parse_args())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+import sys
+import argparse
+from pathlib import Path
+
+from elevator.benchmark import (
+    BENCHMARKS,
+    DENSITIES,
+    SIZES,
+    loadBaseline,
+    regressions,
+    runBenchmarks,
+    saveBaseline,
+)
+
+
+def main(args):
+    results = {}
+    for key, result in runBenchmarks(
+        args.benchmark, args.floors, args.density, args.repeat, args.minTime
+    ):
+        results[key] = result
+        microseconds = result["microseconds"]
+        print(
+            f"{key:32s} {result['perSecond']:12.0f} /s "
+            + ("" if microseconds is None else f"{microseconds:10.2f} µs"),
+            flush=True,
+        )
+
+    if args.baseline:
+        baseline = Path(args.baseline)
+        if baseline.exists() and not args.save:
+            slower = regressions(results, loadBaseline(baseline), args.tolerance)
+            for key, factor in sorted(slower.items()):
+                print(f"REGRESSION: {key} is {factor:.2f} times slower.")
+            if slower:
+                sys.exit(1)
+            print(f"No regressions (compared to {str(baseline)!r}).")
+        else:
+            saveBaseline(results, baseline)
+            print(f"Baseline saved to {str(baseline)!r}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure the speed of the elevator event loop, queue, "
+            "direction picking, stats and event JSON conversion, for "
+            "several building sizes and traffic densities."
+        )
+    )
+
+    parser.add_argument(
+        "--benchmark",
+        nargs="+",
+        choices=sorted(BENCHMARKS),
+        help="The benchmarks to run (default: all).",
+    )
+
+    parser.add_argument(
+        "--floors",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="The building sizes (numbers of floors) to run benchmarks for.",
+    )
+
+    parser.add_argument(
+        "--density",
+        nargs="+",
+        choices=sorted(DENSITIES),
+        help="The traffic densities to run benchmarks for (default: all).",
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="How many times to time each benchmark (the fastest is used).",
+    )
+
+    parser.add_argument(
+        "--minTime",
+        type=float,
+        default=0.1,
+        help="The minimum number of seconds each timing should take.",
+    )
+
+    parser.add_argument(
+        "--baseline",
+        help=(
+            "A JSON file of earlier results. If it exists, report results "
+            "that are slower (and exit with status 1 if there are any), else "
+            "save the results to it."
+        ),
+    )
+
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Save the results to the --baseline file, even if it exists.",
+    )
+
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help=(
+            "How much slower (as a fraction) than the baseline a result must "
+            "be to count as a regression."
+        ),
+    )
+
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from elevator.asyncelevator import AsyncElevator
+from elevator.clock import SimulatedClock
+from elevator.constants import ARRIVE, CALL_PRESSED, END, OPEN, UP
+from elevator.event import Event
+
+
+async def collect(elevator, into):
+    async for event in elevator.events():
+        into.append(event)
+
+
+async def runCall(clock=None, **kwargs):
+    elevator = AsyncElevator.create(clock=clock, **kwargs)
+    received = []
+    collector = asyncio.create_task(collect(elevator, received))
+    runner = asyncio.create_task(elevator.run())
+    # Let the collector subscribe before anything happens.
+    await asyncio.sleep(0)
+    elevator.put(Event(CALL_PRESSED, 2, direction=UP))
+    elevator.put(Event(END, None))
+    await runner
+    await collector
+    return elevator, received
+
+
+class TestAsyncElevator:
+    def testSimulatedClock(self):
+        "Response events must be passed to an iterator."
+        elevator, received = asyncio.run(runCall(SimulatedClock()))
+        assert elevator.elevator.state.floor == 2
+        assert [event.floor for event in received if event.what == ARRIVE] == [1, 2]
+        assert OPEN in {event.what for event in received}
+
+    def testWallClock(self):
+        "An elevator on the wall clock must wait for events to be due."
+        elevator, received = asyncio.run(
+            runCall(openDoorDelay=0.02, interFloorDelay=0.01)
+        )
+        assert elevator.elevator.state.floor == 2
+        arrivals = [event for event in received if event.what == ARRIVE]
+        assert arrivals[1].handledAt - arrivals[0].handledAt >= 0.01
+
+    def testStop(self):
+        "An elevator that is stopped must return from run at once."
+
+        async def run():
+            elevator = AsyncElevator.create()
+            runner = asyncio.create_task(elevator.run())
+            elevator.put(Event(CALL_PRESSED, 2, direction=UP))
+            await asyncio.sleep(0)
+            elevator.stop()
+            await asyncio.wait_for(runner, 1)
+            return elevator
+
+        assert asyncio.run(run()).elevator.state.floor == 0
+
+    def testManyElevators(self):
+        "Several elevators must be able to run in one event loop."
+
+        async def run():
+            elevators = [AsyncElevator.create(clock=SimulatedClock()) for _ in "abc"]
+            runners = [asyncio.create_task(e.run()) for e in elevators]
+            for floor, elevator in enumerate(elevators, start=1):
+                elevator.put(Event(CALL_PRESSED, floor, direction=UP))
+                elevator.put(Event(END, None))
+            await asyncio.gather(*runners)
+            return [e.elevator.state.floor for e in elevators]
+
+        assert asyncio.run(run()) == [1, 2, 3]
+
+    def testRaises(self):
+        "Iterators must stop if the elevator raises an exception."
+
+        async def run():
+            elevator = AsyncElevator.create(
+                clock=SimulatedClock(), writeTestOnError=False
+            )
+            received = []
+            collector = asyncio.create_task(collect(elevator, received))
+            runner = asyncio.create_task(elevator.run())
+            await asyncio.sleep(0)
+            # There is no UP call button on the top floor.
+            elevator.put(Event(CALL_PRESSED, 4, direction=UP))
+            with pytest.raises(ValueError):
+                await runner
+            await asyncio.wait_for(collector, 1)
+            return received
+
+        assert asyncio.run(run()) == []
+
+    def testFinished(self):
+        "Iterating over the events of a stopped elevator must end at once."
+
+        async def run():
+            elevator, _ = await runCall(SimulatedClock())
+            return [event async for event in elevator.events()]
+
+        assert asyncio.run(asyncio.wait_for(run(), 1)) == []
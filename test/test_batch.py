@@ -0,0 +1,103 @@
+from elevator.batch import Job, combineStats, randomTrace, runBatch, runJob, sweep
+from elevator.constants import (
+    CALL_PRESSED,
+    DEFAULT_INTER_FLOOR_DELAY,
+    DEFAULT_OPEN_DOOR_DELAY,
+    STOP_PRESSED,
+    UP,
+)
+from elevator.event import Event
+
+
+def summary(result):
+    return result.error if result.stats is None else result.stats.toJSON()
+
+
+class TestRandomTrace:
+    def testReproducible(self):
+        "The same seed must give the same trace."
+        t1 = [event.toJSON() for event in randomTrace(10, 50, 3)]
+        t2 = [event.toJSON() for event in randomTrace(10, 50, 3)]
+        assert t1 == t2
+
+    def testFloors(self):
+        "All presses must be for floors in the building."
+        assert all(0 <= event.floor < 4 for event in randomTrace(4, 200, 1))
+
+
+class TestSweep:
+    def testProduct(self):
+        jobs = sweep(range(3), floors=(5, 10), openDoorDelays=(1, 2))
+        assert len(jobs) == 12
+
+
+class TestRunJob:
+    def testEvents(self):
+        "A job can be given its events directly."
+        result = runJob(Job(events=[Event(CALL_PRESSED, 3, direction=UP)]))
+        assert result.error is None
+        assert result.state.floor == 3
+        assert result.stats.arriveCounts == [0, 1, 1, 1, 0]
+
+    def testError(self):
+        "An exception in a run must be reported, not raised."
+        result = runJob(Job(events=[Event(CALL_PRESSED, 4, direction=UP)]))
+        assert result.error.startswith("ValueError at state.py:")
+        assert result.error.endswith(": UP call button pressed on top floor!")
+        assert result.stats is None
+
+    def testNoTestWritten(self, monkeypatch):
+        "A failing job must not write a test (its error is in the result)."
+        made = []
+        monkeypatch.setattr("elevator.elevator.mkdtemp", lambda: made.append(1))
+        result = runJob(Job(seed=0, count=40))
+        assert result.error is not None
+        assert made == []
+
+
+class TestRunBatch:
+    def testInOrder(self):
+        "Results must come back in the order of the jobs."
+        jobs = sweep(range(4), floors=(5, 8), count=20)
+        assert [result.job.params() for result in runBatch(jobs, workers=2)] == [
+            job.params() for job in jobs
+        ]
+
+    def testSameAsSerial(self):
+        "Parallel runs must give the same results as running in-process."
+        jobs = [
+            Job(events=[Event(CALL_PRESSED, floor, direction=UP)], floors=5)
+            for floor in range(4)
+        ] + [
+            # Random traces that run to the end without error.
+            Job(seed=34, count=40),
+            Job(seed=176, count=40),
+        ]
+        parallel = list(runBatch(jobs, workers=2))
+        assert all(result.error is None for result in parallel)
+        serial = list(runBatch(jobs, workers=1))
+        assert list(map(summary, parallel)) == list(map(summary, serial))
+
+
+class TestCombineStats:
+    def testCombine(self):
+        "The stats of successful results must be merged by building."
+        jobs = [
+            Job(events=[Event(STOP_PRESSED, 2)], floors=5),
+            Job(events=[Event(STOP_PRESSED, 3)], floors=5),
+            Job(events=[Event(STOP_PRESSED, 3)], floors=4),
+            Job(events=[Event(STOP_PRESSED, 7)], floors=5),
+            Job(events=[Event(STOP_PRESSED, 1)], floors=5, openDoorDelay=3),
+            Job(events=[Event(STOP_PRESSED, 1)], floors=5, interFloorDelay=1),
+        ]
+        combined = combineStats(runBatch(jobs, workers=1))
+        door, floor = DEFAULT_OPEN_DOOR_DELAY, DEFAULT_INTER_FLOOR_DELAY
+        assert sorted(combined) == [
+            (4, door, floor),
+            (5, 3, floor),
+            (5, door, 1),
+            (5, door, floor),
+        ]
+        assert combined[5, door, floor].openCounts == [0, 0, 1, 1, 0]
+        assert combined[4, door, floor].openCounts == [0, 0, 0, 1]
+        assert combined[5, 3, floor].openCounts == [0, 1, 0, 0, 0]
@@ -0,0 +1,70 @@
+import pytest
+
+from elevator.benchmark import (
+    BENCHMARKS,
+    _history,
+    _seed,
+    measure,
+    regressions,
+    runBenchmarks,
+)
+from elevator.constants import END
+
+
+class TestBenchmarks:
+    def testRun(self):
+        "Every benchmark must do some operations."
+        for name, benchmark in BENCHMARKS.items():
+            assert benchmark(5, "heavy")() > 0, name
+
+    def testWholeRuns(self):
+        "Benchmarks must be run on traces that run to the end."
+        assert _history(5, "heavy")[-1].what == END
+
+    def testNoWholeRun(self, monkeypatch):
+        "If no trace runs to the end, a benchmark must not be run."
+        monkeypatch.setattr("elevator.benchmark.SEEDS", range(1))
+        _seed.cache_clear()
+        try:
+            with pytest.raises(RuntimeError, match="^No random trace"):
+                BENCHMARKS["runElevator"](5, "heavy")
+        finally:
+            _seed.cache_clear()
+
+    def testRunBenchmarks(self):
+        results = dict(
+            runBenchmarks(
+                ["queue"], sizes=[5], densities=["light"], repeat=1, minTime=0
+            )
+        )
+        assert list(results) == ["queue/5/light"]
+        assert results["queue/5/light"]["perSecond"] > 0
+
+
+class TestMeasure:
+    def testMeasure(self):
+        result = measure(lambda: 10, repeat=2, minTime=0.001)
+        assert result["perSecond"] > 0
+        assert result["microseconds"] * result["perSecond"] == pytest.approx(1e6)
+
+    def testNoOperations(self):
+        assert measure(lambda: 0, repeat=1, minTime=0) == {
+            "perSecond": 0.0,
+            "microseconds": None,
+        }
+
+
+class TestRegressions:
+    def testRegressions(self):
+        baseline = {
+            "a": {"microseconds": 1.0},
+            "b": {"microseconds": 1.0},
+            "c": {"microseconds": 1.0},
+        }
+        results = {
+            "a": {"microseconds": 1.1},
+            "b": {"microseconds": 1.5},
+            "c": {"microseconds": 0.5},
+            "d": {"microseconds": 9.0},
+        }
+        assert regressions(results, baseline, tolerance=0.2) == {"b": 1.5}
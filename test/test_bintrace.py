@@ -0,0 +1,167 @@
+import pytest
+
+from elevator.batch import randomTrace
+from elevator.bintrace import (
+    BinaryTraceReader,
+    BinaryTraceWriter,
+    openTrace,
+)
+from elevator.constants import CALL_PRESSED, DOWN, END, STOP_PRESSED, UP
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.log import JSONLinesTrace
+
+
+def attributes(events):
+    return [tuple(getattr(e, name) for name in Event.__slots__) for e in events]
+
+
+def summary(events):
+    return [
+        (e.what, e.floor, e.direction, e.handledAt, e.causedBy is None) for e in events
+    ]
+
+
+class TestBinaryTrace:
+    def testRoundTrip(self, tmp_path):
+        "Events must be read back exactly as they were written."
+        filename = tmp_path / "trace.etrace"
+        events = [
+            Event(CALL_PRESSED, 3, direction=DOWN, queuedAt=1.5, serial=0),
+            Event(STOP_PRESSED, 0, delay=2.25, handledAt=7, serial=4, causedBy=0),
+            Event(STOP_PRESSED, 1, car=2),
+        ]
+        with BinaryTraceWriter(filename) as writer:
+            for event in events:
+                writer.write(event)
+        with BinaryTraceReader(filename) as reader:
+            assert len(reader) == 3
+            assert attributes(reader) == attributes(events)
+
+    def testBlocks(self, tmp_path):
+        "Events must be found across many (partly filled) blocks."
+        filename = tmp_path / "trace.etrace"
+        with BinaryTraceWriter(filename, blockSize=4) as writer:
+            for floor in range(10):
+                writer.write(Event(STOP_PRESSED, floor))
+        with BinaryTraceReader(filename) as reader:
+            assert reader.blocks == 3
+            assert len(reader) == 10
+            assert [event.floor for event in reader] == list(range(10))
+            assert reader[5].floor == 5
+            assert reader[-1].floor == 9
+            with pytest.raises(IndexError):
+                reader[10]
+
+    def testFlush(self, tmp_path):
+        "Flushed events must be in the file before it is closed."
+        filename = tmp_path / "trace.etrace"
+        writer = BinaryTraceWriter(filename, blockSize=4)
+        for floor in range(6):
+            writer.write(Event(STOP_PRESSED, floor))
+        writer.flush()
+        with BinaryTraceReader(filename) as reader:
+            assert [event.floor for event in reader] == list(range(6))
+        for floor in range(6, 9):
+            writer.write(Event(STOP_PRESSED, floor))
+        writer.close()
+        with BinaryTraceReader(filename) as reader:
+            assert reader.blocks == 3
+            assert [event.floor for event in reader] == list(range(9))
+
+    def testEmpty(self, tmp_path):
+        filename = tmp_path / "trace.etrace"
+        BinaryTraceWriter(filename).close()
+        with BinaryTraceReader(filename) as reader:
+            assert len(reader) == 0
+            assert list(reader) == []
+
+    def testNotATrace(self, tmp_path):
+        filename = tmp_path / "trace.etrace"
+        filename.write_text("hello, world")
+        with pytest.raises(ValueError, match="is not an elevator binary trace"):
+            BinaryTraceReader(filename)
+
+    def testElevatorTrace(self, tmp_path):
+        "An elevator's trace must hold its history."
+        filename = tmp_path / "trace.etrace"
+        with BinaryTraceWriter(filename, blockSize=16) as writer:
+            e = runElevator([Event(CALL_PRESSED, 3, direction=UP)], trace=writer)
+        with BinaryTraceReader(filename) as reader:
+            assert attributes(reader) == attributes(e.history)
+
+    def testElevatorRaises(self, tmp_path):
+        "The events handled by an elevator that raises must be in its trace."
+        filename = tmp_path / "trace.etrace"
+        history = []
+        writer = BinaryTraceWriter(filename, blockSize=4096)
+        with pytest.raises(AssertionError):
+            runElevator(
+                randomTrace(5, 40, 5),
+                floors=5,
+                trace=writer,
+                makeHistory=lambda: history,
+                writeTestOnError=False,
+            )
+        with BinaryTraceReader(filename) as reader:
+            assert len(reader) == len(history) > 0
+            assert attributes(reader) == attributes(history)
+        writer.close()
+
+    def testReplay(self, tmp_path):
+        "Streaming the inputs of a trace must repeat the traced run."
+        filename = tmp_path / "trace.etrace"
+        with BinaryTraceWriter(filename, blockSize=32) as writer:
+            e = runElevator(randomTrace(5, 40, 34), floors=5, trace=writer)
+        with BinaryTraceReader(filename) as reader:
+            replay = runElevator(reader.inputs(), floors=5, stream=True)
+        assert summary(replay.history) == summary(e.history)
+
+    def testOpenTrace(self, tmp_path):
+        binary = openTrace(tmp_path / "trace.etrace")
+        text = openTrace(tmp_path / "trace.jsonl")
+        assert isinstance(binary, BinaryTraceWriter)
+        assert isinstance(text, JSONLinesTrace)
+        binary.close()
+        text.close()
+
+
+class TestStream:
+    def testSameAsQueued(self):
+        "Streamed events must be handled just as if all were queued first."
+        # Random traces that run to the end without error.
+        for seed in 34, 176:
+            queued, streamed = (
+                summary(
+                    runElevator(
+                        randomTrace(5, 40, seed), floors=5, stream=stream
+                    ).history
+                )
+                for stream in (False, True)
+            )
+            assert queued[-1][0] == END
+            assert queued == streamed
+
+    def testLazy(self):
+        "Events must only be read from the stream as they fall due."
+
+        class Handled:
+            def __init__(self):
+                self.calls = []
+
+            def write(self, event):
+                if event.what == CALL_PRESSED:
+                    self.calls.append(event.handledAt)
+
+        handled = Handled()
+        handledWhenRead = []
+
+        def events():
+            for when in range(0, 1000, 100):
+                handledWhenRead.append(len(handled.calls))
+                yield Event(CALL_PRESSED, 0, direction=UP, queuedAt=when)
+
+        runElevator(events(), trace=handled, stream=True)
+        assert handled.calls == list(range(0, 1000, 100))
+        # Only one event is read ahead of those handled.
+        assert handledWhenRead == [0, 0] + list(range(1, 9))
@@ -0,0 +1,152 @@
+from elevator.batch import randomTrace
+from elevator.bintrace import openTrace
+from elevator.checker import (
+    DOORS_ALREADY_OPEN,
+    DOORS_OPEN_WHILE_MOVING,
+    FLOOR_OUT_OF_RANGE,
+    OPEN_AWAY_FROM_FLOOR,
+    SKIPPED_FLOOR,
+    UNCLEARED_CALL,
+    UNCLEARED_STOP,
+    Checker,
+    checkEvents,
+    checkTrace,
+)
+from elevator.constants import (
+    ARRIVE,
+    CALL_PRESSED,
+    CLEAR_CALL,
+    CLEAR_STOP,
+    CLOSE,
+    DOWN,
+    END,
+    OPEN,
+    RESET,
+    STOP_PRESSED,
+    UP,
+)
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.state import STOPS
+
+# A random trace that runs without error.
+FLOORS, COUNT, SEED = 5, 40, 34
+
+
+def properties(checker):
+    return [violation.property for violation in checker.violations]
+
+
+class TestChecker:
+    def testGoodRun(self):
+        "A trip up to a pressed floor and back must have no violations."
+        checker = checkEvents(
+            [
+                Event(STOP_PRESSED, 2),
+                Event(ARRIVE, 1),
+                Event(ARRIVE, 2),
+                Event(CLEAR_STOP, 2),
+                Event(OPEN, 2),
+                Event(CALL_PRESSED, 0, direction=UP),
+                Event(CLOSE, 2),
+                Event(ARRIVE, 1),
+                Event(ARRIVE, 0),
+                Event(CLEAR_CALL, 0, direction=UP),
+                Event(OPEN, 0),
+                Event(CLOSE, 0),
+                Event(END, None),
+            ],
+            floors=3,
+        )
+        assert checker.violations == []
+        assert checker.checked == 13
+
+    def testDoorsOpenWhileMoving(self):
+        checker = checkEvents([Event(OPEN, 0), Event(ARRIVE, 1)])
+        assert properties(checker) == [DOORS_OPEN_WHILE_MOVING]
+
+    def testSkippedFloor(self):
+        checker = checkEvents([Event(ARRIVE, 1), Event(ARRIVE, 3), Event(ARRIVE, 3)])
+        assert properties(checker) == [SKIPPED_FLOOR, SKIPPED_FLOOR]
+
+    def testOpenAwayFromFloor(self):
+        checker = checkEvents([Event(OPEN, 2)])
+        assert properties(checker) == [OPEN_AWAY_FROM_FLOOR]
+
+    def testDoorsAlreadyOpen(self):
+        checker = checkEvents([Event(OPEN, 0), Event(OPEN, 0)])
+        assert properties(checker) == [DOORS_ALREADY_OPEN]
+
+    def testFloorOutOfRange(self):
+        checker = Checker(floors=3)
+        assert not checker.check(Event(STOP_PRESSED, 3))
+        assert checker.check(Event(CLEAR_STOP, 2))
+        assert properties(checker) == [FLOOR_OUT_OF_RANGE]
+
+    def testNoFloors(self):
+        "Floor numbers must not be checked if the number of floors is unknown."
+        checker = checkEvents([Event(STOP_PRESSED, 30), Event(CLEAR_STOP, 30)])
+        assert checker.violations == []
+
+    def testUncleared(self):
+        "Buttons still pressed at the end must be reported (once)."
+        checker = Checker()
+        for event in (
+            Event(CALL_PRESSED, 2, direction=DOWN),
+            Event(CALL_PRESSED, 1, direction=UP),
+            Event(STOP_PRESSED, 3),
+            Event(CLEAR_CALL, 1, direction=UP),
+            Event(END, None),
+        ):
+            checker.check(event)
+        checker.close()
+        assert properties(checker) == [UNCLEARED_CALL, UNCLEARED_STOP]
+        assert str(checker.violations[0]) == (
+            "unclearedCall: The DOWN call button on floor 2 was never cleared."
+        )
+
+    def testReset(self):
+        "A reset must start the checks afresh."
+        checker = checkEvents(
+            [Event(STOP_PRESSED, 2), Event(OPEN, 0), Event(RESET, None), Event(OPEN, 0)]
+        )
+        assert checker.violations == []
+
+    def testMaxViolations(self):
+        "Violations beyond those kept must still be counted and reported."
+        checker = Checker(maxViolations=2)
+        results = [checker.check(Event(OPEN, 1)) for _ in range(5)]
+        assert results == [False] * 5
+        assert len(checker.violations) == 2
+        assert checker.violationCount == 9
+        counts = checker.counts()
+        assert counts[OPEN_AWAY_FROM_FLOOR] == 5
+        assert counts[DOORS_ALREADY_OPEN] == 4
+
+
+class TestElevatorRun:
+    def testSink(self):
+        "The buttons left pressed must be those the elevator has pressed."
+        checker = Checker(FLOORS)
+        e = runElevator(randomTrace(FLOORS, COUNT, SEED), floors=FLOORS, trace=checker)
+        checker.close()
+        assert checker.checked == len(e.history)
+        counts = checker.counts()
+        assert counts[UNCLEARED_CALL] == len(
+            list(e.state.pressedFloors(UP)) + list(e.state.pressedFloors(DOWN))
+        )
+        assert counts[UNCLEARED_STOP] == len(list(e.state.pressedFloors(STOPS)))
+        assert sum(counts.values()) == counts[UNCLEARED_CALL] + counts[UNCLEARED_STOP]
+
+    def testTraceFiles(self, tmp_path):
+        "Binary and JSON trace files must give the same violations."
+        results = []
+        for name in "trace.etrace", "trace.jsonl":
+            filename = tmp_path / name
+            with openTrace(filename) as trace:
+                runElevator(
+                    randomTrace(FLOORS, COUNT, SEED), floors=FLOORS, trace=trace
+                )
+            checker = checkTrace(filename, FLOORS)
+            results.append([str(violation) for violation in checker.violations])
+        assert results[0] == results[1]
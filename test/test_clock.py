@@ -0,0 +1,55 @@
+from elevator.clock import SimulatedClock
+from elevator.constants import ARRIVE, CALL_PRESSED, DOWN, UP
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import runElevator
+from elevator.event import Event
+
+
+class TestSimulatedClock:
+    def testStart(self):
+        assert SimulatedClock().now() == 0.0
+        assert SimulatedClock(100.0).now() == 100.0
+
+    def testAdvance(self):
+        c = SimulatedClock()
+        c.advanceTo(5.0)
+        assert c.now() == 5.0
+
+    def testNeverGoesBackwards(self):
+        c = SimulatedClock()
+        c.advanceTo(5.0)
+        c.advanceTo(3.0)
+        assert c.now() == 5.0
+
+    def testQueueJumpsToDueTime(self):
+        "A queue with a simulated clock must hand out future events at once."
+        clock = SimulatedClock()
+        queue = DelayPriorityQueue(clock)
+        queue.put(Event(ARRIVE, 1, delay=30))
+        event = queue.get()
+        assert event.what == ARRIVE
+        assert event.handledAt == 30
+        assert clock.now() == 30
+
+
+class TestRunElevator:
+    def testSimulatedTimes(self):
+        "Simulated event times must follow from the delays alone."
+        events = [Event(CALL_PRESSED, 2, direction=UP)]
+        e = runElevator(events, openDoorDelay=10, interFloorDelay=2)
+        arrivals = [event.handledAt for event in e.history if event.what == ARRIVE]
+        assert arrivals == [2, 4]
+
+    def testReplayIsRepeatable(self):
+        "Two replays of the same trace must give identical histories."
+
+        def trace():
+            return [
+                Event(CALL_PRESSED, 3, direction=UP, queuedAt=1000.0),
+                Event(CALL_PRESSED, 1, direction=UP, queuedAt=1001.5),
+                Event(CALL_PRESSED, 4, direction=DOWN, queuedAt=1003.25),
+            ]
+
+        h1 = [str(event) for event in runElevator(trace()).history]
+        h2 = [str(event) for event in runElevator(trace()).history]
+        assert h1 == h2
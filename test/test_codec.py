@@ -0,0 +1,84 @@
+import pytest
+
+from elevator.batch import randomTrace
+from elevator.codec import decodeMany, encode, encodeMany, packMany, unpackMany
+from elevator.constants import CALL_PRESSED, DOWN, STOP_PRESSED
+from elevator.elevator import runElevator
+from elevator.event import Event
+
+
+def attributes(events):
+    return [tuple(getattr(e, name) for name in Event.__slots__) for e in events]
+
+
+def history():
+    return list(runElevator(randomTrace(5, 40, 34), floors=5).history)
+
+
+class TestJSON:
+    def testSameAsToJSON(self):
+        "Events must be encoded exactly as Event.toJSON encodes them."
+        events = history() + [Event(STOP_PRESSED, 2, delay=1.5, car=3)]
+        assert [encode(event) for event in events] == [
+            event.toJSON() for event in events
+        ]
+
+    def testRoundTrip(self):
+        events = history()
+        decoded = decodeMany(encodeMany(events).splitlines())
+        assert attributes(decoded) == attributes(events)
+
+    def testFromJSONString(self):
+        "Events must be decoded as Event.fromJSONString decodes them."
+        lines = [
+            f'{{"what": {STOP_PRESSED}, "floor": 2}}',
+            '{"what": %d, "floor": 1, "direction": %d, "queuedAt": 4.5}'
+            % (CALL_PRESSED, DOWN),
+        ]
+        assert attributes(decodeMany(lines)) == attributes(
+            [Event.fromJSONString(line) for line in lines]
+        )
+
+    def testBlankLines(self):
+        line = f'{{"what": {STOP_PRESSED}, "floor": 0}}'
+        (event,) = decodeMany(["", "   ", line, ""])
+        assert event.floor == 0
+
+    def testEmpty(self):
+        assert encodeMany([]) == ""
+        assert decodeMany([]) == []
+
+    def testBadLine(self):
+        "The line that cannot be parsed must be reported."
+        lines = [f'{{"what": {STOP_PRESSED}, "floor": 0}}', "{oops"]
+        with pytest.raises(ValueError, match="Could not parse line 2 '{oops'"):
+            decodeMany(lines)
+
+
+class TestBinary:
+    def testRoundTrip(self):
+        events = history() + [
+            Event(CALL_PRESSED, 3, direction=DOWN, queuedAt=1.5, serial=0),
+            Event(STOP_PRESSED, 0, delay=2.25, handledAt=7, serial=4, causedBy=0),
+        ]
+        data = packMany(events)
+        decoded, end = unpackMany(data)
+        assert end == len(data)
+        assert attributes(decoded) == attributes(events)
+
+    def testFrames(self):
+        "Consecutive frames must be unpacked one at a time."
+        data = packMany([Event(STOP_PRESSED, 1)]) + packMany(
+            [Event(STOP_PRESSED, 2), Event(STOP_PRESSED, 3)]
+        )
+        first, offset = unpackMany(data)
+        second, end = unpackMany(data, offset)
+        assert [e.floor for e in first] == [1]
+        assert [e.floor for e in second] == [2, 3]
+        assert end == len(data)
+
+    def testIncomplete(self):
+        "A frame that has not all arrived must not be unpacked."
+        data = packMany([Event(STOP_PRESSED, 1), Event(STOP_PRESSED, 2)])
+        for size in 0, 2, len(data) - 1:
+            assert unpackMany(data[:size]) == (None, 0)
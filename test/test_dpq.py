@@ -0,0 +1,150 @@
+from elevator.clock import SimulatedClock
+from elevator.constants import ARRIVE, CLOSE, END, OPEN
+from elevator.dpq import DelayPriorityQueue
+from elevator.event import Event
+
+
+def makeQueue():
+    return DelayPriorityQueue(SimulatedClock())
+
+
+class TestOrder:
+    def testByTime(self):
+        q = makeQueue()
+        q.put(Event(CLOSE, 1, delay=10))
+        q.put(Event(OPEN, 1))
+        assert q.get().what == OPEN
+        assert q.get().what == CLOSE
+        assert q.get() is None
+
+    def testEndIsLast(self):
+        q = makeQueue()
+        q.put(Event(END, None))
+        q.put(Event(ARRIVE, 1, delay=100))
+        assert q.get().what == ARRIVE
+        assert q.get().what == END
+
+    def testGivenOrder(self):
+        "An event put with a low order must come first among equals."
+        q = makeQueue()
+        q.put(Event(CLOSE, 1))
+        q.put(Event(OPEN, 1), order=-1)
+        assert q.get().what == OPEN
+        assert q.get().what == CLOSE
+
+
+class TestSerial:
+    def testReplayed(self):
+        "An event put with a serial number must be given a new one."
+        q = makeQueue()
+        first = q.put(Event(OPEN, 1)).event
+        replayed = q.put(Event(CLOSE, 1, queuedAt=0.0, serial=first.serial)).event
+        assert (first.serial, replayed.serial) == (0, 1)
+
+    def testRequeue(self):
+        "A requeued event must keep its serial number and order."
+        q = makeQueue()
+        q.put(Event(CLOSE, 1))
+        q.requeue(Event(OPEN, 1, queuedAt=0.0, serial=7), -1)
+        event = q.get()
+        assert (event.what, event.serial) == (OPEN, 7)
+
+
+class TestHasArriveEvent:
+    def testNone(self):
+        q = makeQueue()
+        q.put(Event(OPEN, 1))
+        assert q.hasArriveEvent() is None
+
+    def testFound(self):
+        q = makeQueue()
+        q.put(Event(OPEN, 1))
+        event = Event(ARRIVE, 2, delay=2)
+        q.put(event)
+        assert q.hasArriveEvent() is event
+
+    def testGoneWhenHandled(self):
+        q = makeQueue()
+        q.put(Event(ARRIVE, 2))
+        q.get()
+        assert q.hasArriveEvent() is None
+
+
+class TestFind:
+    def testByFloor(self):
+        q = makeQueue()
+        close1 = q.put(Event(CLOSE, 1, delay=10))
+        close2 = q.put(Event(CLOSE, 2, delay=10))
+        assert q.find(CLOSE, 1) == [close1]
+        assert q.find(CLOSE) == [close1, close2]
+        assert q.find(OPEN) == []
+
+
+class TestCancel:
+    def testCancel(self):
+        q = makeQueue()
+        element = q.put(Event(CLOSE, 1, delay=10))
+        q.put(Event(ARRIVE, 2, delay=20))
+        assert q.cancel(element)
+        assert len(q) == 1
+        assert q.find(CLOSE) == []
+        assert q.get().what == ARRIVE
+        assert q.get() is None
+
+    def testCancelTwice(self):
+        q = makeQueue()
+        element = q.put(Event(CLOSE, 1))
+        assert q.cancel(element)
+        assert not q.cancel(element)
+        assert len(q) == 0
+
+    def testCancelHandled(self):
+        q = makeQueue()
+        element = q.put(Event(CLOSE, 1))
+        q.get()
+        assert not q.cancel(element)
+
+    def testPeekSkipsCancelled(self):
+        q = makeQueue()
+        element = q.put(Event(CLOSE, 1))
+        q.put(Event(ARRIVE, 2, delay=5))
+        q.cancel(element)
+        assert q.peek().what == ARRIVE
+
+
+class TestReschedule:
+    def testLater(self):
+        "A door close can be put off (e.g., to hold the doors open)."
+        q = makeQueue()
+        close = q.put(Event(CLOSE, 1, delay=10))
+        q.put(Event(ARRIVE, 2, delay=15))
+        close = q.reschedule(close, 20)
+        assert len(q) == 2
+        assert q.get().what == ARRIVE
+        event = q.get()
+        assert event.what == CLOSE
+        assert event.handledAt == 20
+        assert q.find(CLOSE) == []
+
+    def testNotPending(self):
+        q = makeQueue()
+        element = q.put(Event(CLOSE, 1))
+        q.get()
+        assert q.reschedule(element, 5) is None
+
+
+class TestNextTime:
+    def testEmpty(self):
+        assert makeQueue().nextTime() is None
+
+    def testNext(self):
+        q = makeQueue()
+        q.put(Event(CLOSE, 1, delay=10))
+        q.put(Event(ARRIVE, 2, delay=4))
+        assert q.nextTime() == 4
+
+    def testSkipsCancelled(self):
+        q = makeQueue()
+        q.cancel(q.put(Event(ARRIVE, 2, delay=4)))
+        q.put(Event(CLOSE, 1, delay=10))
+        assert q.nextTime() == 10
@@ -1,4 +1,4 @@
-from elevator.constants import CALL_PRESSED, UP
+from elevator.constants import ARRIVE, CALL_PRESSED, OPEN, UP
 from elevator.event import Event
 
 
@@ -9,3 +9,25 @@ def testFromJSONString():
     assert event.what == CALL_PRESSED
     assert event.floor == 0
     assert event.direction == UP
+
+
+def testNoDict():
+    "Events must not carry a per-instance dict."
+    assert not hasattr(Event(CALL_PRESSED, 0, direction=UP), "__dict__")
+
+
+def testCausedByEvent():
+    "Passing an event as the cause must store only its serial number."
+    cause = Event(ARRIVE, 1, serial=7)
+    assert Event(OPEN, 1, causedBy=cause).causedBy == 7
+
+
+def testCausedBySerial():
+    assert Event(OPEN, 1, causedBy=3).causedBy == 3
+
+
+def testJSONRoundTrip():
+    event = Event(OPEN, 1, delay=2.5, queuedAt=3.0, serial=4, causedBy=2)
+    event2 = Event.fromJSONString(event.toJSON())
+    assert event2.toJSON() == event.toJSON()
+    assert event2.causedBy == 2
@@ -0,0 +1,118 @@
+import random
+
+from elevator.constants import CALL_PRESSED, DOWN, STOP_PRESSED, UP
+from elevator.dispatch import (
+    EstimatedTimeOfArrival,
+    NearestCar,
+    Zoning,
+    estimateArrival,
+)
+from elevator.event import Event
+from elevator.group import runGroup
+
+
+class TestGroup:
+    def testOneCall(self):
+        "A single call must be answered by exactly one car."
+        g = runGroup([Event(CALL_PRESSED, 3, direction=UP)], cars=3)
+        assert sorted(car.state.floor for car in g.cars) == [0, 0, 3]
+        assert not g.callPressed(3, UP)
+        assert g.assigned == {}
+
+    def testTwoCalls(self):
+        "Two calls at once must be answered by different cars."
+        g = runGroup(
+            [
+                Event(CALL_PRESSED, 3, direction=UP),
+                Event(CALL_PRESSED, 4, direction=DOWN),
+            ],
+            cars=2,
+        )
+        assert sorted(car.state.floor for car in g.cars) == [3, 4]
+
+    def testStopInCar(self):
+        "A stop button press must go to the car it was made in."
+        g = runGroup([Event(STOP_PRESSED, 2, car=1)], cars=2)
+        assert [car.state.floor for car in g.cars] == [0, 2]
+
+    def testRepeatedCall(self):
+        "Pressing a pressed hall call button must not send another car."
+        g = runGroup(
+            [
+                Event(CALL_PRESSED, 3, direction=UP),
+                Event(CALL_PRESSED, 3, direction=UP),
+            ],
+            cars=2,
+        )
+        assert sorted(car.state.floor for car in g.cars) == [0, 3]
+
+    def testBank(self):
+        """
+        In an 8-car bank in a 60-floor tower, the hall call buttons of the
+        group must always be the union of the call buttons of its cars.
+        """
+        rng = random.Random(0)
+        events = []
+        when = 0.0
+        for _ in range(500):
+            when += rng.expovariate(1.0)
+            floor = rng.randrange(1, 60)
+            events.append(Event(CALL_PRESSED, floor, direction=DOWN, queuedAt=when))
+        g = runGroup(events, cars=8, floors=60)
+        for direction in UP, DOWN:
+            union = 0
+            for car in g.cars:
+                union |= car.state.masks[direction]
+            assert g.callMasks[direction] == union
+        # The calls were spread over the cars.
+        assert all(sum(car.stats.openCounts) for car in g.cars)
+
+
+class TestPolicies:
+    def testNearestCar(self):
+        events = [
+            Event(STOP_PRESSED, 8, car=1, queuedAt=0),
+            Event(CALL_PRESSED, 7, direction=DOWN, queuedAt=100),
+        ]
+        g = runGroup(events, cars=2, floors=10, policy=NearestCar())
+        # Car 1 was nearer, at floor 8.
+        assert [car.state.floor for car in g.cars] == [0, 7]
+
+    def testZoning(self):
+        g = runGroup(
+            [
+                Event(CALL_PRESSED, 1, direction=UP),
+                Event(CALL_PRESSED, 7, direction=UP),
+            ],
+            cars=2,
+            floors=10,
+            policy=Zoning(),
+        )
+        assert [car.state.floor for car in g.cars] == [1, 7]
+
+    def testExplicitZones(self):
+        g = runGroup(
+            [Event(CALL_PRESSED, 1, direction=UP)],
+            cars=2,
+            floors=10,
+            policy=Zoning([(5, 9), (0, 4)]),
+        )
+        assert [car.state.floor for car in g.cars] == [0, 1]
+
+    def testETAPrefersIdleCar(self):
+        "A call behind a moving car must go to an idle car."
+        events = [
+            Event(STOP_PRESSED, 9, car=0, queuedAt=0),
+            # Car 0 is on its way up when this call comes.
+            Event(CALL_PRESSED, 1, direction=UP, queuedAt=0),
+            Event(CALL_PRESSED, 2, direction=DOWN, queuedAt=7),
+        ]
+        g = runGroup(events, cars=2, floors=10, policy=EstimatedTimeOfArrival())
+        assert g.cars[0].stats.openCounts[9] == 1
+        assert g.cars[1].stats.openCounts[2] == 1
+
+
+class TestEstimateArrival:
+    def testIdle(self):
+        g = runGroup([], cars=1, floors=10, interFloorDelay=2)
+        assert estimateArrival(g.cars[0], 5) == 10
@@ -0,0 +1,162 @@
+import gc
+
+import pytest
+
+from elevator.constants import CALL_PRESSED, STOP_PRESSED, UP
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.handle.utils import writeTest
+from elevator.history import RingHistory, SpillHistory, historyMaker
+from elevator.scenario import loadScenarios
+
+
+def floors(history):
+    return [event.floor for event in history]
+
+
+class TestRingHistory:
+    def testKeepsMostRecent(self):
+        history = RingHistory(3)
+        for floor in range(5):
+            history.append(Event(STOP_PRESSED, floor))
+        assert floors(history) == [2, 3, 4]
+        assert history.appended == 5
+        assert history.dropped == 2
+
+    def testNothingDropped(self):
+        history = RingHistory(3)
+        history.append(Event(STOP_PRESSED, 0))
+        assert history.dropped == 0
+
+
+class TestSpillHistory:
+    def testOrder(self, tmp_path):
+        "Events must be iterated in order, from disk and from memory."
+        history = SpillHistory(segmentSize=3, directory=tmp_path)
+        for floor in range(8):
+            history.append(Event(STOP_PRESSED, floor))
+        assert len(history.segments) == 2
+        assert len(history) == 8
+        assert floors(history) == list(range(8))
+        assert history.dropped == 0
+
+    def testMaxSegments(self, tmp_path):
+        "The oldest segments must be removed."
+        history = SpillHistory(segmentSize=2, directory=tmp_path, maxSegments=2)
+        for floor in range(7):
+            history.append(Event(STOP_PRESSED, floor))
+        assert len(list(tmp_path.iterdir())) == 2
+        assert history.dropped == 2
+        assert len(history) == 5
+        assert floors(history) == [2, 3, 4, 5, 6]
+
+    def testCloseKeepsFiles(self, tmp_path):
+        "Files in a directory that was given must be kept."
+        history = SpillHistory(segmentSize=2, directory=tmp_path)
+        for floor in range(5):
+            history.append(Event(STOP_PRESSED, floor))
+        history.close()
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def testSameDirectory(self, tmp_path):
+        "A new history must not overwrite the files of an earlier one."
+        for _ in range(2):
+            history = SpillHistory(segmentSize=2, directory=tmp_path)
+            for floor in range(5):
+                history.append(Event(STOP_PRESSED, floor))
+            assert floors(history) == list(range(5))
+            history.close()
+        assert len(list(tmp_path.iterdir())) == 4
+
+    def testCloseTemporary(self):
+        "A temporary directory must be removed by close."
+        history = SpillHistory(segmentSize=2)
+        for floor in range(5):
+            history.append(Event(STOP_PRESSED, floor))
+        directory = history.directory
+        assert directory.exists()
+        history.close()
+        assert not directory.exists()
+
+    def testTemporaryRemovedAfterRun(self):
+        "A temporary directory must be removed once the history is unused."
+        elevator = runElevator(
+            TestElevatorHistory.events,
+            floors=5,
+            makeHistory=lambda: SpillHistory(segmentSize=2),
+        )
+        directory = elevator.history.directory
+        assert len(list(directory.iterdir())) > 0
+        del elevator
+        gc.collect()
+        assert not directory.exists()
+
+
+class TestHistoryMaker:
+    def testAll(self):
+        assert historyMaker("all")() == []
+
+    def testRing(self):
+        history = historyMaker("ring:10")()
+        assert isinstance(history, RingHistory)
+        assert history.maxlen == 10
+
+    def testSpill(self):
+        history = historyMaker("spill:5")()
+        assert isinstance(history, SpillHistory)
+        assert history.segmentSize == 5
+        assert history.maxSegments is None
+        history.close()
+
+    def testSpillMaxSegments(self, tmp_path):
+        history = historyMaker(f"spill:5:3:{tmp_path}")()
+        assert history.segmentSize == 5
+        assert history.maxSegments == 3
+        assert history.directory == tmp_path
+
+    def testSpillDirectory(self, tmp_path):
+        history = historyMaker(f"spill:5::{tmp_path}")()
+        assert history.maxSegments is None
+        assert history.directory == tmp_path
+
+    @pytest.mark.parametrize("spec", ["", "ring", "ring:", "some", "all:3"])
+    def testUnknown(self, spec):
+        with pytest.raises(ValueError, match="Unknown history specification"):
+            historyMaker(spec)
+
+
+class TestElevatorHistory:
+    events = [
+        Event(CALL_PRESSED, 3, direction=UP),
+        Event(STOP_PRESSED, 1),
+        Event(STOP_PRESSED, 4),
+    ]
+
+    def testSameRun(self, tmp_path):
+        "A bounded history must not change what the elevator does."
+        full = runElevator(self.events, floors=5)
+        spilled = runElevator(
+            self.events,
+            floors=5,
+            makeHistory=lambda: SpillHistory(segmentSize=4, directory=tmp_path),
+        )
+        assert [(e.what, e.floor, e.handledAt) for e in spilled.history] == [
+            (e.what, e.floor, e.handledAt) for e in full.history
+        ]
+        assert spilled.stats.toJSON() == full.stats.toJSON()
+
+    def testRing(self):
+        elevator = runElevator(
+            self.events, floors=5, makeHistory=lambda: RingHistory(4)
+        )
+        assert len(elevator.history) == 4
+        assert elevator.history.dropped > 0
+
+    def testWriteTest(self, tmp_path):
+        "A test written from a ring history must say events were dropped."
+        elevator = runElevator(
+            self.events, floors=5, makeHistory=lambda: RingHistory(4)
+        )
+        testFile = writeTest(elevator, tmp_path)
+        (scenario,) = loadScenarios(testFile)
+        assert scenario.dropped == elevator.history.dropped
@@ -0,0 +1,58 @@
+import io
+import logging
+
+from elevator.constants import CALL_PRESSED, STOP_PRESSED, UP
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.log import JSONLinesTrace, logger, setupLogging
+
+
+class TestLogging:
+    def teardown_method(self):
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+
+    def testQuietByDefault(self, capsys):
+        "Running an elevator must print nothing unless asked to."
+        runElevator([Event(CALL_PRESSED, 2, direction=UP)])
+        captured = capsys.readouterr()
+        assert captured.err == ""
+        assert captured.out == ""
+
+    def testDebug(self):
+        "At the DEBUG level every event taken from the queue must be logged."
+        fp = io.StringIO()
+        setupLogging("DEBUG", fp)
+        e = runElevator([Event(CALL_PRESSED, 2, direction=UP)])
+        lines = [line for line in fp.getvalue().split("\n") if "QUEUE --->" in line]
+        assert len(lines) == len(e.history)
+
+    def testInfo(self):
+        "At the INFO level queue events must not be logged."
+        fp = io.StringIO()
+        setupLogging("INFO", fp)
+        runElevator([Event(CALL_PRESSED, 2, direction=UP)])
+        assert "QUEUE" not in fp.getvalue()
+
+    def testQuietCostsNothing(self, monkeypatch):
+        "Below the DEBUG level, the logger's debug method must not be called."
+        calls = []
+        monkeypatch.setattr(logger, "debug", lambda *args: calls.append(args))
+        setupLogging("INFO", io.StringIO())
+        runElevator([Event(STOP_PRESSED, 2)])
+        assert calls == []
+
+
+class TestJSONLinesTrace:
+    def testTrace(self, tmp_path):
+        "All handled events must be written to the trace."
+        filename = tmp_path / "trace.jsonl"
+        with JSONLinesTrace(filename) as trace:
+            e = runElevator([Event(CALL_PRESSED, 2, direction=UP)], trace=trace)
+        with open(filename) as fp:
+            events = [Event.fromJSONString(line) for line in fp]
+        assert [event.toJSON() for event in events] == [
+            event.toJSON() for event in e.history
+        ]
@@ -0,0 +1,116 @@
+import pytest
+
+from elevator.constants import (
+    OPEN,
+    addEventType,
+    describe,
+    eventTypes,
+    removeEventType,
+)
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.logic import registerHandler
+from elevator.stats import LatencyStats, Stats
+
+
+def handle_PING(event, elevator):
+    return [Event(OPEN, elevator.state.floor, causedBy=event)]
+
+
+@pytest.fixture
+def eventType():
+    """
+    Add custom event types (with a function taking a name and an optional
+    handler), removing them again after the test so no other test sees
+    them.
+    """
+    added = []
+
+    def add(name, handler=None):
+        what = addEventType(name)
+        added.append(what)
+        if handler is not None:
+            registerHandler(what, handler)
+        return what
+
+    yield add
+
+    for what in added:
+        registerHandler(what, None)
+        removeEventType(what)
+
+
+@pytest.fixture
+def ping(eventType):
+    "A custom event type, for testing handler registration."
+    return eventType("PING", handle_PING)
+
+
+class TestEventTypes:
+    def testDescribe(self, ping):
+        assert describe(ping) == "PING"
+
+    def testDuplicate(self, ping):
+        with pytest.raises(ValueError, match="already exists"):
+            addEventType("PING")
+
+    def testRemove(self):
+        "A removed event type must be able to be added again."
+        what = addEventType("TEMPORARY")
+        removeEventType(what)
+        assert "TEMPORARY" not in dict(eventTypes()).values()
+        assert addEventType("TEMPORARY") == what
+        removeEventType(what)
+
+    def testRemoveBuiltIn(self):
+        with pytest.raises(ValueError, match="was not added"):
+            removeEventType(OPEN)
+
+
+class TestDispatch:
+    def testCustomHandler(self, ping):
+        "A registered handler must be called for its event type."
+        e = runElevator([Event(ping, None)])
+        assert [event.what for event in e.history][:2] == [ping, OPEN]
+        assert not e.state.closed
+
+    def testUnknownType(self, eventType):
+        "An event type with no handler must produce no response events."
+        e = runElevator([Event(eventType("UNHANDLED"), 0)])
+        assert len(e.history) == 2
+
+
+class TestStatsDispatch:
+    def testSubclassHandler(self, ping):
+        "A Stats subclass handler for a custom event type must be called."
+
+        class PingStats(Stats):
+            def __init__(self, floors):
+                super().__init__(floors)
+                self.pings = 0
+
+            def handle_PING(self, event):
+                self.pings += 1
+
+        stats = PingStats(5)
+        stats.handleEvent(Event(ping, 1))
+        assert stats.pings == 1
+
+    def testBaseIgnoresUnknown(self, ping):
+        "The base Stats class must not fail on an event type it can't count."
+        stats = Stats(5)
+        stats.handleEvent(Event(ping, 1))
+        assert stats.arriveCounts == [0] * 5
+
+    def testRegisterInherited(self, ping):
+        "A handler registered on Stats must be used by its subclasses too."
+        pings = []
+        Stats.registerHandler(ping, lambda stats, event: pings.append(stats))
+        try:
+            stats = LatencyStats(5)
+            stats.handleEvent(Event(ping, 1))
+            assert pings == [stats]
+        finally:
+            Stats.registerHandler(ping, None)
+        stats.handleEvent(Event(ping, 1))
+        assert len(pings) == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from elevator.batch import randomTrace
+from elevator.elevator import runElevator
+from elevator.handle.utils import writeTest
+from elevator.minimize import ddmin, describeFailure, failure, minimize
+from elevator.scenario import SUFFIX, Scenario
+
+# A random trace that runs without error, and one that fails.
+FLOORS, COUNT, SEED = 5, 40, 34
+FAILING_SEED = 5
+
+
+def shrink(count, fails):
+    # Run ddmin with a function saying whether some indices fail.
+    return ddmin(count, lambda candidates: (fails(c) for c in candidates))
+
+
+class TestDdmin:
+    def testSingle(self):
+        "A single index that causes the failure must be found."
+        assert shrink(40, lambda indices: 13 in indices) == [13]
+
+    def testPair(self):
+        "Indices that only fail together must both be kept."
+        assert shrink(40, lambda indices: {3, 31} <= set(indices)) == [3, 31]
+
+    def testOrder(self):
+        "The indices kept must be in their original order."
+        result = shrink(40, lambda indices: len({2, 9, 17, 38} & set(indices)) >= 3)
+        assert len(result) == 3
+        assert result == sorted(result)
+
+    def testOne(self):
+        assert len(shrink(1, lambda indices: True)) == 1
+
+
+class TestMinimize:
+    def testNoFailure(self):
+        assert failure(randomTrace(FLOORS, COUNT, SEED), FLOORS) is None
+        with pytest.raises(ValueError, match="do not make the elevator raise"):
+            minimize(randomTrace(FLOORS, COUNT, SEED), FLOORS, workers=1)
+
+    def testSameFailure(self):
+        "The minimal events must fail in the same way, and fewer must not."
+        events = randomTrace(FLOORS, COUNT, FAILING_SEED)
+        wanted = failure(events, FLOORS)
+        minimal, found = minimize(events, FLOORS, workers=1)
+        assert found == wanted
+        assert describeFailure(found).startswith("AssertionError at ")
+        assert len(minimal) < len(events)
+        assert failure(minimal, FLOORS) == wanted
+        for index in range(len(minimal)):
+            assert failure(minimal[:index] + minimal[index + 1 :], FLOORS) != wanted
+
+    def testParallel(self):
+        "Replaying in worker processes must give the same events."
+        events = randomTrace(FLOORS, COUNT, FAILING_SEED)
+        serial, _ = minimize(events, FLOORS, workers=1)
+        parallel, _ = minimize(events, FLOORS, workers=2)
+        assert [e.queuedAt for e in parallel] == [e.queuedAt for e in serial]
+
+    def testWriteTestAfterMinimize(self, tmp_path):
+        "A minimized scenario beside written tests must not stop more being written."
+        events = randomTrace(FLOORS, COUNT, SEED)
+        elevator = runElevator(events, floors=FLOORS)
+        first = writeTest(elevator, tmp_path)
+        # As named by minimize-test.py.
+        minimal = Scenario(events[:1], {}, FLOORS, 10, 2, error="AssertionError")
+        minimal.save(first.with_name(f"{first.stem}-minimal{SUFFIX}"))
+        second = writeTest(elevator, tmp_path)
+        assert second.name.endswith(f"-002{SUFFIX}")
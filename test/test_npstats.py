@@ -0,0 +1,109 @@
+import pytest
+
+from elevator.batch import randomTrace
+from elevator.constants import CALL_PRESSED, DOWN, STOP_PRESSED, UP
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.handle.utils import writeTest
+from elevator.scenario import loadScenarios, observe
+
+np = pytest.importorskip("numpy")
+
+from elevator.npstats import NAMES, ArrayStats, eventArrays  # noqa: E402
+
+
+def run(seed=0, floors=5):
+    "Run a short random trace, returning the elevator (or None if it fails)."
+    try:
+        return runElevator(
+            randomTrace(floors, 10, seed), floors=floors, writeTestOnError=False
+        )
+    except AssertionError:
+        return None
+
+
+def sameCounts(arrayStats, stats):
+    return all(
+        np.array_equal(getattr(arrayStats, name), getattr(stats, name))
+        for name in NAMES
+    )
+
+
+class TestArrayStats:
+    def testShapes(self):
+        stats = ArrayStats(7)
+        assert stats.openCounts.shape == (7,)
+        assert stats.callButtonCounts.shape == (7, 2)
+
+    def testEventArrays(self):
+        what, floor, direction = eventArrays(
+            [Event(CALL_PRESSED, 3, direction=DOWN), Event(STOP_PRESSED, 1)]
+        )
+        assert what.tolist() == [CALL_PRESSED, STOP_PRESSED]
+        assert floor.tolist() == [3, 1]
+        assert direction.tolist() == [DOWN, -1]
+
+    def testAsStatsClass(self):
+        "An elevator must be able to count with ArrayStats."
+        events = [Event(CALL_PRESSED, 3, direction=UP)]
+        e = runElevator(events, statsClass=ArrayStats)
+        assert e.stats.openCounts.tolist() == [0, 0, 0, 1, 0]
+        assert e.stats.callButtonCounts[3].tolist() == [1, 0]
+
+    def testHandleEventsMatchesStats(self):
+        "Bulk counting a history must match the Stats of the run."
+        for seed in range(20):
+            e = run(seed)
+            if e is not None:
+                stats = ArrayStats(e.floors)
+                stats.handleEvents(e.history)
+                assert sameCounts(stats, e.stats)
+
+    def testRepeatedIndices(self):
+        "Events for the same floor in one batch must all be counted."
+        stats = ArrayStats(5)
+        stats.handleEvents([Event(STOP_PRESSED, 2)] * 3)
+        assert stats.stopButtonCounts.tolist() == [0, 0, 3, 0, 0]
+
+    def testFromStats(self):
+        e = runElevator([Event(STOP_PRESSED, 2)])
+        assert sameCounts(ArrayStats.fromStats(e.stats), e.stats)
+
+    def testAggregate(self):
+        "Aggregating runs must give the same counts as merging them."
+        runs = [ArrayStats.fromStats(e.stats) for e in map(run, range(30)) if e]
+        assert runs
+        merged = ArrayStats(5)
+        for stats in runs:
+            merged.merge(stats)
+        total = ArrayStats.aggregate(runs)
+        for name in NAMES:
+            assert np.array_equal(getattr(total, name), getattr(merged, name))
+
+    def testStructured(self):
+        e = runElevator([Event(CALL_PRESSED, 3, direction=DOWN)])
+        stats = ArrayStats.fromStats(e.stats)
+        array = stats.toStructured()
+        assert array.shape == (5,)
+        assert array["callButtonCounts"][3].tolist() == [0, 1]
+        assert sameCounts(ArrayStats.fromStructured(array), e.stats)
+
+    def testSaveLoad(self, tmp_path):
+        e = runElevator([Event(STOP_PRESSED, 4)])
+        filename = tmp_path / "stats.npz"
+        ArrayStats.fromStats(e.stats).save(filename)
+        assert sameCounts(ArrayStats.load(filename), e.stats)
+
+    def testWriteTest(self, tmp_path):
+        "A test scenario must be written from an elevator using ArrayStats."
+        e = runElevator(randomTrace(5, 40, 34), floors=5, statsClass=ArrayStats)
+        (scenario,) = loadScenarios(writeTest(e, tmp_path))
+        plain = runElevator(randomTrace(5, 40, 34), floors=5)
+        assert scenario.expected == observe(plain)
+
+    def testWriteTestOnError(self, tmp_path, monkeypatch):
+        "The error must be raised, and a scenario written, using ArrayStats."
+        monkeypatch.setattr("elevator.elevator.mkdtemp", lambda: tmp_path)
+        with pytest.raises(AssertionError):
+            runElevator(randomTrace(5, 40, 0), floors=5, statsClass=ArrayStats)
+        assert len(list(loadScenarios(tmp_path))) == 1
@@ -0,0 +1,80 @@
+from elevator.constants import CALL_PRESSED, CLEAR_CALL, CLOSE, DOWN, STOP_PRESSED, UP
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import Elevator, runElevator
+from elevator.event import Event
+from elevator.policy import EarliestPress, LeastWait, sweepCost
+
+
+def closedAt(floor, calls):
+    """
+    Make an elevator whose doors have just closed on a floor, with some
+    call buttons pressed, and a CLOSE event for it.
+    """
+    elevator = Elevator(DelayPriorityQueue(), floors=10)
+    elevator.state.floor = floor
+    for when, (callFloor, direction) in enumerate(calls):
+        elevator.state.pressCall(callFloor, direction, when)
+    return elevator, Event(CLOSE, floor)
+
+
+class TestSweepCost:
+    def testNothingPressed(self):
+        assert sweepCost(3, UP, 0, 0, 0, 2, 5) == 0
+
+    def testOneStop(self):
+        assert sweepCost(3, UP, 1 << 6, 0, 0, 2, 5) == 6
+
+    def testTurn(self):
+        "A stop behind the elevator is reached after the last one ahead."
+        # Up to 6 (6 seconds), stop there (5), down to 1 (10).
+        assert sweepCost(3, UP, 1 << 6 | 1 << 1, 0, 0, 2, 5) == 6 + 21
+
+    def testCallInOtherDirection(self):
+        "A call for the other direction is not answered on the way past."
+        # Up past 5 to 6 (6 seconds), stop (5), back down to 5 (2).
+        assert sweepCost(3, UP, 1 << 6, 0, 1 << 5, 2, 5) == 6 + 13
+
+    def testCallAtTurn(self):
+        "A call for the other direction is answered where the elevator turns."
+        assert sweepCost(3, UP, 0, 0, 1 << 6, 2, 5) == 6
+
+
+class TestEarliestPress:
+    def testDefault(self):
+        "Elevators must use the EarliestPress policy by default."
+        elevator = Elevator(DelayPriorityQueue())
+        assert isinstance(elevator.policy, EarliestPress)
+
+    def testEarliestCall(self):
+        elevator, event = closedAt(5, [(1, DOWN), (8, DOWN)])
+        assert EarliestPress().afterClose(event, elevator) == (1, DOWN)
+
+
+class TestLeastWait:
+    def testPrefersBusierDirection(self):
+        "Three calls above must be answered before an earlier one below."
+        elevator, event = closedAt(5, [(1, DOWN), (6, DOWN), (7, DOWN), (8, DOWN)])
+        assert LeastWait().afterClose(event, elevator) == (8, UP)
+
+    def testTieUsesFallback(self):
+        "When both directions cost the same, the earliest press must win."
+        elevator, event = closedAt(5, [(3, DOWN), (7, DOWN)])
+        assert LeastWait().afterClose(event, elevator) == (3, DOWN)
+
+    def testOneDirection(self):
+        elevator, event = closedAt(5, [(1, DOWN), (2, UP)])
+        assert LeastWait().afterClose(event, elevator) == (1, DOWN)
+
+    def testRun(self):
+        "All calls must be answered, starting with those above."
+        events = [
+            Event(STOP_PRESSED, 5, queuedAt=0),
+            Event(CALL_PRESSED, 1, direction=DOWN, queuedAt=1),
+            Event(CALL_PRESSED, 6, direction=DOWN, queuedAt=2),
+            Event(CALL_PRESSED, 7, direction=DOWN, queuedAt=2),
+            Event(CALL_PRESSED, 8, direction=DOWN, queuedAt=2),
+        ]
+        e = runElevator(events, floors=10, policy=LeastWait())
+        cleared = [event.floor for event in e.history if event.what == CLEAR_CALL]
+        assert cleared == [8, 7, 6, 1]
+        assert e.state.floor == 1
@@ -0,0 +1,90 @@
+import json
+from collections import Counter
+from io import StringIO
+
+from elevator.batch import randomTrace
+from elevator.constants import RESET, STOP_PRESSED, describe
+from elevator.dpq import DelayPriorityQueue
+from elevator.elevator import Elevator, runElevator
+from elevator.event import Event
+from elevator.profiler import Profiler
+
+# A random trace that runs without error.
+FLOORS, COUNT, SEED = 5, 40, 34
+
+
+def trace():
+    return randomTrace(FLOORS, COUNT, SEED)
+
+
+class TestProfiler:
+    def testCounts(self):
+        "Every handled event must be counted, by type."
+        profiler = Profiler()
+        e = runElevator(trace(), floors=FLOORS, profiler=profiler)
+        counts = Counter(describe(event.what) for event in e.history)
+        report = profiler.report()
+        assert {name: h["calls"] for name, h in report["handlers"].items()} == counts
+        assert report["events"]["calls"] == len(e.history)
+        assert report["stats"]["calls"] == len(e.history)
+        assert report["queueGet"]["calls"] == len(e.history)
+
+    def testResponses(self):
+        "The response events made by handlers must be counted."
+        profiler = Profiler()
+        e = runElevator(trace(), floors=FLOORS, profiler=profiler)
+        responses = sum(event.causedBy is not None for event in e.history)
+        handlers = profiler.report()["handlers"].values()
+        assert sum(h["responses"] for h in handlers) == responses
+        assert profiler.puts.calls == responses
+
+    def testSameResult(self):
+        "Profiling must not change what the elevator does."
+        profiled = runElevator(trace(), floors=FLOORS, profiler=Profiler())
+        plain = runElevator(trace(), floors=FLOORS)
+        assert profiled.stats.toJSON() == plain.stats.toJSON()
+
+    def testQueueDepth(self):
+        profiler = Profiler(sampleEvery=10)
+        e = runElevator(trace(), floors=FLOORS, profiler=profiler)
+        depth = profiler.report()["queueDepth"]
+        assert depth["count"] == len(e.history)
+        assert depth["maximum"] >= depth["p95"] > 0
+        assert len(profiler.depthSamples) == len(e.history) // 10
+
+    def testDetach(self):
+        "Detaching must restore the original methods."
+        queue = DelayPriorityQueue()
+        elevator = Elevator(queue)
+        profiler = Profiler().attach(elevator)
+        profiler.detach()
+        for owner in elevator, elevator.logic, elevator.stats, queue:
+            assert not {"handleEvent", "reset", "get", "put"} & set(vars(owner))
+
+    def testReset(self):
+        "Stats made by a reset must be timed too."
+        profiler = Profiler()
+        runElevator(
+            [Event(RESET, None), Event(STOP_PRESSED, 0)],
+            profiler=profiler,
+        )
+        assert profiler.stats.calls == profiler.events.calls == 6
+
+    def testReport(self):
+        "The report must be convertible to JSON and formattable."
+        profiler = Profiler()
+        runElevator(trace(), floors=FLOORS, profiler=profiler)
+        json.dumps(profiler.report())
+        fp = StringIO()
+        profiler.dump(fp)
+        lines = fp.getvalue().splitlines()
+        assert lines[0].split() == [
+            "(µs)",
+            "calls",
+            "total",
+            "mean",
+            "max",
+            "responses",
+        ]
+        assert any(line.startswith("ARRIVE ") for line in lines)
+        assert lines[-1].startswith("Queue depth: ")
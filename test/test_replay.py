@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from elevator.batch import randomTrace
+from elevator.constants import STOP_PRESSED
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.handle.utils import writeTest
+from elevator.replay import checkScenario, checkScenarios, runScenario
+from elevator.scenario import Scenario, loadScenarios, observe
+
+# A random trace that runs without error.
+FLOORS, COUNT, SEED = 5, 40, 34
+
+
+def scenario(name=None):
+    elevator = runElevator(randomTrace(FLOORS, COUNT, SEED), floors=FLOORS)
+    return Scenario.fromElevator(elevator, name=name)
+
+
+class TestScenario:
+    def testInputEvents(self):
+        "Only the button presses must be kept."
+        assert len(scenario().events) == COUNT
+
+    def testRoundTrip(self):
+        original = scenario()
+        data = json.loads(json.dumps(original.toJSON()))
+        assert Scenario.fromJSON(data).toJSON() == original.toJSON()
+
+    def testReproduces(self):
+        "Running a scenario must give what was observed when it was made."
+        original = scenario()
+        assert observe(runScenario(original)) == original.expected
+
+    def testUniqueSerials(self):
+        "The events of a replayed scenario must have unique serial numbers."
+        (recorded,) = loadScenarios(
+            Path(__file__).parent / "scenarios" / "scenario_20230416-006.json"
+        )
+        serials = [event.serial for event in runScenario(recorded).history]
+        assert len(set(serials)) == len(serials)
+
+    def testError(self):
+        "The error a scenario was made for must be kept."
+        original = Scenario([Event(STOP_PRESSED, 1)], {}, 5, 0.5, 0.5, error="Oops")
+        assert Scenario.fromJSON(original.toJSON()).error == "Oops"
+        assert "error" not in scenario().toJSON()
+
+    def testLoad(self, tmp_path):
+        "Scenarios must be loaded from .json and .jsonl files, in name order."
+        original = scenario()
+        original.save(tmp_path / "b.json")
+        (tmp_path / "sub").mkdir()
+        line = json.dumps(original.toJSON())
+        (tmp_path / "sub" / "a.jsonl").write_text(f"{line}\n\n{line}\n")
+        (tmp_path / "notes.txt").write_text("ignored")
+        loaded = list(loadScenarios(tmp_path))
+        assert [s.name for s in loaded] == ["b.json", "sub/a.jsonl:1", "sub/a.jsonl:3"]
+        assert all(s.toJSON() == original.toJSON() for s in loaded)
+
+    def testWriteTest(self, tmp_path):
+        "Tests written on the same day must be numbered in turn."
+        elevator = runElevator(randomTrace(FLOORS, COUNT, SEED), floors=FLOORS)
+        first = writeTest(elevator, tmp_path)
+        second = writeTest(elevator, tmp_path)
+        assert first.name.endswith("-001.json")
+        assert second.name.endswith("-002.json")
+        (loaded,) = loadScenarios(second)
+        assert checkScenario(loaded) == []
+
+
+class TestCheck:
+    def testMismatch(self):
+        "Differences from what was expected must be described."
+        changed = scenario()
+        changed.expected["floor"] += 1
+        changed.expected["arriveCounts"][0] += 1
+        problems = checkScenario(changed)
+        assert len(problems) == 2
+        assert problems[0].startswith("floor: expected ")
+        assert problems[1].startswith("arriveCounts: expected ")
+
+    def testError(self):
+        "An exception must be reported, not raised."
+        bad = Scenario([Event(STOP_PRESSED, 7)], {}, 5, 0.5, 0.5)
+        (problem,) = checkScenario(bad)
+        assert problem.startswith("Raised IndexError at ")
+
+    def testParallel(self):
+        "Checking in worker processes must give the same results."
+        scenarios = [scenario(name=str(i)) for i in range(4)]
+        scenarios[2].expected["closed"] = not scenarios[2].expected["closed"]
+        serial = checkScenarios(scenarios, workers=1)
+        assert checkScenarios(scenarios, workers=2) == serial
+        assert [name for name, problems in serial.items() if problems] == ["2"]
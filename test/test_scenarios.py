@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+
+from elevator.replay import checkScenarios
+from elevator.scenario import loadScenarios
+
+# Run every regression test scenario (see elevator/scenario.py) in the
+# scenarios directory. They are all checked at once (in parallel worker
+# processes, if there are many) and then each is reported as a test.
+
+SCENARIOS = list(loadScenarios(Path(__file__).parent / "scenarios"))
+
+
+@pytest.fixture(scope="module")
+def problems():
+    return checkScenarios(SCENARIOS)
+
+
+@pytest.mark.parametrize("name", [scenario.name for scenario in SCENARIOS])
+def testScenario(name, problems):
+    assert problems[name] == []
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from elevator.sketch import Histogram
+from elevator.stats import percentile
+
+
+class TestHistogram:
+    def testEmpty(self):
+        h = Histogram()
+        assert len(h) == 0
+        assert h.mean() is None
+        assert h.percentile(50) is None
+        assert h.summary() == {"count": 0}
+
+    def testOneValue(self):
+        h = Histogram()
+        h.add(7.0)
+        assert h.percentile(0) == h.percentile(100) == 7.0
+
+    def testZeros(self):
+        h = Histogram()
+        h.add(0, count=3)
+        h.add(10)
+        assert len(h) == 4
+        assert h.percentile(50) == 0
+        assert h.percentile(100) == 10
+
+    def testAccuracy(self):
+        "Percentiles must be within the relative accuracy of exact ones."
+        rng = random.Random(0)
+        values = [rng.expovariate(0.1) for _ in range(10000)]
+        h = Histogram(relativeAccuracy=0.01)
+        for value in values:
+            h.add(value)
+        values.sort()
+        for p in 1, 50, 90, 95, 99:
+            exact = percentile(values, p)
+            assert abs(h.percentile(p) - exact) <= 0.02 * exact
+        assert h.mean() == pytest.approx(sum(values) / len(values))
+
+    def testBoundedMemory(self):
+        "The number of buckets must not grow with the number of values."
+        h = Histogram()
+        for i in range(100000):
+            h.add(1 + i % 100)
+        assert len(h.buckets) < 250
+
+    def testMerge(self):
+        "Merging histograms must be the same as adding all the values to one."
+        rng = random.Random(1)
+        values = [rng.uniform(0, 100) for _ in range(1000)]
+        whole = Histogram()
+        first = Histogram()
+        second = Histogram()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (first if i % 2 else second).add(value)
+        assert first.merge(second) is first
+        assert first.buckets == whole.buckets
+        assert first.summary() == pytest.approx(whole.summary())
+
+    def testMergeEmpty(self):
+        h = Histogram()
+        h.add(3)
+        h.merge(Histogram())
+        assert (h.minimum, h.maximum, len(h)) == (3, 3, 1)
+
+    def testMergeAccuracyMismatch(self):
+        error = "^Cannot merge histograms with different accuracies"
+        with pytest.raises(ValueError, match=error):
+            Histogram(0.01).merge(Histogram(0.02))
+
+    def testJSON(self):
+        h = Histogram()
+        for value in 0, 1, 2.5, 100:
+            h.add(value)
+        copy = Histogram.fromJSON(h.toJSON())
+        assert copy.buckets == h.buckets
+        assert copy.summary() == h.summary()
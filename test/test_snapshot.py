@@ -0,0 +1,134 @@
+import json
+import pickle
+
+import pytest
+
+from elevator.batch import randomTrace
+from elevator.clock import SimulatedClock
+from elevator.constants import END
+from elevator.elevator import Elevator, queueEvents, runElevator
+from elevator.snapshot import Snapshot
+from elevator.state import State
+from elevator.stats import LatencyStats
+
+# A random trace that runs without error.
+FLOORS, COUNT, SEED = 5, 40, 34
+
+
+def startElevator(statsClass=None):
+    clock = SimulatedClock()
+    queue = queueEvents(randomTrace(FLOORS, COUNT, SEED), clock)
+    kwargs = {} if statsClass is None else {"statsClass": statsClass}
+    return Elevator(queue, floors=FLOORS, **kwargs)
+
+
+def handle(elevator, count):
+    "Handle up to count events, or all of them if count is None."
+    handled = []
+    while count is None or len(handled) < count:
+        event = elevator.handleEvent(respectTime=False)
+        if event:
+            handled.append(event)
+            if event.what == END:
+                break
+    return handled
+
+
+def summary(events):
+    return [
+        (e.what, e.floor, e.direction, e.queuedAt, e.handledAt, e.serial)
+        for e in events
+    ]
+
+
+class TestSnapshot:
+    def testResume(self):
+        "An elevator made from a snapshot must carry on exactly as the original."
+        elevator = startElevator()
+        handle(elevator, 60)
+        snapshot = Snapshot.fromElevator(elevator)
+        expected = handle(elevator, None)
+        resumed = snapshot.elevator()
+        assert summary(handle(resumed, None)) == summary(expected)
+        assert resumed.stats.toJSON() == elevator.stats.toJSON()
+        assert resumed.state.toJSON() == elevator.state.toJSON()
+
+    def testSameAsFullRun(self):
+        "Resuming from a snapshot must give the result of an uninterrupted run."
+        full = runElevator(randomTrace(FLOORS, COUNT, SEED), floors=FLOORS)
+        elevator = startElevator()
+        handle(elevator, 100)
+        resumed = Snapshot.fromElevator(elevator).elevator()
+        handle(resumed, None)
+        assert resumed.stats.toJSON() == full.stats.toJSON()
+
+    def testIndependent(self):
+        "Elevators made from one snapshot must not affect each other."
+        elevator = startElevator()
+        handle(elevator, 30)
+        snapshot = Snapshot.fromElevator(elevator)
+        first = snapshot.elevator()
+        handle(first, None)
+        second = snapshot.elevator()
+        handle(second, None)
+        assert second.stats.toJSON() == first.stats.toJSON()
+        assert elevator.stats.arriveCounts != first.stats.arriveCounts
+
+    def testChangedDelay(self):
+        elevator = startElevator()
+        handle(elevator, 30)
+        resumed = Snapshot.fromElevator(elevator).elevator(openDoorDelay=1.0)
+        assert resumed.openDoorDelay == 1.0
+        assert resumed.interFloorDelay == elevator.interFloorDelay
+
+    @pytest.mark.parametrize("suffix", [".snapshot", ".json"])
+    def testSaveAndLoad(self, tmp_path, suffix):
+        "A snapshot must be restored from a file, in binary or JSON."
+        elevator = startElevator(LatencyStats)
+        handle(elevator, 80)
+        filename = tmp_path / f"checkpoint{suffix}"
+        Snapshot.fromElevator(elevator).save(filename)
+        expected = handle(elevator, None)
+        resumed = Snapshot.load(filename).elevator()
+        assert summary(handle(resumed, None)) == summary(expected)
+        assert isinstance(resumed.stats, LatencyStats)
+        assert resumed.stats.toJSON() == elevator.stats.toJSON()
+
+    def testNotASnapshot(self):
+        with pytest.raises(ValueError, match="does not hold an elevator snapshot"):
+            Snapshot.fromBytes(pickle.dumps(3))
+
+    def testCorrupt(self):
+        elevator = startElevator()
+        handle(elevator, 10)
+        data = Snapshot.fromElevator(elevator).toBytes()
+        with pytest.raises(ValueError, match="does not hold an elevator snapshot"):
+            Snapshot.fromBytes(data[:-10])
+
+    def testJSONUnsupportedStats(self):
+        npstats = pytest.importorskip("elevator.npstats")
+        elevator = startElevator(npstats.ArrayStats)
+        handle(elevator, 10)
+        snapshot = Snapshot.fromElevator(elevator)
+        with pytest.raises(ValueError, match="Cannot convert ArrayStats to JSON"):
+            snapshot.toJSON()
+        with pytest.raises(ValueError, match="Cannot convert ArrayStats to JSON"):
+            snapshot.toBytes()
+
+
+class TestStateJSON:
+    def testRoundTrip(self):
+        "A State must be made from the JSON string made by toJSON."
+        elevator = startElevator()
+        handle(elevator, 25)
+        state = State.fromJSON(elevator.state.toJSON())
+        assert state.toJSON() == elevator.state.toJSON()
+        assert state.earliestCall() == elevator.state.earliestCall()
+        assert state.earliestStop() == elevator.state.earliestStop()
+
+    def testDict(self):
+        state = State(4)
+        state.pressStop(2, 3.5)
+        copy = State.fromJSON(json.loads(state.toJSON()))
+        assert copy.stopPressed(2)
+        assert copy.stopButtons[2].pressedAt == 3.5
@@ -40,3 +40,140 @@ class TestOutstandingCall:
             s.currentDirection = DOWN
             s.pressCall(floor, DOWN, 0)
             assert s.outstandingCall(DOWN) == floor
+
+
+class TestOutstandingStop:
+    def testUp(self):
+        s = State(100)
+        s.floor = 10
+        s.pressStop(5, 0)
+        s.pressStop(70, 0)
+        s.pressStop(40, 0)
+        assert s.outstandingStop(UP) == 40
+
+    def testDown(self):
+        s = State(100)
+        s.floor = 50
+        s.pressStop(5, 0)
+        s.pressStop(70, 0)
+        s.pressStop(40, 0)
+        assert s.outstandingStop(DOWN) == 40
+
+    def testNoneBeyond(self):
+        s = State(100)
+        s.floor = 50
+        s.pressStop(50, 0)
+        s.pressStop(20, 0)
+        assert s.outstandingStop(UP) is None
+
+    def testCleared(self):
+        s = State(10)
+        s.pressStop(5, 0)
+        s.clearStop(5)
+        assert s.outstandingStop(UP) is None
+
+
+class TestButtonViews:
+    def testPressStop(self):
+        s = State()
+        s.pressStop(3, 12.5)
+        assert s.stopPressed(3)
+        assert s.stopButtons[3]
+        assert s.stopButtons[3].state is True
+        assert s.stopButtons[3].pressedAt == 12.5
+        assert not s.stopButtons[2]
+
+    def testPressCall(self):
+        s = State()
+        s.pressCall(2, DOWN, 7)
+        assert s.callPressed(2, DOWN)
+        assert not s.callPressed(2, UP)
+        assert s.callButtons[2][DOWN].pressedAt == 7
+        assert s.callButtons[2][UP].state is False
+
+    def testPressThroughView(self):
+        "Pressing and clearing a button view must change the state."
+        s = State()
+        s.stopButtons[1].press(3)
+        assert s.stopPressed(1)
+        s.callButtons[1][UP].press(4)
+        assert s.outstandingCall(UP) == 1
+        s.stopButtons[1].clear()
+        assert not s.stopPressed(1)
+        assert s.stopButtons[1].pressedAt is None
+
+    def testOrder(self):
+        "Button views must compare by press time."
+        s = State()
+        s.pressStop(1, 5)
+        s.pressStop(2, 3)
+        assert s.stopButtons[2] < s.stopButtons[1]
+
+    def testPressedFloors(self):
+        s = State()
+        s.pressCall(3, UP, 0)
+        s.pressCall(0, UP, 0)
+        assert list(s.pressedFloors(UP)) == [0, 3]
+        assert list(s.pressedFloors(DOWN)) == []
+
+
+class TestEarliest:
+    def testNone(self):
+        s = State()
+        assert s.earliestStop() is None
+        assert s.earliestCall() is None
+
+    def testEarliestStop(self):
+        s = State()
+        s.pressStop(3, 10)
+        s.pressStop(1, 5)
+        s.pressStop(4, 7)
+        assert s.earliestStop() == 1
+
+    def testCleared(self):
+        "A cleared button must not be found."
+        s = State()
+        s.pressStop(3, 10)
+        s.pressStop(1, 5)
+        s.clearStop(1)
+        assert s.earliestStop() == 3
+
+    def testPressedAgain(self):
+        "A button that is pressed again must be found at its new time."
+        s = State()
+        s.pressStop(1, 5)
+        s.pressStop(3, 10)
+        s.clearStop(1)
+        s.pressStop(1, 20)
+        assert s.earliestStop() == 3
+
+    def testExclude(self):
+        "An excluded floor must be skipped, but found again afterwards."
+        s = State()
+        s.pressStop(1, 5)
+        s.pressStop(3, 10)
+        assert s.earliestStop(excludeFloor=1) == 3
+        assert s.earliestStop() == 1
+
+    def testEarliestCall(self):
+        s = State()
+        s.pressCall(2, DOWN, 4)
+        s.pressCall(3, UP, 6)
+        assert s.earliestCall() == (2, DOWN)
+        assert s.earliestCall(excludeFloor=2) == (3, UP)
+
+    def testCallTies(self):
+        "Equal press times must go to the lowest floor, then to UP."
+        s = State()
+        s.pressCall(3, DOWN, 4)
+        s.pressCall(2, DOWN, 4)
+        s.pressCall(2, UP, 4)
+        assert s.earliestCall() == (2, UP)
+
+    def testManyPresses(self):
+        "Repeated presses and clears must not lose track of the earliest."
+        s = State(3)
+        for when in range(100):
+            s.pressStop(when % 3, when)
+            s.clearStop((when + 1) % 3)
+        assert s.earliestStop() == 98 % 3
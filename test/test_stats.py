@@ -0,0 +1,132 @@
+import json
+
+from elevator.constants import CALL_PRESSED, STOP_PRESSED, UP
+from elevator.elevator import runElevator
+from elevator.event import Event
+from elevator.sketch import Histogram
+from elevator.stats import LatencyStats, Stats, percentile, summarize
+
+
+class TestPercentile:
+    def testOneValue(self):
+        assert percentile([3], 50) == 3
+        assert percentile([3], 99) == 3
+
+    def testInterpolation(self):
+        values = [0, 10, 20, 30, 40]
+        assert percentile(values, 0) == 0
+        assert percentile(values, 50) == 20
+        assert percentile(values, 100) == 40
+        assert percentile(values, 95) == 38
+
+
+class TestSummarize:
+    def testEmpty(self):
+        assert summarize([]) == {"count": 0}
+
+    def testUnsorted(self):
+        assert summarize([4, 2, 0], percentiles=(50,)) == {
+            "count": 3,
+            "mean": 2,
+            "p50": 2,
+        }
+
+
+class TestLatencyStats:
+    def testDefaultStats(self):
+        "Elevators must collect plain Stats unless told otherwise."
+        e = runElevator([])
+        assert type(e.stats) is Stats
+
+    def testWait(self):
+        "The time from a call press to its clear must be recorded."
+        # The call is cleared on arrival at floor 3, 6 seconds later.
+        events = [Event(CALL_PRESSED, 3, direction=UP)]
+        e = runElevator(events, interFloorDelay=2, statsClass=LatencyStats)
+        assert e.stats.waits == [6]
+        assert e.stats.journeys == []
+
+    def testImmediateWait(self):
+        "A call on the floor of an idle elevator must be a zero wait."
+        events = [Event(CALL_PRESSED, 0, direction=UP)]
+        e = runElevator(events, statsClass=LatencyStats)
+        assert e.stats.waits == [0]
+
+    def testJourney(self):
+        "The time from a stop press to the stop must be recorded."
+        events = [Event(STOP_PRESSED, 4)]
+        e = runElevator(events, interFloorDelay=2, statsClass=LatencyStats)
+        assert e.stats.journeys == [8]
+
+    def testRepeatedPress(self):
+        "Pressing a pressed button must not restart its timer."
+        events = [
+            Event(STOP_PRESSED, 4, queuedAt=0),
+            Event(STOP_PRESSED, 4, queuedAt=3),
+        ]
+        e = runElevator(events, interFloorDelay=2, statsClass=LatencyStats)
+        assert e.stats.journeys == [8]
+
+    def testSummary(self):
+        events = [Event(STOP_PRESSED, 4)]
+        e = runElevator(events, interFloorDelay=2, statsClass=LatencyStats)
+        summary = e.stats.summary(percentiles=(50, 99))
+        assert summary["wait"] == {"count": 0}
+        assert summary["journey"] == {"count": 1, "mean": 8, "p50": 8, "p99": 8}
+
+
+class TestSketches:
+    def testDoorOpen(self):
+        "The time the doors are open must be recorded."
+        events = [Event(STOP_PRESSED, 2)]
+        e = runElevator(events, openDoorDelay=7)
+        assert e.stats.doorOpenDurations.summary(percentiles=()) == {
+            "count": 1,
+            "mean": 7,
+        }
+
+    def testCallGaps(self):
+        "The gaps between call presses must be recorded."
+        events = [
+            Event(CALL_PRESSED, 0, direction=UP, queuedAt=0),
+            Event(CALL_PRESSED, 0, direction=UP, queuedAt=30),
+            Event(CALL_PRESSED, 0, direction=UP, queuedAt=90),
+        ]
+        e = runElevator(events)
+        assert e.stats.callGaps.summary(percentiles=(0, 100)) == {
+            "count": 2,
+            "mean": 45,
+            "p0": 30,
+            "p100": 60,
+        }
+
+    def testPerFloorWaits(self):
+        events = [Event(CALL_PRESSED, 3, direction=UP)]
+        e = runElevator(events, interFloorDelay=2)
+        assert len(e.stats.callWaits[3][UP]) == 1
+        assert e.stats.summary()["wait"]["count"] == 1
+
+    def testMerge(self):
+        "Merged stats must add the counts and histograms of both."
+        first = runElevator([Event(STOP_PRESSED, 2)]).stats
+        second = runElevator([Event(STOP_PRESSED, 3)]).stats
+        assert first.merge(second) is first
+        assert first.openCounts == [0, 0, 1, 1, 0]
+        assert first.summary()["journey"]["count"] == 2
+
+    def testToJSON(self):
+        "Stats must be convertible to JSON."
+        e = runElevator([Event(STOP_PRESSED, 2)])
+        data = json.loads(json.dumps(e.stats.toJSON()))
+        assert data["openCounts"] == [0, 0, 1, 0, 0]
+        assert data["doorOpenDurations"]["count"] == 1
+
+    def testRelativeAccuracy(self):
+        "The accuracy a Stats is made with must be used, and kept in JSON."
+        stats = Stats(5, relativeAccuracy=0.05)
+        # The accuracy must not be taken from one of the histograms.
+        stats.doorOpenDurations = Histogram()
+        stats.recordWait(1, UP, 3.0)
+        assert stats.summary()["wait"]["count"] == 1
+        stats.doorOpenDurations = Histogram(0.05)
+        assert Stats.fromJSON(stats.toJSON()).relativeAccuracy == 0.05
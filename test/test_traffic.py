@@ -0,0 +1,104 @@
+from collections import Counter
+
+import pytest
+
+from elevator.constants import CALL_PRESSED, DOWN, OPEN, UP
+from elevator.traffic import (
+    PROFILES,
+    Passenger,
+    callEvents,
+    passengerSummary,
+    passengers,
+    runTraffic,
+)
+
+
+class TestPassengers:
+    def testReproducible(self):
+        "The same seed must give the same passengers."
+        first = passengers(10, 0.1, 600, seed=3)
+        second = passengers(10, 0.1, 600, seed=3)
+        assert [str(p) for p in first] == [str(p) for p in second]
+
+    def testArrivals(self):
+        "Arrivals must be in order, within the duration, at about the rate."
+        result = passengers(10, 0.1, 10000, seed=0)
+        arrivals = [p.arrival for p in result]
+        assert arrivals == sorted(arrivals)
+        assert 0 < arrivals[0] and arrivals[-1] < 10000
+        assert 900 < len(result) < 1100
+
+    @pytest.mark.parametrize("profile", sorted(PROFILES))
+    def testTrips(self, profile):
+        for p in passengers(5, 1.0, 100, seed=1, profile=profile):
+            assert 0 <= p.origin < 5
+            assert 0 <= p.destination < 5
+            assert p.origin != p.destination
+
+    def testUpPeak(self):
+        "In the up-peak, most passengers must start at the lobby."
+        origins = Counter(
+            p.origin for p in passengers(10, 1.0, 1000, seed=2, profile="upPeak")
+        )
+        assert origins[0] > 0.8 * sum(origins.values())
+
+    def testDownPeak(self):
+        "In the down-peak, most passengers must be going to the lobby."
+        destinations = Counter(
+            p.destination for p in passengers(10, 1.0, 1000, seed=2, profile="downPeak")
+        )
+        assert destinations[0] > 0.8 * sum(destinations.values())
+
+    def testDirection(self):
+        assert Passenger(0, 3, 0).direction == UP
+        assert Passenger(3, 0, 0).direction == DOWN
+
+    def testCallEvents(self):
+        (event,) = callEvents([Passenger(3, 1, 7.5)])
+        assert event.what == CALL_PRESSED
+        assert event.floor == 3
+        assert event.direction == DOWN
+        assert event.queuedAt == 7.5
+
+
+class TestRunTraffic:
+    def testOnePassenger(self):
+        "A passenger must be picked up and taken to their floor."
+        p = Passenger(2, 0, 1.0)
+        e = runTraffic([p], floors=5, openDoorDelay=10, interFloorDelay=2)
+        assert p.boardedAt == 5
+        # The doors are open for 10 seconds and the ride takes 4.
+        assert p.alightedAt == 19
+        assert e.stats.journeys == [14]
+
+    def testAllBoard(self):
+        "Everyone waiting on a floor must board when the doors first open."
+        ps = [Passenger(3, 1, 1.0), Passenger(3, 0, 1.1), Passenger(3, 2, 1.2)]
+        ps.append(Passenger(3, 1, 1.3))
+        e = runTraffic(ps, floors=5, openDoorDelay=10, interFloorDelay=2)
+        firstOpen = next(event for event in e.history if event.what == OPEN)
+        assert firstOpen.floor == 3
+        assert [p.boardedAt for p in ps] == [firstOpen.handledAt] * 4
+
+    def testCapacity(self):
+        "A passenger with no room must wait for the next trip."
+        first = Passenger(2, 0, 1.0)
+        second = Passenger(2, 1, 1.5)
+        runTraffic([first, second], floors=5, capacity=1)
+        assert first.boardedAt < first.alightedAt <= second.boardedAt
+        assert second.alightedAt is not None
+
+    def testStalled(self):
+        "A run in which the elevator stops serving passengers must raise."
+        ps = passengers(10, 0.05, 700, seed=17)
+        with pytest.raises(RuntimeError, match="^The elevator stalled with "):
+            runTraffic(ps, floors=10)
+        assert passengerSummary(ps)["unserved"] > 0
+
+    def testSummary(self):
+        ps = [Passenger(2, 0, 1.0), Passenger(0, 3, 50.0)]
+        runTraffic(ps, floors=5, openDoorDelay=10, interFloorDelay=2)
+        summary = passengerSummary(ps, percentiles=(50,))
+        assert summary["unserved"] == 0
+        assert summary["wait"]["count"] == 2
+        assert summary["journey"]["count"] == 2
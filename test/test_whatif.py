@@ -0,0 +1,87 @@
+from elevator.batch import randomTrace
+from elevator.elevator import runElevator
+from elevator.policy import LeastWait
+from elevator.whatif import Branch, BranchResult, compare, explore, runUntil
+
+# A random trace that runs without error.
+FLOORS, COUNT, SEED = 5, 40, 34
+
+
+def trace():
+    return randomTrace(FLOORS, COUNT, SEED)
+
+
+class TestBranch:
+    def testDescribe(self):
+        assert Branch().describe() == "unchanged"
+        assert Branch("fast").describe() == "fast"
+        assert (
+            Branch(policy=LeastWait(), openDoorDelay=3).describe()
+            == "policy=LeastWait openDoorDelay=3"
+        )
+
+
+class TestRunUntil:
+    def testTime(self):
+        "No event due after the given time may have been handled."
+        snapshot = runUntil(trace(), 50, floors=FLOORS)
+        assert snapshot.time <= 50
+        assert all(
+            event.queuedAt + event.delay > 50 for _, event in snapshot.pending[:-1]
+        )
+
+    def testEnd(self):
+        "A run that finishes before the time must stop before END."
+        snapshot = runUntil(trace(), 10**6, floors=FLOORS)
+        assert len(snapshot.pending) == 1
+
+
+class TestExplore:
+    def testFromStart(self):
+        "Branching before any event must give the results of full runs."
+        unchanged, leastWait = explore(
+            trace(),
+            -1,
+            [Branch(), Branch(policy=LeastWait())],
+            floors=FLOORS,
+            workers=1,
+        )
+        assert (
+            unchanged.stats.toJSON()
+            == runElevator(trace(), floors=FLOORS).stats.toJSON()
+        )
+        assert (
+            leastWait.stats.toJSON()
+            == runElevator(trace(), floors=FLOORS, policy=LeastWait()).stats.toJSON()
+        )
+
+    def testUnchanged(self):
+        "A branch that changes nothing must give the result of a full run."
+        branch = Branch()
+        (result,) = explore(trace(), 60, [branch], floors=FLOORS, workers=1)
+        assert isinstance(result, BranchResult)
+        assert result.branch is branch
+        assert result.error is None
+        assert (
+            result.stats.toJSON() == runElevator(trace(), floors=FLOORS).stats.toJSON()
+        )
+
+    def testWorkers(self):
+        "Branches run in worker processes must give the same results."
+        branches = [Branch(), Branch(policy=LeastWait()), Branch(openDoorDelay=8.0)]
+        serial = explore(trace(), 40, branches, floors=FLOORS, workers=1)
+        parallel = explore(trace(), 40, branches, floors=FLOORS, workers=2)
+        assert [r.error for r in parallel] == [r.error for r in serial]
+        assert [r.stats and r.stats.toJSON() for r in parallel] == [
+            r.stats and r.stats.toJSON() for r in serial
+        ]
+
+    def testCompare(self):
+        results = explore(
+            trace(), 60, [Branch("a"), Branch("b", policy=LeastWait())], floors=FLOORS
+        )
+        lines = compare(results).split("\n")
+        assert len(lines) == 3
+        assert lines[0].split()[:2] == ["branch", "arrivals"]
+        assert lines[1].startswith("a ")
+        assert lines[2].startswith("b ")